@@ -327,6 +327,8 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class JSONAPIMeta:
         included_resources = ("writer",)
+        select_for_includes = {"writer": ["author__bio"]}
+        prefetch_for_includes = {"author": ["author__bio", "author__entries"]}
 
     def get_modified_days_ago(self, obj):
         return (datetime.now() - obj.modified_at).days
@@ -369,6 +371,9 @@ class LabResultsSerializer(serializers.ModelSerializer):
         model = LabResults
         fields = ("date", "measurements", "author")
 
+    class JSONAPIMeta:
+        prefetch_for_includes = {"author": ["author__bio", "author__entries"]}
+
 
 class ProjectSerializer(serializers.PolymorphicModelSerializer):
     included_serializers = {
@@ -4,11 +4,24 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from rest_framework_json_api.utils import clear_resource_types
+
 from example import models, serializers, views
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def resource_types():
+    """
+    Resource types are registered once per model and serializer, so these need to
+    be resolved again after patching them.
+    """
+    clear_resource_types()
+    yield
+    clear_resource_types()
+
+
 class _PatchedModel:
     class JSONAPIMeta:
         resource_name = "resource_name_from_JSONAPIMeta"
@@ -83,6 +96,7 @@ class TestModelResourceName:
 
         # model > default
         models.Comment.__bases__ += (_PatchedModel,)
+        clear_resource_types()
         response = client.get(reverse("comment-list"))
         data = response.json()["data"][0]
         assert (
@@ -96,6 +110,7 @@ class TestModelResourceName:
             "resource_name_from_serializer",
             False,
         )
+        clear_resource_types()
         response = client.get(reverse("comment-list"))
         data = response.json()["data"][0]
         assert (
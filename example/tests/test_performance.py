@@ -4,7 +4,13 @@ from random import randint
 from django.utils import timezone
 from rest_framework.test import APITestCase
 
-from example.factories import CommentFactory, EntryFactory
+from example.factories import (
+    ArtProjectFactory,
+    CommentFactory,
+    CompanyFactory,
+    EntryFactory,
+    ResearchProjectFactory,
+)
 from example.models import Author, Blog, Comment, Entry, LabResults, ResearchProject
 
 
@@ -53,15 +59,14 @@ class PerformanceTestCase(APITestCase):
             self.assertEqual(len(response.data["results"]), 25)
 
     def test_query_count_include_author(self):
-        """We expect a list view with an include have five queries:
+        """We expect a list view with an include have four queries:
 
         1. Primary resource COUNT query
-        2. Primary resource SELECT
-        3. Authors prefetched
-        4. Author types prefetched
-        5. Entries prefetched
+        2. Primary resource SELECT + SELECT RELATED author
+        3. Author bios prefetched
+        4. Entries prefetched
         """
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             response = self.client.get("/comments?include=author&page[size]=25")
             self.assertEqual(len(response.data["results"]), 25)
 
@@ -89,13 +94,12 @@ class PerformanceTestCase(APITestCase):
             self.assertEqual(len(response.data["results"]), 25)
 
     def test_query_prefetch_read_only(self):
-        """We expect a read only list view with an include have five queries:
+        """We expect a read only list view with an include have four queries:
 
         1. Primary resource COUNT query
-        2. Primary resource SELECT
-        3. Authors prefetched
-        4. Author types prefetched
-        5. Entries prefetched
+        2. Primary resource SELECT + SELECT RELATED author
+        3. Author bios prefetched
+        4. Entries prefetched
         """
         project = ResearchProject.objects.create(
             topic="Mars Mission", supervisor="Elon Musk"
@@ -113,6 +117,39 @@ class PerformanceTestCase(APITestCase):
             ]
         )
 
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             response = self.client.get("/lab-results?include=author&page[size]=25")
             self.assertEqual(len(response.data["results"]), 20)
+
+    def test_query_polymorphic_linkage(self):
+        """We expect a list view with polymorphic relationships to have four queries:
+
+        1. Primary resource COUNT query
+        2. Primary resource SELECT
+        3. Current projects prefetched with their content type only
+        4. Future projects prefetched with their content type only
+        """
+        for _ in range(5):
+            CompanyFactory(
+                current_project=ResearchProjectFactory(),
+                future_projects=(ResearchProjectFactory(), ArtProjectFactory()),
+            )
+
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                "/companies?fields[companies]=name,current_project,future_projects"
+                "&page[size]=25"
+            )
+        data = response.json()["data"]
+        self.assertEqual(len(data), 5)
+        self.assertEqual(
+            data[0]["relationships"]["currentProject"]["data"]["type"],
+            "researchProjects",
+        )
+        self.assertEqual(
+            {
+                project["type"]
+                for project in data[0]["relationships"]["futureProjects"]["data"]
+            },
+            {"researchProjects", "artProjects"},
+        )
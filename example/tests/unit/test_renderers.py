@@ -215,3 +215,43 @@ def test_render_serializer_as_attribute(db):
         }
     }
     assert expected == result
+
+
+def test_render_link_templates(db, client, entry_factory):
+    entries = entry_factory.create_batch(2)
+    profile = JSONRenderer.link_templates_profile
+
+    response = client.get(
+        "/entries",
+        {"page[size]": 2},
+        HTTP_ACCEPT=f'{JSONRenderer.media_type}; profile="{profile}"',
+    )
+
+    assert response["Content-Type"] == f'{JSONRenderer.media_type}; profile="{profile}"'
+    result = response.json()
+    assert result["meta"]["linkTemplates"]["entries"]["suggested"] == {
+        "self": "http://testserver/entries/{id}/relationships/suggested",
+        "related": "http://testserver/entries/{id}/suggested/",
+    }
+    for resource, entry in zip(result["data"], entries):
+        assert "blogHyperlinked" not in resource["relationships"]
+        assert resource["relationships"]["suggested"] == {
+            "data": [
+                {"type": "entries", "id": str(other.pk)}
+                for other in entries
+                if other != entry
+            ],
+            "meta": {"count": 1},
+        }
+
+
+def test_render_links_without_profile(db, client, entry):
+    response = client.get("/entries")
+
+    assert response["Content-Type"] == JSONRenderer.media_type
+    result = response.json()
+    assert "linkTemplates" not in result["meta"]
+    assert result["data"][0]["relationships"]["blogHyperlinked"]["links"] == {
+        "self": f"http://testserver/entries/{entry.pk}/relationships/blog_hyperlinked",
+        "related": f"http://testserver/entries/{entry.pk}/blog",
+    }
@@ -242,11 +242,6 @@ class AuthorViewSet(ModelViewSet):
 class CommentViewSet(ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-    select_for_includes = {"writer": ["author__bio"]}
-    prefetch_for_includes = {
-        "__all__": [],
-        "author": ["author__bio", "author__entries"],
-    }
 
     def get_queryset(self, *args, **kwargs):
         queryset = super().get_queryset()
@@ -261,6 +256,7 @@ class CommentViewSet(ModelViewSet):
 class CompanyViewset(ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
+    prefetch_linkage_pks_only = True
 
 
 class ProjectViewset(ModelViewSet):
@@ -293,10 +289,6 @@ class AuthorRelationshipView(RelationshipView):
 class LabResultViewSet(ReadOnlyModelViewSet):
     queryset = LabResults.objects.all()
     serializer_class = LabResultsSerializer
-    prefetch_for_includes = {
-        "__all__": [],
-        "author": ["author__bio", "author__entries"],
-    }
 
 
 class QuestionnaireViewset(ModelViewSet):
@@ -0,0 +1,47 @@
+from django.apps import AppConfig
+
+from rest_framework_json_api.settings import json_api_settings
+
+
+def warm_up():
+    """
+    Resolves what is otherwise resolved lazily on the first requests of a process:
+    imports the URL conf and with it the serializers of the views, resolves lazy
+    `included_serializers` and `related_serializers`, compiles the include graphs
+    and registers the resource types of all JSON:API serializers.
+
+    Call it before the workers of a pre-fork server are forked, e.g. in the WSGI
+    module when preloading the application, or set `JSON_API_WARM_UP` to call it
+    when Django is set up.
+    """
+    from django.urls import get_resolver
+
+    from rest_framework_json_api.serializers import (
+        _serializer_classes,
+        get_include_graph,
+    )
+    from rest_framework_json_api.utils import get_resource_type_from_serializer
+
+    # importing the views imports their serializers
+    get_resolver().url_patterns
+
+    for serializer_class in list(_serializer_classes):
+        for attr in ("included_serializers", "related_serializers"):
+            lazy_serializers = getattr(serializer_class, attr, None) or {}
+            for field_name in lazy_serializers:
+                lazy_serializers[field_name]
+
+        get_include_graph(serializer_class)
+        try:
+            get_resource_type_from_serializer(serializer_class)
+        except AttributeError:
+            pass
+
+
+class JSONAPIConfig(AppConfig):
+    name = "rest_framework_json_api"
+    verbose_name = "Django REST framework JSON:API"
+
+    def ready(self):
+        if json_api_settings.WARM_UP:
+            warm_up()
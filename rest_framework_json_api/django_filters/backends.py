@@ -4,6 +4,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import ValidationError
 from rest_framework.settings import api_settings
 
+from rest_framework_json_api.query import get_query
 from rest_framework_json_api.utils import undo_format_field_name
 
 
@@ -104,6 +105,7 @@ class DjangoFilterBackend(DjangoFilterBackend):
         :raises ValidationError: for bad filter syntax
         """
         filter_keys = []
+        parsed_filters = get_query(request).filters
         # rewrite filter[field] query params to make DjangoFilterBackend work.
         data = request.query_params.copy()
         for qp, val in request.query_params.lists():
@@ -117,9 +119,11 @@ class DjangoFilterBackend(DjangoFilterBackend):
             if m and qp != self.search_param:
                 if not all(val):
                     raise ValidationError(f"missing value for query parameter {qp}")
-                # convert JSON:API relationship path to Django ORM's __ notation
-                key = m.groupdict()["assoc"].replace(".", "__")
-                key = undo_format_field_name(key)
+                key = parsed_filters.get(qp)
+                if key is None:
+                    # convert JSON:API relationship path to Django ORM's __ notation
+                    key = m.groupdict()["assoc"].replace(".", "__")
+                    key = undo_format_field_name(key)
                 data.setlist(key, val)
                 filter_keys.append(key)
                 del data[qp]
@@ -3,6 +3,7 @@ import re
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
+from rest_framework_json_api.query import get_query
 from rest_framework_json_api.utils import undo_format_field_name
 
 
@@ -26,6 +27,23 @@ class OrderingFilter(OrderingFilter):
         "[list of fields to sort by]" "(https://jsonapi.org/format/#fetching-sorting)"
     )
 
+    def get_ordering(self, request, queryset, view):
+        """
+        Extend :py:meth:`rest_framework.filters.OrderingFilter.get_ordering` to take the
+        sort fields from the JSON:API query of the request, which is parsed once per
+        request.
+        """
+        if self.ordering_param != "sort":
+            return super().get_ordering(request, queryset, view)
+
+        fields = get_query(request).sort
+        if fields:
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+
+        return self.get_default_ordering(view)
+
     def remove_invalid_fields(self, queryset, fields, view, request):
         """
         Extend :py:meth:`rest_framework.filters.OrderingFilter.remove_invalid_fields` to
@@ -0,0 +1,115 @@
+"""
+JSON backends which may be used by `JSONRenderer` and `JSONParser` instead of the
+`json` module of the standard library. See `JSON_API_JSON_BACKEND` setting.
+
+A backend is a class with a `dumps` and `loads` method. When a backend raises a
+`TypeError` or `ValueError`, encoding resp. decoding falls back to the standard
+library, which then also reports the error if there is any. When a backend raises an
+`ImportError` on initialization (e.g. the underlying library is not installed) the
+standard library is used instead.
+"""
+
+import json
+import math
+import re
+
+from django.utils.module_loading import import_string
+
+from rest_framework_json_api.settings import json_api_settings
+
+_json_backends = {}
+
+# numbers (or keys) formatted with an exponent or with at least four leading zeros,
+# which are the floats `orjson` formats differently than the standard library, e.g.
+# `1e16` and `0.00001` instead of `1e+16` and `1e-05`; strings looking like such
+# numbers match as well, which only causes an unnecessary fallback
+_float_regex = re.compile(
+    rb'[\[:,\s"]-?(?:[0-9]+(?:\.[0-9]+)?e-?[0-9]+|0\.0000[0-9]*)[,\]}\s"]'
+)
+
+
+def _has_non_finite_float(data):
+    """
+    Tells whether given data contains `NaN` or `Infinity` in any of its nested
+    dicts (including keys), lists or tuples.
+    """
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value)
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+class ORJSONBackend:
+    """
+    JSON backend using `orjson <https://github.com/ijl/orjson>`_.
+
+    Only compact or with two spaces indented output is supported, as
+    `orjson` does not support any other formatting.
+
+    The output is the same as the one of the standard library: data with floats
+    `orjson` formats differently (those with an exponent, `NaN` and `Infinity`)
+    is left to the standard library.
+    """
+
+    def __init__(self):
+        import orjson
+
+        self.orjson = orjson
+        self.options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    def dumps(self, data, default, indent=None):
+        options = self.options
+        if indent == 2:
+            options |= self.orjson.OPT_INDENT_2
+        elif indent is not None:
+            raise ValueError(f"Indent of {indent} is not supported by orjson")
+
+        def encode(obj):
+            value = default(obj)
+            if isinstance(value, float):
+                return self.orjson.Fragment(json.dumps(value, allow_nan=False))
+            if _has_non_finite_float(value):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return value
+
+        ret = self.orjson.dumps(data, default=encode, option=options)
+        # `orjson` renders `NaN` and `Infinity` as `null`
+        if _float_regex.search(ret) or (b"null" in ret and _has_non_finite_float(data)):
+            raise ValueError("Floats are formatted differently by orjson")
+        return ret
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+
+def get_json_backend():
+    """
+    Returns the JSON backend configured with `JSON_API_JSON_BACKEND` or `None`
+    when the standard library is used.
+    """
+    backend_path = json_api_settings.JSON_BACKEND
+    if not backend_path:
+        return None
+
+    try:
+        return _json_backends[backend_path]
+    except KeyError:
+        backend_class = import_string(backend_path)
+        try:
+            backend = backend_class()
+        except ImportError:
+            backend = None
+        _json_backends[backend_path] = backend
+        return backend
@@ -2,10 +2,15 @@
 Parsers
 """
 
+import codecs
+import io
+
+from django.conf import settings
 from rest_framework import parsers
 from rest_framework.exceptions import ParseError
 
 from rest_framework_json_api import exceptions, renderers
+from rest_framework_json_api.json_backends import get_json_backend
 from rest_framework_json_api.utils import get_resource_name, undo_format_field_names
 
 
@@ -169,8 +174,30 @@ class JSONParser(parsers.JSONParser):
         """
         Parses the incoming bytestream as JSON and returns the resulting data
         """
-        result = super().parse(
-            stream, media_type=media_type, parser_context=parser_context
-        )
+        result = self.parse_json(stream, media_type, parser_context)
 
         return self.parse_data(result, parser_context)
+
+    def parse_json(self, stream, media_type=None, parser_context=None):
+        """
+        Decodes the incoming bytestream with the backend configured in
+        `JSON_API_JSON_BACKEND`, if any, or the standard library otherwise.
+        """
+        backend = get_json_backend()
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        # backends are expected to only decode utf-8 and to reject NaN and Infinity
+        if (
+            backend is not None
+            and self.strict
+            and codecs.lookup(encoding).name == "utf-8"
+        ):
+            data = stream.read()
+            try:
+                return backend.loads(data)
+            except (TypeError, ValueError):
+                # let the standard library decode or report the error
+                stream = io.BytesIO(data)
+
+        return super().parse(
+            stream, media_type=media_type, parser_context=parser_context
+        )
@@ -0,0 +1,121 @@
+"""
+The JSON:API query parameters of a request, parsed once per request and shared by
+viewsets, filter backends, serializers and the renderer. See `get_query`.
+"""
+
+import re
+from types import MappingProxyType
+
+from rest_framework_json_api.utils import BoundedCache, undo_format_field_name
+
+INCLUDE_TREE_CACHE_SIZE = 1024
+
+_include_trees = BoundedCache(INCLUDE_TREE_CACHE_SIZE)
+
+_sparse_fieldset_regex = re.compile(r"^fields\[(?P<type>.+)\]$")
+_filter_regex = re.compile(r"^filter\[(?P<key>[\w\.\-]+)\]$")
+
+
+def get_include_tree(included_resources):
+    """
+    Returns the first field names of given include paths mapped to the include
+    paths nested in them, e.g. `{"comments": ("author",), "blog": ()}` for
+    `["comments.author", "blog"]`.
+
+    Trees are memoized, so an include path is only split once and not for every
+    rendered resource.
+    """
+    key = tuple(included_resources)
+    try:
+        return _include_trees[key]
+    except KeyError:
+        pass
+
+    tree = {}
+    for include in key:
+        field_name, _, nested = include.partition(".")
+        children = tree.setdefault(field_name, [])
+        if nested and nested not in children:
+            children.append(nested)
+    tree = MappingProxyType(
+        {field_name: tuple(children) for field_name, children in tree.items()}
+    )
+    _include_trees[key] = tree
+    return tree
+
+
+class JSONAPIQuery:
+    """
+    The parsed JSON:API query parameters of a request, with field names in Python
+    format. Instances are immutable.
+
+    :include: tuple of the include paths of the `include` parameter or `None`
+        when it is missing or empty, so the default includes apply
+    :fields: resource types mapped to the tuple of field names of their requested
+        sparse fieldset
+    :sort: tuple of the terms of the `sort` parameter, as requested
+    :filters: `filter[...]` parameters mapped to their filter key in Django ORM
+        notation, e.g. `author__name` for `filter[author.name]`
+    """
+
+    __slots__ = ("include", "fields", "sort", "filters")
+
+    def __init__(self, query_params):
+        include = query_params.get("include")
+        include = (
+            tuple(undo_format_field_name(path) for path in include.split(","))
+            if include
+            else None
+        )
+        fields = {}
+        filters = {}
+        for param in query_params:
+            match = _sparse_fieldset_regex.match(param)
+            if match:
+                fields[match.group("type")] = tuple(
+                    undo_format_field_name(field_name)
+                    for field_name in query_params.get(param).split(",")
+                )
+                continue
+
+            match = _filter_regex.match(param)
+            if match:
+                filters[param] = undo_format_field_name(
+                    match.group("key").replace(".", "__")
+                )
+
+        sort = query_params.get("sort")
+        sort = tuple(term.strip() for term in sort.split(",")) if sort else ()
+
+        object.__setattr__(self, "include", include)
+        object.__setattr__(self, "fields", MappingProxyType(fields))
+        object.__setattr__(self, "sort", sort)
+        object.__setattr__(self, "filters", MappingProxyType(filters))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def get_sparse_fieldset(self, resource_type):
+        """
+        Returns the field names of the sparse fieldset requested for given resource
+        type or `None` when there is none.
+        """
+        return self.fields.get(resource_type)
+
+
+def get_query(request):
+    """
+    Returns the `JSONAPIQuery` of given request, which is parsed on first use and
+    then attached to the request. Returns `None` when there is no request.
+    """
+    if request is None:
+        return None
+
+    try:
+        return request._json_api_query
+    except AttributeError:
+        request._json_api_query = JSONAPIQuery(request.query_params)
+        return request._json_api_query
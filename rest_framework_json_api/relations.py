@@ -1,21 +1,24 @@
 import json
 
 import inflection
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import Manager
 from django.urls import NoReverseMatch
 from django.utils.translation import gettext_lazy as _
 from rest_framework.fields import MISSING_ERROR_MESSAGE, Field, SkipField
 from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.relations import ManyRelatedField as DRFManyRelatedField
 from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
-from rest_framework.reverse import reverse
 from rest_framework.serializers import Serializer
 
 from rest_framework_json_api.exceptions import Conflict
+from rest_framework_json_api.url_templates import reverse
 from rest_framework_json_api.utils import (
     Hyperlink,
     format_link_segment,
+    get_registered_resource_type,
     get_resource_type_from_instance,
+    get_resource_type_from_model,
     get_resource_type_from_queryset,
     get_resource_type_from_serializer,
 )
@@ -199,8 +202,14 @@ class ResourceRelatedField(HyperlinkedMixin, PrimaryKeyRelatedField):
         super().__init__(**kwargs)
 
     def use_pk_only_optimization(self):
-        # We need the real object to determine its type...
-        return self.get_resource_type_from_included_serializer() is not None
+        # overwritten `get_resource_id` or `to_representation` may need the real
+        # object (e.g. `value.email`), as may determining its type when it is not
+        # known upfront
+        return (
+            type(self).get_resource_id is ResourceRelatedField.get_resource_id
+            and type(self).to_representation is ResourceRelatedField.to_representation
+            and self.get_static_resource_type() is not None
+        )
 
     def conflict(self, key, **kwargs):
         """
@@ -248,7 +257,7 @@ class ResourceRelatedField(HyperlinkedMixin, PrimaryKeyRelatedField):
 
     def to_representation(self, value):
         pk = self.get_resource_id(value)
-        resource_type = self.get_resource_type_from_included_serializer()
+        resource_type = self.get_static_resource_type()
         if resource_type is None or not self._skip_polymorphic_optimization:
             resource_type = get_resource_type_from_instance(value)
 
@@ -262,6 +271,61 @@ class ResourceRelatedField(HyperlinkedMixin, PrimaryKeyRelatedField):
         """
         return super().to_representation(value)
 
+    def get_static_resource_type(self):
+        """
+        Returns the resource type of the related instances when it is known without
+        retrieving them, either from the included serializer or from the related
+        model, or None when related instances may be of different models.
+
+        The type is resolved once per bound field.
+        """
+        try:
+            return self._static_resource_type
+        except AttributeError:
+            pass
+
+        resource_type = self.get_resource_type_from_included_serializer()
+        if resource_type is None:
+            model = self.get_related_model()
+            if model is not None:
+                resource_type = get_resource_type_from_model(model)
+
+        self._static_resource_type = resource_type
+        return resource_type
+
+    def get_related_model(self):
+        """
+        Returns the model of the related instances from the `model` argument, the
+        queryset or the model field of the parent serializer, or None when it can
+        not be determined or the model's manager may return instances of other
+        models (e.g. a polymorphic manager).
+        """
+        model = getattr(self, "model", None)
+        if model is None and self.queryset is not None:
+            model = self.queryset.model
+        many = isinstance(self.parent, DRFManyRelatedField)
+        if model is None:
+            field = self.parent if many else self
+            parent = self.get_parent_serializer()
+            parent_model = getattr(getattr(parent, "Meta", None), "model", None)
+            if parent_model is None or len(field.source_attrs) != 1:
+                return None
+            try:
+                model_field = parent_model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return None
+            model = model_field.related_model
+            if model is None:
+                return None
+
+        # related instances are retrieved with the default manager for to-many
+        # and with the base manager for to-one relations
+        manager = model._default_manager if many else model._base_manager
+        if type(manager) is not Manager:
+            return None
+
+        return model
+
     def get_resource_type_from_included_serializer(self):
         """
         Check to see it this resource has a different resource_name when
@@ -270,7 +334,10 @@ class ResourceRelatedField(HyperlinkedMixin, PrimaryKeyRelatedField):
         field_name = self.field_name or self.parent.field_name
         parent = self.get_parent_serializer()
 
-        if parent is not None:
+        if parent is None:
+            return None
+
+        def resolve():
             # accept both singular and plural versions of field_name
             field_names = [
                 inflection.singularize(field_name),
@@ -280,8 +347,11 @@ class ResourceRelatedField(HyperlinkedMixin, PrimaryKeyRelatedField):
             for field in field_names:
                 if field in includes.keys():
                     return get_resource_type_from_serializer(includes[field])
+            return None
 
-        return None
+        return get_registered_resource_type(
+            ("included_serializer", type(parent), field_name), resolve
+        )
 
     def get_parent_serializer(self):
         if hasattr(self.parent, "parent") and self.is_serializer(self.parent.parent):
@@ -2,27 +2,40 @@
 Renderers
 """
 
-import copy
 from collections import defaultdict
-from collections.abc import Iterable
-
-from django.db.models import Manager
+from collections.abc import Iterable, Mapping
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.signals import setting_changed
+from django.db.models import (
+    Manager,
+    ManyToManyField,
+    ManyToManyRel,
+    ManyToOneRel,
+    Model,
+)
 from django.template import loader
 from django.utils.encoding import force_str
+from django.utils.http import RFC3986_SUBDELIMS, parse_header_parameters
 from rest_framework import relations, renderers
-from rest_framework.fields import SkipField, get_attribute
+from rest_framework.fields import SkipField, empty, get_attribute
 from rest_framework.relations import PKOnlyObject
-from rest_framework.serializers import ListSerializer, Serializer
 from rest_framework.settings import api_settings
 
 import rest_framework_json_api
+from rest_framework_json_api.json_backends import get_json_backend
+from rest_framework_json_api.query import get_include_tree, get_query
 from rest_framework_json_api.relations import (
     HyperlinkedMixin,
     ManySerializerMethodResourceRelatedField,
     ResourceRelatedField,
     SkipDataMixin,
 )
+from rest_framework_json_api.resource_cache import get_resource_cache
+from rest_framework_json_api.settings import JSON_API_SETTINGS_PREFIX
 from rest_framework_json_api.utils import (
+    BoundedCache,
     format_errors,
     format_field_name,
     format_field_names,
@@ -37,6 +50,339 @@ from rest_framework_json_api.utils import (
     is_relationship_field,
 )
 
+RENDER_PLAN_CACHE_SIZE = 1024
+
+_render_plans = BoundedCache(RENDER_PLAN_CACHE_SIZE)
+
+
+def clear_render_plans(*args, **kwargs):
+    if kwargs["setting"].startswith(JSON_API_SETTINGS_PREFIX):
+        _render_plans.clear()
+
+
+setting_changed.connect(clear_render_plans)
+
+
+class RenderPlan:
+    """
+    Classification of serializer fields into the members of a JSON:API resource object.
+
+    A plan only holds field names and values derived from the field classes, so it
+    can be shared between requests. Field instances are always looked up in the
+    fields a resource is rendered with.
+    """
+
+    def __init__(self, fields):
+        self.field_names = tuple(fields)
+        self.attributes = {}
+        self.relationships = []
+        self.self_link = False
+
+        for field_name, field in fields.items():
+            if not is_relationship_field(field):
+                if field_name != "id":
+                    self.attributes[field_name] = format_field_name(field_name)
+                continue
+
+            # URL field is rendered as self link of the resource object
+            if field_name == api_settings.URL_FIELD_NAME:
+                self.self_link = isinstance(field, relations.HyperlinkedIdentityField)
+                continue
+
+            # don't output a key for write only fields
+            if field.write_only:
+                continue
+
+            kind = self.get_relationship_kind(field)
+            if kind is None:
+                continue
+
+            self.relationships.append(
+                (
+                    field_name,
+                    format_field_name(field_name),
+                    get_related_resource_type(field),
+                    kind,
+                    kind != "identity" and isinstance(field, HyperlinkedMixin),
+                )
+            )
+
+    @staticmethod
+    def get_relationship_kind(field):
+        if isinstance(field, relations.HyperlinkedIdentityField):
+            return "identity"
+        if isinstance(field, ResourceRelatedField):
+            return "resource"
+        if isinstance(
+            field,
+            (relations.PrimaryKeyRelatedField, relations.HyperlinkedRelatedField),
+        ):
+            return "pk"
+        if isinstance(field, relations.ManyRelatedField):
+            return "many"
+        if isinstance(field, HyperlinkedMixin):
+            return "links"
+        return None
+
+    def bind(self, fields):
+        return PlannedFields(fields, self)
+
+
+class PlannedFields(Mapping):
+    """
+    Read-only view on the fields of a serializer restricted to the fields of a
+    `RenderPlan`, which is available as `render_plan`.
+    """
+
+    def __init__(self, fields, render_plan):
+        self.fields = fields
+        self.render_plan = render_plan
+        self.field_name_set = frozenset(render_plan.field_names)
+
+    def __getitem__(self, key):
+        if key not in self.field_name_set:
+            raise KeyError(key)
+        return self.fields[key]
+
+    def __contains__(self, key):
+        return key in self.field_name_set
+
+    def __iter__(self):
+        return iter(self.render_plan.field_names)
+
+    def __len__(self):
+        return len(self.render_plan.field_names)
+
+
+def get_cached_resources(serializer, instance=empty):
+    """
+    Returns the `CachedResources` of the primary data looked up by given
+    serializer, or `None`. When an instance is given, `None` is also returned
+    unless its resource object is cached.
+    """
+    cached_resources = getattr(serializer, "_cached_resources", None)
+    if cached_resources is None or instance is empty:
+        return cached_resources
+    return cached_resources if cached_resources.get(instance) is not None else None
+
+
+def represents_resource_object(serializer, resource_instance=None):
+    """
+    Whether given serializer represents its instances as JSON:API resource objects
+    already, see `ResourceObjectMixin`.
+    """
+    if resource_instance is not None and isinstance(
+        serializer, rest_framework_json_api.serializers.PolymorphicModelSerializer
+    ):
+        serializer = serializer.get_polymorphic_serializer_for_instance(
+            resource_instance
+        )
+    meta = getattr(serializer, "Meta", None)
+    return getattr(meta, "represent_as_resource_object", False)
+
+
+def get_fields_render_plan(fields):
+    plan = getattr(fields, "render_plan", None)
+    if plan is None:
+        plan = RenderPlan(fields)
+    return plan
+
+
+class IncludedResource:
+    """
+    A related instance which is part of the compound document together with the
+    include paths which still need to be resolved relative to it.
+    """
+
+    def __init__(self, instance, included_resources):
+        self.instance = instance
+        self.included_resources = list(included_resources)
+        self.fields = None
+        self.resource = None
+        self.cached = False
+
+
+class IncludedCache(defaultdict):
+    """
+    Resource objects of the compound document by type and id.
+
+    Additionally holds related instances which are still to be serialized,
+    grouped by their included serializer class. Each instance is only serialized
+    once per request, no matter through how many include paths it is reached.
+    """
+
+    def __init__(self):
+        super().__init__(dict)
+        self.pending = {}
+        self.identities = {}
+        self.nested = []
+
+    @staticmethod
+    def get_identity(serializer_class, instance):
+        pk = getattr(instance, "pk", None)
+        if pk is None:
+            return None
+
+        if getattr(serializer_class, "_poly_force_type_resolution", False):
+            return get_resource_type_from_instance(instance), pk
+
+        try:
+            return get_resource_type_from_serializer(serializer_class), pk
+        except AttributeError:
+            return get_resource_type_from_instance(instance), pk
+
+    def add(self, serializer_class, context, instances, included_resources):
+        for instance in instances:
+            identity = self.get_identity(serializer_class, instance)
+            included = self.identities.get(identity) if identity else None
+
+            if included is None:
+                included = IncludedResource(instance, included_resources)
+                if identity:
+                    self.identities[identity] = included
+                _, items = self.pending.setdefault(serializer_class, (context, []))
+                items.append(included)
+                continue
+
+            new_included_resources = [
+                include
+                for include in included_resources
+                if include not in included.included_resources
+            ]
+            if not new_included_resources:
+                continue
+
+            included.included_resources.extend(new_included_resources)
+            if included.resource is not None:
+                # already serialized so only its relations still need to be resolved
+                self.nested.append((included, new_included_resources))
+            elif included.cached:
+                # taken from the resource cache so it still needs to be serialized
+                # to resolve its relations
+                included.cached = False
+                _, items = self.pending.setdefault(serializer_class, (context, []))
+                items.append(included)
+
+
+class Linkage:
+    """
+    Primary keys of related instances of relationships retrieved for many resource
+    instances at once, see `JSONRenderer.get_linkage`.
+    """
+
+    def __init__(self):
+        self.relations = {}
+
+    def add(self, field_name, key_attname, related_pks):
+        self.relations[field_name] = (
+            key_attname,
+            {
+                key: [PKOnlyObject(pk=pk) for pk in pks]
+                for key, pks in related_pks.items()
+            },
+        )
+
+    def get(self, field_name, resource_instance):
+        """
+        Returns the related instances holding only the primary key of given field
+        and resource instance or `empty` when they were not retrieved.
+        """
+        try:
+            key_attname, related = self.relations[field_name]
+        except KeyError:
+            return empty
+        return related.get(getattr(resource_instance, key_attname), [])
+
+
+class LinkTemplates:
+    """
+    Link templates of the relationships of rendered resource objects, see
+    `JSONRenderer.link_templates_profile`.
+
+    A template is derived per resource type, relationship and link from the first
+    rendered link by replacing the path segment of the resource id with `{id}`.
+    Links of a relationship are only left out of a resource object when they equal
+    their expanded templates.
+    """
+
+    placeholder = "{id}"
+
+    def __init__(self):
+        self.templates = defaultdict(dict)
+
+    def get_template(self, link, resource_id):
+        scheme, netloc, path, query, fragment = urlsplit(link)
+        segments = path.split("/")
+        positions = [
+            position
+            for position, segment in enumerate(segments)
+            if segment == resource_id
+        ]
+        if len(positions) != 1:
+            return None
+
+        segments[positions[0]] = self.placeholder
+        template = urlunsplit((scheme, netloc, "/".join(segments), query, fragment))
+        if template.replace(self.placeholder, resource_id) != link:
+            return None
+        return template
+
+    def apply(self, resource_obj):
+        """
+        Returns given resource object without the relationship links which are
+        expressed by templates. Given resource object is not changed.
+        """
+        relationships = resource_obj.get("relationships")
+        if not relationships or resource_obj.get("id") is None:
+            return resource_obj
+
+        # resource ids are quoted the same way as URLs
+        resource_id = quote(resource_obj["id"], safe=RFC3986_SUBDELIMS + "/~:@")
+        type_templates = self.templates[resource_obj["type"]]
+        new_relationships = {}
+        for key, relationship in relationships.items():
+            links = relationship.get("links")
+            if not links:
+                new_relationships[key] = relationship
+                continue
+
+            if key not in type_templates:
+                type_templates[key] = {
+                    name: self.get_template(link, resource_id)
+                    for name, link in links.items()
+                }
+            templates = type_templates[key]
+            if any(
+                templates.get(name) is None
+                or templates[name].replace(self.placeholder, resource_id) != link
+                for name, link in links.items()
+            ):
+                new_relationships[key] = relationship
+                continue
+
+            relationship = {
+                name: value for name, value in relationship.items() if name != "links"
+            }
+            # relationships which only have links are declared by their templates
+            if relationship:
+                new_relationships[key] = relationship
+
+        resource_obj = {**resource_obj, "relationships": new_relationships}
+        if not new_relationships:
+            del resource_obj["relationships"]
+        return resource_obj
+
+    def get_meta(self):
+        """
+        Returns the templates by resource type and relationship.
+        """
+        meta = {}
+        for resource_type, type_templates in self.templates.items():
+            for key, templates in type_templates.items():
+                if templates and None not in templates.values():
+                    meta.setdefault(resource_type, {})[key] = templates
+        return meta
+
 
 class JSONRenderer(renderers.JSONRenderer):
     """
@@ -65,6 +411,13 @@ class JSONRenderer(renderers.JSONRenderer):
     media_type = "application/vnd.api+json"
     format = "vnd.api+json"
 
+    #: Profile a client may request in the `Accept` header to get link templates in
+    #: the top level `meta` instead of the links of every relationship.
+    link_templates_profile = (
+        "https://django-rest-framework-json-api.readthedocs.io/en/stable/"
+        "usage.html#link-templates"
+    )
+
     @classmethod
     def extract_attributes(cls, fields, resource):
         """
@@ -73,174 +426,303 @@ class JSONRenderer(renderers.JSONRenderer):
         Ensures that ID which is always provided in a JSON:API resource object
         and relationships are not returned.
         """
+        attributes = get_fields_render_plan(fields).attributes
 
         return {
-            format_field_name(field_name): value
+            attributes[field_name]: value
             for field_name, value in resource.items()
-            if field_name in fields
-            and field_name != "id"
-            and not is_relationship_field(fields[field_name])
+            if field_name in attributes
         }
 
     @classmethod
-    def extract_relationships(cls, fields, resource, resource_instance):
+    def extract_relationships(cls, fields, resource, resource_instance, linkage=None):
         """
         Builds the relationships top level object based on related serializers.
-        """
-        # Avoid circular deps
-        from rest_framework_json_api.relations import ResourceRelatedField
 
+        `linkage` may hold the related instances of relationships retrieved for
+        many resource instances at once, see `get_linkage`.
+        """
         data = {}
 
         # Don't try to extract relationships from a non-existent resource
         if resource_instance is None:
             return
 
-        for field_name, field in iter(fields.items()):
-            # Skip URL field
-            if field_name == api_settings.URL_FIELD_NAME:
+        plan = get_fields_render_plan(fields)
+
+        for field_name, key, relation_type, kind, has_links in plan.relationships:
+            relationship = cls.build_relationship(
+                fields[field_name],
+                relation_type,
+                kind,
+                has_links,
+                resource.get(field_name),
+                resource_instance,
+                linkage.get(field_name, resource_instance) if linkage else empty,
+            )
+            if relationship is not None:
+                data[key] = relationship
+
+        return data
+
+    @classmethod
+    def get_linkage(cls, fields, resource_instances, plan):
+        """
+        Retrieves the primary keys of the related instances of to-many relationships
+        of given resource instances which are rendered from the related instances
+        (`HyperlinkedIdentityField` and `ManyRelatedField` of other fields than
+        `ResourceRelatedField`) with one query per relationship.
+
+        Relationships which are prefetched already or whose related model has a
+        custom manager are left out.
+        """
+        linkage = Linkage()
+        instances = [
+            instance
+            for instance in resource_instances
+            if isinstance(instance, Model) and instance.pk is not None
+        ]
+        if not instances or len({type(instance) for instance in instances}) != 1:
+            return linkage
+
+        model = type(instances[0])
+        for field_name, _, relation_type, kind, _ in plan.relationships:
+            field = fields[field_name]
+            if kind == "identity":
+                meta = getattr(field.parent, "Meta", None)
+                if field_name in getattr(meta, "relationship_counts", {}):
+                    continue
+            elif kind != "many" or relation_type is None:
+                continue
+            elif isinstance(
+                field.child_relation, (ResourceRelatedField, HyperlinkedMixin)
+            ):
                 continue
 
-            # don't output a key for write only fields
-            if fields[field_name].write_only:
+            if len(field.source_attrs) != 1:
+                continue
+            source = field.source_attrs[0]
+            if any(
+                source in getattr(instance, "_prefetched_objects_cache", {})
+                for instance in instances
+            ):
                 continue
 
-            # Skip fields without relations
-            if not is_relationship_field(field):
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+
+            # lookup of the related model to given model and field holding its value
+            if isinstance(model_field, ManyToOneRel) and model_field.one_to_many:
+                lookup = model_field.field.name
+                key_attname = model_field.field.target_field.attname
+            elif isinstance(model_field, ManyToManyField):
+                lookup = model_field.related_query_name()
+                key_attname = model._meta.get_field(
+                    model_field.m2m_target_field_name()
+                ).attname
+            elif isinstance(model_field, ManyToManyRel):
+                lookup = model_field.field.name
+                key_attname = model._meta.get_field(
+                    model_field.field.m2m_reverse_target_field_name()
+                ).attname
+            else:
+                continue
+
+            related_model = model_field.related_model
+            if type(related_model._default_manager) is not Manager:
                 continue
 
-            source = field.source
-            relation_type = get_related_resource_type(field)
+            keys = {getattr(instance, key_attname) for instance in instances}
+            related_pks = defaultdict(list)
+            for key, pk in related_model._default_manager.filter(
+                **{f"{lookup}__in": keys}
+            ).values_list(lookup, "pk"):
+                related_pks[key].append(pk)
+            linkage.add(field_name, key_attname, related_pks)
+
+        return linkage
+
+    @classmethod
+    def get_serializer_linkage(
+        cls, serializer, plan_serializer, resource_name, resource_instances
+    ):
+        """
+        Returns the `Linkage` of given resource instances rendered with the same
+        serializer, or `None` when their resource objects are not built from its
+        fields by this renderer.
+        """
+        if (
+            getattr(serializer, "_poly_force_type_resolution", False)
+            or represents_resource_object(serializer)
+            # overrides of `extract_relationships` may not accept linkage
+            or cls.extract_relationships.__func__
+            is not JSONRenderer.extract_relationships.__func__
+        ):
+            return None
+
+        fields = get_serializer_fields(serializer)
+        return cls.get_linkage(
+            fields,
+            resource_instances,
+            cls.get_render_plan(fields, plan_serializer, resource_name),
+        )
+
+    @classmethod
+    def build_relationship(
+        cls,
+        field,
+        relation_type,
+        kind,
+        has_links,
+        value,
+        resource_instance,
+        relation_instance=empty,
+    ):
+        """
+        Builds the relationship object of a relationship field with given serialized
+        value, as classified by `RenderPlan`. Returns `None` if the relation can not
+        be resolved on the resource instance.
+
+        `relation_instance` may be passed for many related and identity fields when
+        the related instances have already been retrieved, e.g. with
+        `field.get_attribute` or `get_linkage`.
+        """
+        source = field.source
+        count = cls.get_relationship_count(field, resource_instance)
+
+        if kind == "identity" and count is not None:
+            # the count replaces the linkage, so the relation is not queried
+            return {"links": {"related": value}, "meta": {"count": count}}
 
-            if isinstance(field, relations.HyperlinkedIdentityField):
+        if kind == "identity":
+            if relation_instance is empty:
                 resolved, relation_instance = get_relation_instance(
                     resource_instance, source, field.parent
                 )
                 if not resolved:
-                    continue
-                # special case for HyperlinkedIdentityField
-                relation_data = list()
+                    return None
+            # special case for HyperlinkedIdentityField
+            # Don't try to query an empty relation
+            relation_queryset = (
+                relation_instance if relation_instance is not None else list()
+            )
 
-                # Don't try to query an empty relation
-                relation_queryset = (
-                    relation_instance if relation_instance is not None else list()
-                )
+            relation_data = [
+                {"type": relation_type, "id": force_str(related_object.pk)}
+                for related_object in relation_queryset
+            ]
+            return {
+                "links": {"related": value},
+                "data": relation_data,
+                "meta": {"count": len(relation_data)},
+            }
 
-                relation_data = [
-                    {"type": relation_type, "id": force_str(related_object.pk)}
-                    for related_object in relation_queryset
-                ]
-                data.update(
-                    {
-                        field_name: {
-                            "links": {"related": resource.get(field_name)},
-                            "data": relation_data,
-                            "meta": {"count": len(relation_data)},
-                        }
-                    }
-                )
-                continue
+        relation_data = {}
+        if has_links:
+            field_links = field.get_links(
+                resource_instance, field.related_link_lookup_field
+            )
+            relation_data.update({"links": field_links} if field_links else dict())
 
-            relation_data = {}
-            if isinstance(field, HyperlinkedMixin):
-                field_links = field.get_links(
-                    resource_instance, field.related_link_lookup_field
-                )
-                relation_data.update({"links": field_links} if field_links else dict())
-                data.update({field_name: relation_data})
+        if kind == "resource":
+            if not isinstance(field, SkipDataMixin):
+                relation_data.update({"data": value})
 
-            if isinstance(field, (ResourceRelatedField,)):
-                if not isinstance(field, SkipDataMixin):
-                    relation_data.update({"data": resource.get(field_name)})
+                if isinstance(field, ManySerializerMethodResourceRelatedField):
+                    relation_data.update({"meta": {"count": len(value)}})
 
-                    if isinstance(field, ManySerializerMethodResourceRelatedField):
-                        relation_data.update(
-                            {"meta": {"count": len(resource.get(field_name))}}
-                        )
+            if count is not None:
+                relation_data["meta"] = {"count": count}
 
-                data.update({field_name: relation_data})
-                continue
+            return relation_data
 
-            if isinstance(
-                field,
-                (relations.PrimaryKeyRelatedField, relations.HyperlinkedRelatedField),
-            ):
-                resolved, relation = get_relation_instance(
-                    resource_instance, f"{source}_id", field.parent
-                )
-                if not resolved:
-                    continue
-                relation_id = relation if resource.get(field_name) else None
-                relation_data = {"data": None}
-                if relation_id is not None:
-                    relation_data["data"] = {
-                        "type": relation_type,
-                        "id": force_str(relation_id),
-                    }
+        if kind == "pk":
+            resolved, relation = get_relation_instance(
+                resource_instance, f"{source}_id", field.parent
+            )
+            if not resolved:
+                return None
+            relation_id = relation if value else None
+            relation_data = {"data": None}
+            if relation_id is not None:
+                relation_data["data"] = {
+                    "type": relation_type,
+                    "id": force_str(relation_id),
+                }
 
-                if isinstance(
-                    field, relations.HyperlinkedRelatedField
-                ) and resource.get(field_name):
-                    relation_data.update(
-                        {"links": {"related": resource.get(field_name)}}
-                    )
-                data.update({field_name: relation_data})
-                continue
+            if isinstance(field, relations.HyperlinkedRelatedField) and value:
+                relation_data.update({"links": {"related": value}})
+            return relation_data
 
-            if isinstance(field, relations.ManyRelatedField):
+        if kind == "many":
+            if relation_instance is empty:
                 resolved, relation_instance = get_relation_instance(
                     resource_instance, source, field.parent
                 )
                 if not resolved:
-                    continue
+                    return None
 
-                relation_data = {}
+            relation_data = {}
 
-                if isinstance(resource.get(field_name), Iterable):
-                    relation_data.update(
-                        {"meta": {"count": len(resource.get(field_name))}}
-                    )
+            if count is not None:
+                relation_data.update({"meta": {"count": count}})
+            elif isinstance(value, Iterable):
+                relation_data.update({"meta": {"count": len(value)}})
 
-                if isinstance(field.child_relation, ResourceRelatedField):
-                    # special case for ResourceRelatedField
-                    relation_data.update({"data": resource.get(field_name)})
+            if isinstance(field.child_relation, ResourceRelatedField):
+                # special case for ResourceRelatedField
+                if not isinstance(field, SkipDataMixin):
+                    relation_data.update({"data": value})
 
-                if isinstance(field.child_relation, HyperlinkedMixin):
-                    field_links = field.child_relation.get_links(
-                        resource_instance,
-                        field.child_relation.related_link_lookup_field,
-                    )
-                    relation_data.update(
-                        {"links": field_links} if field_links else dict()
-                    )
+            if isinstance(field.child_relation, HyperlinkedMixin):
+                field_links = field.child_relation.get_links(
+                    resource_instance,
+                    field.child_relation.related_link_lookup_field,
+                )
+                relation_data.update({"links": field_links} if field_links else dict())
 
-                    data.update({field_name: relation_data})
-                    continue
+                return relation_data
 
-                relation_data = list()
-                for nested_resource_instance in relation_instance:
-                    nested_resource_instance_type = (
-                        relation_type
-                        or get_resource_type_from_instance(nested_resource_instance)
-                    )
+            relation_data = list()
+            for nested_resource_instance in relation_instance:
+                nested_resource_instance_type = (
+                    relation_type
+                    or get_resource_type_from_instance(nested_resource_instance)
+                )
 
-                    relation_data.append(
-                        {
-                            "type": nested_resource_instance_type,
-                            "id": force_str(nested_resource_instance.pk),
-                        }
-                    )
-                data.update(
+                relation_data.append(
                     {
-                        field_name: {
-                            "data": relation_data,
-                            "meta": {"count": len(relation_data)},
-                        }
+                        "type": nested_resource_instance_type,
+                        "id": force_str(nested_resource_instance.pk),
                     }
                 )
-                continue
+            return {
+                "data": relation_data,
+                "meta": {"count": len(relation_data) if count is None else count},
+            }
 
-        return format_field_names(data)
+        return relation_data
+
+    @classmethod
+    def get_relationship_count(cls, field, resource_instance):
+        """
+        Returns the count of related instances of given relationship field taken
+        from the attribute of the resource instance configured with the
+        `relationship_counts` option of the serializer `Meta`, or `None` when it
+        is not configured or the resource instance lacks the attribute (e.g. when
+        it is not annotated, as for a created instance).
+        """
+        meta = getattr(field.parent, "Meta", None)
+        count_source = getattr(meta, "relationship_counts", {}).get(field.field_name)
+        if count_source is None:
+            return None
+
+        try:
+            return get_attribute(resource_instance, count_source.split("."))
+        except (AttributeError, KeyError):
+            return None
 
     @classmethod
     def extract_relation_instance(cls, field, resource_instance):
@@ -265,17 +747,28 @@ class JSONRenderer(renderers.JSONRenderer):
         """
         Adds related data to the top level included key when the request includes
         ?include=example,example_field2
+
+        When `included_cache` is an `IncludedCache` related instances are only queued
+        and serialized in batches per serializer class by `serialize_included`.
         """
         # this function may be called with an empty record (example: Browsable Interface)
         if not resource_instance:
             return
 
+        if isinstance(included_cache, IncludedCache):
+            queue = included_cache
+        else:
+            queue = IncludedCache()
+
         current_serializer = fields.serializer
         context = current_serializer.context
+        resource_object = represents_resource_object(
+            current_serializer, resource_instance
+        )
         included_serializers = getattr(
             current_serializer, "included_serializers", dict()
         )
-        included_resources = copy.copy(included_resources)
+        include_tree = get_include_tree(included_resources)
 
         for field_name, field in iter(fields.items()):
             # Skip URL field
@@ -286,34 +779,39 @@ class JSONRenderer(renderers.JSONRenderer):
             if not is_relationship_field(field):
                 continue
 
-            try:
-                included_resources.remove(field_name)
-            except ValueError:
-                # Skip fields not in requested included resources
-                # If no child field, directly continue with the next field
-                if field_name not in [
-                    node.split(".")[0] for node in included_resources
-                ]:
-                    continue
+            # Skip fields not in requested included resources
+            if field_name not in include_tree:
+                continue
 
             relation_instance = cls.extract_relation_instance(field, resource_instance)
             if isinstance(relation_instance, Manager):
                 relation_instance = relation_instance.all()
 
-            serializer_data = resource.get(field_name)
+            if relation_instance is None:
+                continue
 
             if isinstance(field, relations.ManyRelatedField):
-                serializer_class = included_serializers[field_name]
-                field = serializer_class(relation_instance, many=True, context=context)
-                serializer_data = field.data
+                many = True
+            else:
+                if resource_object:
+                    serializer_data = (
+                        resource.get("relationships", {})
+                        .get(format_field_name(field_name), {})
+                        .get("data")
+                    )
+                else:
+                    serializer_data = resource.get(field_name)
 
-            if isinstance(field, relations.RelatedField):
-                if relation_instance is None or not serializer_data:
+                if not serializer_data:
                     continue
 
                 many = field._kwargs.get("child_relation", None) is not None
 
-                if isinstance(field, ResourceRelatedField) and not many:
+                if (
+                    isinstance(field, ResourceRelatedField)
+                    and not many
+                    and queue is not included_cache
+                ):
                     already_included = (
                         serializer_data["type"] in included_cache
                         and serializer_data["id"]
@@ -323,76 +821,184 @@ class JSONRenderer(renderers.JSONRenderer):
                     if already_included:
                         continue
 
-                serializer_class = included_serializers[field_name]
-                field = serializer_class(relation_instance, many=many, context=context)
-                serializer_data = field.data
+            new_included_resources = list(include_tree[field_name])
 
-            new_included_resources = [
-                key.replace(f"{field_name}.", "", 1)
-                for key in included_resources
-                if field_name == key.split(".")[0]
-            ]
+            queue.add(
+                included_serializers[field_name],
+                context,
+                relation_instance if many else [relation_instance],
+                new_included_resources,
+            )
 
-            if isinstance(field, ListSerializer):
-                serializer = field.child
-                relation_type = get_resource_type_from_serializer(serializer)
-                relation_queryset = list(relation_instance)
-
-                if serializer_data:
-                    for position in range(len(serializer_data)):
-                        serializer_resource = serializer_data[position]
-                        nested_resource_instance = relation_queryset[position]
-                        resource_type = (
-                            relation_type
-                            or get_resource_type_from_instance(nested_resource_instance)
+        if queue is not included_cache:
+            cls.serialize_included(queue)
+            for included_type, included_objects in queue.items():
+                included_cache[included_type].update(included_objects)
+
+    @classmethod
+    def serialize_included(cls, included_cache):
+        """
+        Serializes the related instances queued in given `IncludedCache`.
+
+        Instances are serialized at once per serializer class; relations of those
+        are queued again until all requested includes are resolved.
+        """
+        while included_cache.pending or included_cache.nested:
+            nested = included_cache.nested
+            included_cache.nested = []
+            for included, included_resources in nested:
+                cls.extract_included(
+                    included.fields,
+                    included.resource,
+                    included.instance,
+                    included_resources,
+                    included_cache,
+                )
+
+            pending = included_cache.pending
+            included_cache.pending = {}
+
+            for serializer_class, (context, items) in pending.items():
+                is_polymorphic = issubclass(
+                    serializer_class,
+                    rest_framework_json_api.serializers.PolymorphicModelSerializer,
+                )
+                resources = []
+                for included in items:
+                    identity = included_cache.get_identity(
+                        serializer_class, included.instance
+                    )
+                    resources.append(
+                        (
+                            (
+                                serializer_class.get_polymorphic_serializer_for_instance(
+                                    included.instance
+                                )
+                                if is_polymorphic
+                                else serializer_class
+                            ),
+                            identity[0] if identity else None,
+                            included.instance,
                         )
-                        serializer_fields = get_serializer_fields(
-                            serializer.__class__(
-                                nested_resource_instance, context=serializer.context
+                    )
+                keys, cached_objs = cls.get_cached_resource_objs(
+                    resources, context.get("request")
+                )
+
+                uncached = []
+                for included, key in zip(items, keys):
+                    cached_obj = cached_objs.get(key)
+                    # relations of cached resource objects are only known when
+                    # serialized so those need to be serialized to include more
+                    if cached_obj is None or included.included_resources:
+                        uncached.append((included, key))
+                        continue
+
+                    included_cache[cached_obj["type"]][cached_obj["id"]] = cached_obj
+                    included.cached = True
+
+                if not uncached:
+                    continue
+
+                list_serializer = serializer_class(
+                    [included.instance for included, _ in uncached],
+                    many=True,
+                    context=context,
+                )
+                serializer = list_serializer.child
+                serializer_data = list_serializer.data
+                relation_type = get_resource_type_from_serializer(serializer)
+                resource_serializers = {}
+                linkage = None
+                plan = None
+                if not is_polymorphic and relation_type:
+                    plan = cls.get_render_plan(
+                        get_serializer_fields(serializer), serializer, relation_type
+                    )
+                    linkage = cls.get_serializer_linkage(
+                        serializer,
+                        serializer,
+                        relation_type,
+                        [included.instance for included, _ in uncached],
+                    )
+                new_objs = {}
+
+                for serializer_resource, (included, key) in zip(
+                    serializer_data, uncached
+                ):
+                    nested_resource_instance = included.instance
+                    resource_serializer = serializer
+                    if is_polymorphic:
+                        resource_serializer_class = (
+                            serializer.get_polymorphic_serializer_for_instance(
+                                nested_resource_instance
                             )
                         )
-                        new_item = cls.build_json_resource_obj(
-                            serializer_fields,
-                            serializer_resource,
-                            nested_resource_instance,
-                            resource_type,
-                            serializer,
-                            getattr(serializer, "_poly_force_type_resolution", False),
-                        )
-                        included_cache[new_item["type"]][new_item["id"]] = new_item
-
-                        cls.extract_included(
-                            serializer_fields,
-                            serializer_resource,
-                            nested_resource_instance,
-                            new_included_resources,
-                            included_cache,
-                        )
-
-            if isinstance(field, Serializer):
-                relation_type = get_resource_type_from_serializer(field)
+                        if resource_serializer_class not in resource_serializers:
+                            resource_serializers[resource_serializer_class] = (
+                                resource_serializer_class(context=context)
+                            )
+                        resource_serializer = resource_serializers[
+                            resource_serializer_class
+                        ]
 
-                # Get the serializer fields
-                serializer_fields = get_serializer_fields(field)
-                if serializer_data:
+                    resource_type = relation_type or get_resource_type_from_instance(
+                        nested_resource_instance
+                    )
+                    serializer_fields = get_serializer_fields(resource_serializer)
                     new_item = cls.build_json_resource_obj(
                         serializer_fields,
-                        serializer_data,
-                        relation_instance,
-                        relation_type,
-                        field,
-                        getattr(field, "_poly_force_type_resolution", False),
+                        serializer_resource,
+                        nested_resource_instance,
+                        resource_type,
+                        serializer,
+                        getattr(
+                            resource_serializer, "_poly_force_type_resolution", False
+                        ),
+                        linkage,
+                        plan,
                     )
                     included_cache[new_item["type"]][new_item["id"]] = new_item
+                    if key is not None and key not in cached_objs:
+                        new_objs[key] = new_item
+                    included.fields = serializer_fields
+                    included.resource = serializer_resource
 
                     cls.extract_included(
                         serializer_fields,
-                        serializer_data,
-                        relation_instance,
-                        new_included_resources,
+                        serializer_resource,
+                        nested_resource_instance,
+                        included.included_resources,
                         included_cache,
                     )
 
+                cls.cache_resource_objs(new_objs)
+
+    @classmethod
+    def get_cached_resource_objs(cls, resources, request=None):
+        """
+        Looks up the resource objects of given `(serializer_class, resource_type,
+        instance)` tuples in the cache configured with `JSON_API_RESOURCE_CACHE`.
+
+        Returns the cache key of each resource, `None` for resources which are not
+        cached, and the cached resource objects found by key.
+        """
+        resource_cache = get_resource_cache()
+        if resource_cache is None:
+            return [None] * len(resources), {}
+
+        keys = resource_cache.get_keys(resources, request)
+        return keys, resource_cache.get_many(keys)
+
+    @classmethod
+    def cache_resource_objs(cls, resource_objs):
+        """
+        Stores given resource objects by cache key in the resource cache.
+        """
+        resource_cache = get_resource_cache()
+        if resource_cache is not None:
+            resource_cache.set_many(resource_objs)
+
     @classmethod
     def extract_meta(cls, serializer, resource):
         """
@@ -431,12 +1037,8 @@ class JSONRenderer(renderers.JSONRenderer):
     def _filter_sparse_fields(cls, serializer, fields, resource_name):
         request = serializer.context.get("request")
         if request:
-            sparse_fieldset_query_param = f"fields[{resource_name}]"
-            sparse_fieldset_value = request.query_params.get(
-                sparse_fieldset_query_param
-            )
-            if sparse_fieldset_value is not None:
-                sparse_fields = sparse_fieldset_value.split(",")
+            sparse_fields = get_query(request).get_sparse_fieldset(resource_name)
+            if sparse_fields is not None:
                 return {
                     field_name: field
                     for field_name, field, in fields.items()
@@ -451,6 +1053,36 @@ class JSONRenderer(renderers.JSONRenderer):
 
         return fields
 
+    @classmethod
+    def get_render_plan(cls, fields, serializer, resource_name):
+        """
+        Returns the `RenderPlan` of given fields.
+
+        Plans are cached per serializer class, resource type, sparse fieldset and
+        set of fields.
+        """
+        request = serializer.context.get("request")
+        sparse_fieldset = (
+            get_query(request).get_sparse_fieldset(resource_name) if request else None
+        )
+        key = (
+            cls,
+            getattr(fields, "serializer", serializer).__class__,
+            resource_name,
+            sparse_fieldset,
+            tuple(
+                (field_name, field.__class__) for field_name, field in fields.items()
+            ),
+        )
+
+        plan = _render_plans.get(key)
+        if plan is None:
+            plan = _render_plans[key] = RenderPlan(
+                cls._filter_sparse_fields(serializer, fields, resource_name)
+            )
+
+        return plan
+
     @classmethod
     def build_json_resource_obj(
         cls,
@@ -460,10 +1092,23 @@ class JSONRenderer(renderers.JSONRenderer):
         resource_name,
         serializer,
         force_type_resolution=False,
+        linkage=None,
+        plan=None,
     ):
         """
         Builds the resource object (type, id, attributes) and extracts relationships.
+
+        Resources of serializers which represent their instances as resource
+        objects already are returned as is. Given `plan` must be the `RenderPlan` of
+        given fields and resource type, and is looked up when missing.
         """
+        if represents_resource_object(
+            getattr(fields, "serializer", serializer), resource_instance
+        ):
+            if not force_type_resolution and resource_name:
+                resource["type"] = resource_name
+            return resource
+
         # Determine type from the instance if the underlying model is polymorphic
         if force_type_resolution:
             resource_name = get_resource_type_from_instance(resource_instance)
@@ -472,19 +1117,24 @@ class JSONRenderer(renderers.JSONRenderer):
             "id": get_resource_id(resource_instance, resource),
         }
 
-        # TODO remove this filter by rewriting extract_relationships
-        # so it uses the serialized data as a basis
-        fields = cls._filter_sparse_fields(serializer, fields, resource_name)
+        if plan is None:
+            plan = cls.get_render_plan(fields, serializer, resource_name)
+        fields = plan.bind(fields)
         attributes = cls.extract_attributes(fields, resource)
         if attributes:
             resource_data["attributes"] = attributes
-        relationships = cls.extract_relationships(fields, resource, resource_instance)
+        if linkage is None:
+            relationships = cls.extract_relationships(
+                fields, resource, resource_instance
+            )
+        else:
+            relationships = cls.extract_relationships(
+                fields, resource, resource_instance, linkage=linkage
+            )
         if relationships:
             resource_data["relationships"] = relationships
         # Add 'self' link if field is present and valid
-        if api_settings.URL_FIELD_NAME in resource and isinstance(
-            fields[api_settings.URL_FIELD_NAME], relations.HyperlinkedIdentityField
-        ):
+        if plan.self_link and api_settings.URL_FIELD_NAME in resource:
             resource_data["links"] = {"self": resource[api_settings.URL_FIELD_NAME]}
 
         meta = cls.extract_meta(serializer, resource)
@@ -493,6 +1143,206 @@ class JSONRenderer(renderers.JSONRenderer):
 
         return resource_data
 
+    @classmethod
+    def build_json_resource_objs(
+        cls,
+        serializer,
+        serializer_data,
+        resource_name,
+        included_resources,
+        included_cache,
+    ):
+        """
+        Builds the resource objects of data serialized by a list serializer and
+        extracts the related resources to include.
+        """
+        json_api_data = list()
+        resource_serializers = []
+        resources = []
+        polymorphic_serializers = {}
+
+        for position in range(len(serializer_data)):
+            resource_instance = serializer.instance[position]  # Get current instance
+
+            if isinstance(
+                serializer.child,
+                rest_framework_json_api.serializers.PolymorphicModelSerializer,
+            ):
+                polymorphic_serializer_class = (
+                    serializer.child.get_polymorphic_serializer_for_instance(
+                        resource_instance
+                    )
+                )
+                if polymorphic_serializer_class not in polymorphic_serializers:
+                    polymorphic_serializers[polymorphic_serializer_class] = (
+                        polymorphic_serializer_class(context=serializer.child.context)
+                    )
+                resource_serializer_class = polymorphic_serializers[
+                    polymorphic_serializer_class
+                ]
+            else:
+                resource_serializer_class = serializer.child
+
+            resource_type = (
+                get_resource_type_from_instance(resource_instance)
+                if getattr(
+                    resource_serializer_class, "_poly_force_type_resolution", False
+                )
+                else resource_name
+            )
+            resource_serializers.append(resource_serializer_class)
+            resources.append(
+                (resource_serializer_class.__class__, resource_type, resource_instance)
+            )
+
+        # resource objects of the primary data may have been looked up already
+        cached_resources = get_cached_resources(serializer)
+        if cached_resources is not None and cached_resources.matches(
+            resource_name, [instance for _, _, instance in resources]
+        ):
+            keys, cached_objs = cached_resources.keys, cached_resources.resource_objs
+        else:
+            keys, cached_objs = cls.get_cached_resource_objs(
+                resources, serializer.context.get("request")
+            )
+        new_objs = {}
+        plans = {}
+
+        uncached_instances = [
+            instance
+            for (_, _, instance), key in zip(resources, keys)
+            if key not in cached_objs
+        ]
+        linkage = None
+        if not polymorphic_serializers and uncached_instances:
+            linkage = cls.get_serializer_linkage(
+                serializer.child, serializer, resource_name, uncached_instances
+            )
+
+        for position in range(len(serializer_data)):
+            resource = serializer_data[position]  # Get current resource
+            resource_instance = resources[position][2]
+            resource_serializer_class = resource_serializers[position]
+            key = keys[position]
+
+            json_resource_obj = cached_objs.get(key)
+            if json_resource_obj is not None and not included_resources:
+                json_api_data.append(json_resource_obj)
+                continue
+
+            fields = get_serializer_fields(resource_serializer_class)
+            force_type_resolution = getattr(
+                resource_serializer_class, "_poly_force_type_resolution", False
+            )
+
+            if json_resource_obj is None:
+                # the plan only depends on the serializer and the resource type
+                resource_type = resources[position][1]
+                plan_key = (id(resource_serializer_class), resource_type)
+                plan = plans.get(plan_key)
+                if plan is None:
+                    plan = plans[plan_key] = cls.get_render_plan(
+                        fields, serializer, resource_type
+                    )
+                json_resource_obj = cls.build_json_resource_obj(
+                    fields,
+                    resource,
+                    resource_instance,
+                    resource_name,
+                    serializer,
+                    force_type_resolution,
+                    linkage,
+                    plan,
+                )
+                if key is not None:
+                    new_objs[key] = json_resource_obj
+            json_api_data.append(json_resource_obj)
+
+            cls.extract_included(
+                fields,
+                resource,
+                resource_instance,
+                included_resources,
+                included_cache,
+            )
+
+        cls.cache_resource_objs(new_objs)
+        return json_api_data
+
+    @classmethod
+    def get_included_objects(cls, included_cache, primary_identities):
+        """
+        Returns the resource objects of the top level included key sorted by type and
+        id, leaving out resources which are part of the primary data.
+        """
+        included = []
+        for included_type in sorted(included_cache.keys()):
+            for included_id in sorted(included_cache[included_type].keys()):
+                if (included_type, included_id) not in primary_identities:
+                    included.append(included_cache[included_type][included_id])
+        return included
+
+    def render_json(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Encodes given data as JSON with the backend configured in
+        `JSON_API_JSON_BACKEND`, if any, or the standard library otherwise.
+        """
+        backend = get_json_backend()
+        # backends are expected to render utf-8 and not to escape non-ascii characters
+        if backend is not None and data is not None and not self.ensure_ascii:
+            indent = self.get_indent(accepted_media_type, renderer_context or {})
+            if indent is not None or self.compact:
+                try:
+                    ret = backend.dumps(
+                        data, default=self.encoder_class().default, indent=indent
+                    )
+                except (TypeError, ValueError):
+                    # let the standard library encode or report the error
+                    pass
+                else:
+                    # escape as the standard renderer always does
+                    return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                        b"\xe2\x80\xa9", b"\\u2029"
+                    )
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def get_link_templates(self, accepted_media_type, renderer_context):
+        """
+        Returns a `LinkTemplates` when the link templates profile is requested with
+        given media type, otherwise `None`.
+
+        The profile is announced in the `Content-Type` of the response then.
+        """
+        if not self.link_templates_requested(accepted_media_type):
+            return None
+
+        response = renderer_context.get("response")
+        if response is not None:
+            response["Content-Type"] = self.get_content_type(accepted_media_type)
+        return LinkTemplates()
+
+    def link_templates_requested(self, accepted_media_type):
+        """
+        Tells whether the link templates profile is requested with given media type.
+        """
+        if not accepted_media_type:
+            return False
+
+        _, params = parse_header_parameters(accepted_media_type)
+        return self.link_templates_profile in params.get("profile", "").split()
+
+    def get_content_type(self, accepted_media_type):
+        """
+        Returns the `Content-Type` of a response rendered for given accepted media
+        type, which announces the link templates profile when it is requested.
+        """
+        if self.link_templates_requested(accepted_media_type):
+            return f'{self.media_type}; profile="{self.link_templates_profile}"'
+        if self.charset:
+            return f"{self.media_type}; charset={self.charset}"
+        return self.media_type
+
     def render_relationship_view(
         self, data, accepted_media_type=None, renderer_context=None
     ):
@@ -502,10 +1352,10 @@ class JSONRenderer(renderers.JSONRenderer):
         links = view.get_links()
         if links:
             render_data["links"] = links
-        return super().render(render_data, accepted_media_type, renderer_context)
+        return self.render_json(render_data, accepted_media_type, renderer_context)
 
     def render_errors(self, data, accepted_media_type=None, renderer_context=None):
-        return super().render(
+        return self.render_json(
             format_errors(data), accepted_media_type, renderer_context
         )
 
@@ -526,7 +1376,7 @@ class JSONRenderer(renderers.JSONRenderer):
         # be None
         response = renderer_context.get("response", None)
         if response is not None and response.status_code == 204:
-            return super().render(None, accepted_media_type, renderer_context)
+            return self.render_json(None, accepted_media_type, renderer_context)
 
         from rest_framework_json_api.views import RelationshipView
 
@@ -538,12 +1388,10 @@ class JSONRenderer(renderers.JSONRenderer):
         # If `resource_name` is set to None then render default as the dev
         # wants to build the output format manually.
         if resource_name is None or resource_name is False:
-            return super().render(data, accepted_media_type, renderer_context)
+            return self.render_json(data, accepted_media_type, renderer_context)
 
         json_api_data = data
-        # initialize json_api_meta with pagination meta or an empty dict
-        json_api_meta = data.get("meta", {}) if isinstance(data, dict) else {}
-        included_cache = defaultdict(dict)
+        included_cache = IncludedCache()
 
         if data and "results" in data:
             serializer_data = data["results"]
@@ -552,6 +1400,24 @@ class JSONRenderer(renderers.JSONRenderer):
 
         serializer = getattr(serializer_data, "serializer", None)
 
+        # data holding a single resource object has no top level members
+        document_data = data
+        if (
+            serializer is not None
+            and not getattr(serializer, "many", False)
+            and (
+                represents_resource_object(serializer, serializer.instance)
+                # the serializer returned the cached resource object
+                or get_cached_resources(serializer, serializer.instance) is not None
+            )
+        ):
+            document_data = None
+
+        # initialize json_api_meta with pagination meta or an empty dict
+        json_api_meta = (
+            document_data.get("meta", {}) if isinstance(document_data, dict) else {}
+        )
+
         included_resources = get_included_resources(request, serializer)
 
         if serializer is not None:
@@ -559,77 +1425,77 @@ class JSONRenderer(renderers.JSONRenderer):
             json_api_meta.update(self.extract_root_meta(serializer, serializer_data))
 
             if getattr(serializer, "many", False):
-                json_api_data = list()
-
-                for position in range(len(serializer_data)):
-                    resource = serializer_data[position]  # Get current resource
-                    resource_instance = serializer.instance[
-                        position
-                    ]  # Get current instance
-
-                    if isinstance(
-                        serializer.child,
-                        rest_framework_json_api.serializers.PolymorphicModelSerializer,
-                    ):
-                        resource_serializer_class = (
-                            serializer.child.get_polymorphic_serializer_for_instance(
-                                resource_instance
-                            )(context=serializer.child.context)
-                        )
-                    else:
-                        resource_serializer_class = serializer.child
+                json_api_data = self.build_json_resource_objs(
+                    serializer,
+                    serializer_data,
+                    resource_name,
+                    included_resources,
+                    included_cache,
+                )
+            else:
+                force_type_resolution = getattr(
+                    serializer, "_poly_force_type_resolution", False
+                )
 
-                    fields = get_serializer_fields(resource_serializer_class)
-                    force_type_resolution = getattr(
-                        resource_serializer_class, "_poly_force_type_resolution", False
+                resource_instance = serializer.instance
+                resource_serializer_class = serializer.__class__
+                if resource_instance is not None and isinstance(
+                    serializer,
+                    rest_framework_json_api.serializers.PolymorphicModelSerializer,
+                ):
+                    resource_serializer_class = (
+                        serializer.get_polymorphic_serializer_for_instance(
+                            resource_instance
+                        )
+                    )
+                resource_type = (
+                    get_resource_type_from_instance(resource_instance)
+                    if force_type_resolution
+                    else resource_name
+                )
+                cached_resources = get_cached_resources(serializer)
+                if cached_resources is not None and cached_resources.matches(
+                    resource_type, [resource_instance]
+                ):
+                    (key,) = cached_resources.keys
+                    cached_objs = cached_resources.resource_objs
+                else:
+                    (key,), cached_objs = self.get_cached_resource_objs(
+                        [(resource_serializer_class, resource_type, resource_instance)],
+                        request,
                     )
 
-                    json_resource_obj = self.build_json_resource_obj(
+                json_api_data = cached_objs.get(key)
+                if json_api_data is None or included_resources:
+                    fields = get_serializer_fields(serializer)
+                if json_api_data is None:
+                    json_api_data = self.build_json_resource_obj(
                         fields,
-                        resource,
+                        serializer_data,
                         resource_instance,
                         resource_name,
                         serializer,
                         force_type_resolution,
                     )
-                    json_api_data.append(json_resource_obj)
+                    if key is not None:
+                        self.cache_resource_objs({key: json_api_data})
 
+                if included_resources:
                     self.extract_included(
                         fields,
-                        resource,
+                        serializer_data,
                         resource_instance,
                         included_resources,
                         included_cache,
                     )
-            else:
-                fields = get_serializer_fields(serializer)
-                force_type_resolution = getattr(
-                    serializer, "_poly_force_type_resolution", False
-                )
 
-                resource_instance = serializer.instance
-                json_api_data = self.build_json_resource_obj(
-                    fields,
-                    serializer_data,
-                    resource_instance,
-                    resource_name,
-                    serializer,
-                    force_type_resolution,
-                )
-
-                self.extract_included(
-                    fields,
-                    serializer_data,
-                    resource_instance,
-                    included_resources,
-                    included_cache,
-                )
+        self.serialize_included(included_cache)
 
         # Make sure we render data in a specific order
         render_data = {}
 
-        if isinstance(data, dict) and data.get("links"):
-            render_data["links"] = data.get("links")
+        if isinstance(document_data, dict) and document_data.get("links"):
+            render_data["links"] = document_data.get("links")
 
         # format the api root link list
         if view.__class__ and view.__class__.__name__ == "APIRoot":
@@ -638,32 +1504,112 @@ class JSONRenderer(renderers.JSONRenderer):
         else:
             render_data["data"] = json_api_data
 
-        if included_cache:
+        if included_resources:
             if isinstance(json_api_data, list):
                 objects = json_api_data
             else:
                 objects = [json_api_data]
 
-            for object in objects:
-                obj_type = object.get("type")
-                obj_id = object.get("id")
-                if obj_type in included_cache and obj_id in included_cache[obj_type]:
-                    del included_cache[obj_type][obj_id]
-                if not included_cache[obj_type]:
-                    del included_cache[obj_type]
+            render_data["included"] = self.get_included_objects(
+                included_cache, [(obj.get("type"), obj.get("id")) for obj in objects]
+            )
 
-        if included_resources:
-            render_data["included"] = list()
-            for included_type in sorted(included_cache.keys()):
-                for included_id in sorted(included_cache[included_type].keys()):
-                    render_data["included"].append(
-                        included_cache[included_type][included_id]
-                    )
+        link_templates = self.get_link_templates(accepted_media_type, renderer_context)
+        if link_templates is not None:
+            if isinstance(render_data["data"], list):
+                render_data["data"] = [
+                    link_templates.apply(obj) for obj in render_data["data"]
+                ]
+            elif isinstance(render_data["data"], dict):
+                render_data["data"] = link_templates.apply(render_data["data"])
+            if "included" in render_data:
+                render_data["included"] = [
+                    link_templates.apply(obj) for obj in render_data["included"]
+                ]
 
         if json_api_meta:
             render_data["meta"] = format_field_names(json_api_meta)
+        if link_templates is not None and link_templates.get_meta():
+            render_data.setdefault("meta", {})[
+                "linkTemplates"
+            ] = link_templates.get_meta()
+
+        return self.render_json(render_data, accepted_media_type, renderer_context)
+
+    def render_stream(
+        self, chunks, data=None, accepted_media_type=None, renderer_context=None
+    ):
+        """
+        Renders the JSON:API document of a list of resources part by part.
+
+        `chunks` is an iterable of the data serialized by a list serializer for
+        consecutive parts of the list. `data` may hold the top level `links` and
+        `meta`, as the data of a paginated response does. Resource objects are
+        rendered as soon as their chunk is serialized; `included` and `meta`
+        follow at the end.
+
+        One part is yielded per chunk, so errors raised while rendering the first
+        chunk are raised by the first `next()` call, before anything is sent.
+        """
+        renderer_context = renderer_context or {}
+        request = renderer_context.get("request", None)
+        resource_name = get_resource_name(renderer_context)
+        data = data or {}
+
+        json_api_meta = dict(data.get("meta", {}))
+        included_cache = IncludedCache()
+        included_resources = []
+        primary_identities = set()
+        link_templates = self.get_link_templates(accepted_media_type, renderer_context)
+
+        def render_json(value):
+            return self.render_json(value, accepted_media_type, renderer_context)
+
+        parts = [b"{"]
+        if data.get("links"):
+            parts.append(b'"links":' + render_json(data["links"]) + b",")
+
+        parts.append(b'"data":[')
+        separator = b""
+        for serializer_data in chunks:
+            serializer = serializer_data.serializer
+            included_resources = get_included_resources(request, serializer)
+            json_api_meta.update(self.extract_root_meta(serializer, serializer_data))
+
+            for json_resource_obj in self.build_json_resource_objs(
+                serializer,
+                serializer_data,
+                resource_name,
+                included_resources,
+                included_cache,
+            ):
+                primary_identities.add(
+                    (json_resource_obj["type"], json_resource_obj["id"])
+                )
+                if link_templates is not None:
+                    json_resource_obj = link_templates.apply(json_resource_obj)
+                parts.append(separator + render_json(json_resource_obj))
+                separator = b","
+
+            self.serialize_included(included_cache)
+            yield b"".join(parts)
+            parts = []
+        parts.append(b"]")
+
+        if included_resources:
+            included = self.get_included_objects(included_cache, primary_identities)
+            if link_templates is not None:
+                included = [link_templates.apply(obj) for obj in included]
+            parts.append(b',"included":' + render_json(included))
+
+        json_api_meta = format_field_names(json_api_meta)
+        if link_templates is not None and link_templates.get_meta():
+            json_api_meta["linkTemplates"] = link_templates.get_meta()
+        if json_api_meta:
+            parts.append(b',"meta":' + render_json(json_api_meta))
 
-        return super().render(render_data, accepted_media_type, renderer_context)
+        parts.append(b"}")
+        yield b"".join(parts)
 
 
 class BrowsableAPIRenderer(renderers.BrowsableAPIRenderer):
@@ -0,0 +1,371 @@
+"""
+Cache of rendered resource objects which is shared between requests.
+See `JSON_API_RESOURCE_CACHE` setting.
+
+Resource objects are only cached for serializers which opt in with
+`resource_cache = True` in their `Meta` class. Cached resource objects are
+invalidated by version tokens which are kept in the same cache per instance and
+reset whenever an instance of the serializer's model is saved or deleted, or its
+many to many relations change.
+
+A version token records when it was created. Resource objects are only stored
+under tokens created before the request started, as the instances may have been
+read before a concurrent save reset the token.
+"""
+
+import hashlib
+import time
+import uuid
+
+from django.core.cache import caches
+from django.core.signals import request_started
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+
+from rest_framework_json_api.query import get_query
+from rest_framework_json_api.settings import json_api_settings
+
+_models = set()
+
+REQUEST_STARTED_KEY = "rest_framework_json_api.request_started"
+
+
+def register_model(model):
+    """
+    Registers a model which resource objects are cached so the cache gets
+    invalidated when its instances change.
+    """
+    _models.add(model._meta.concrete_model)
+
+
+def get_registered_models(model):
+    """
+    Returns the registered models an instance of given model is part of,
+    including parent models of multi-table inheritance.
+    """
+    if not _models:
+        return []
+
+    model = model._meta.concrete_model
+    return [
+        registered_model
+        for registered_model in (model, *model._meta.get_parent_list())
+        if registered_model in _models
+    ]
+
+
+def is_cached(serializer_class):
+    meta = getattr(serializer_class, "Meta", None)
+    return getattr(meta, "resource_cache", False) and hasattr(meta, "model")
+
+
+class CachedResources:
+    """
+    The cache keys and the cached resource objects of the primary data of a
+    serializer, looked up before serializing it.
+    """
+
+    def __init__(self, resource_type, instances, keys, resource_objs):
+        self.resource_type = resource_type
+        self.instances = instances
+        self.keys = keys
+        self.resource_objs = resource_objs
+        self.positions = {
+            id(instance): position for position, instance in enumerate(instances)
+        }
+
+    def get(self, instance):
+        """
+        Returns the cached resource object of given instance or `None`.
+        """
+        position = self.positions.get(id(instance))
+        if position is None:
+            return None
+        return self.resource_objs.get(self.keys[position])
+
+    def matches(self, resource_type, instances):
+        """
+        Tells whether the resources have been looked up for given resource type
+        and instances.
+        """
+        return (
+            resource_type == self.resource_type
+            and len(instances) == len(self.instances)
+            and all(
+                instance is looked_up
+                for instance, looked_up in zip(instances, self.instances)
+            )
+        )
+
+
+class ResourceCache:
+    """
+    Resource objects stored in a Django cache.
+    """
+
+    key_prefix = "rest_framework_json_api"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get_version_key(self, model, pk=None):
+        if pk is None:
+            return f"{self.key_prefix}:version:{model._meta.label}"
+        return f"{self.key_prefix}:version:{model._meta.label}:{pk}"
+
+    def get_versions(self, version_keys):
+        """
+        Returns the version tokens of given version keys, starting a new version
+        for keys which are not in the cache (anymore).
+
+        Tokens are `(created, uuid)` tuples. New tokens are only added when no
+        other request added one in the meantime.
+        """
+        versions = self.cache.get_many(version_keys)
+        missing = [
+            version_key for version_key in version_keys if version_key not in versions
+        ]
+        for version_key in missing:
+            version = (time.time(), uuid.uuid4().hex)
+            if not self.cache.add(version_key, version):
+                version = self.cache.get(version_key, version)
+            versions[version_key] = version
+        return versions
+
+    def get_keys(self, resources, request=None):
+        """
+        Returns the cache keys of given `(serializer_class, resource_type, instance)`
+        tuples; `None` for resources which are not cached, including those with
+        a version token created after the request started.
+
+        A key covers the version of the instance, the sparse fieldset of the
+        resource type, the formatting settings and the host of the request, as well
+        as the included resources when linkage depends on them.
+        """
+        version_keys = {}
+        for serializer_class, _, instance in resources:
+            pk = getattr(instance, "pk", None)
+            if is_cached(serializer_class) and pk is not None:
+                model = serializer_class.Meta.model
+                version_keys[(serializer_class, pk)] = (
+                    self.get_version_key(model),
+                    self.get_version_key(model, pk),
+                )
+
+        if not version_keys:
+            return [None] * len(resources)
+
+        versions = self.get_versions(
+            list({key for keys in version_keys.values() for key in keys})
+        )
+        started = get_request_started(request)
+        base_url = request.build_absolute_uri("/") if request else None
+        formatting = (
+            json_api_settings.FORMAT_FIELD_NAMES,
+            json_api_settings.FORMAT_TYPES,
+            json_api_settings.FORMAT_RELATED_LINKS,
+            json_api_settings.PLURALIZE_TYPES,
+        )
+
+        keys = []
+        for serializer_class, resource_type, instance in resources:
+            pk = getattr(instance, "pk", None)
+            instance_version_keys = version_keys.get((serializer_class, pk))
+            # a token created after the request started may have been reset by a
+            # save after the instance was read, so the instance is not cached then
+            if instance_version_keys is None or (
+                started is not None
+                and any(
+                    versions[version_key][0] >= started
+                    for version_key in instance_version_keys
+                )
+            ):
+                keys.append(None)
+                continue
+
+            version_field = getattr(
+                serializer_class.Meta, "resource_cache_version_field", None
+            )
+            query = get_query(request)
+            sparse_fieldset = (
+                query.get_sparse_fieldset(resource_type) if query else None
+            )
+            # linkage of to-many relationships may depend on the included resources
+            include = (
+                query.include
+                if query
+                and hasattr(
+                    getattr(serializer_class, "JSONAPIMeta", None),
+                    "linkage_requires_include",
+                )
+                else None
+            )
+            key = (
+                f"{serializer_class.__module__}.{serializer_class.__qualname__}",
+                resource_type,
+                str(pk),
+                [versions[version_key] for version_key in instance_version_keys],
+                str(getattr(instance, version_field)) if version_field else None,
+                sparse_fieldset,
+                include,
+                base_url,
+                formatting,
+            )
+            digest = hashlib.md5(repr(key).encode(), usedforsecurity=False)
+            keys.append(f"{self.key_prefix}:resource:{digest.hexdigest()}")
+
+        return keys
+
+    def get_many(self, keys):
+        keys = [key for key in keys if key is not None]
+        return self.cache.get_many(keys) if keys else {}
+
+    def set_many(self, resource_objs):
+        if resource_objs:
+            self.cache.set_many(resource_objs)
+
+    def invalidate(self, version_keys):
+        if version_keys:
+            self.cache.delete_many(version_keys)
+
+
+def get_request_started(request):
+    """
+    Returns the time given request started as recorded by `record_request_started`,
+    or `None` when it is unknown.
+    """
+    request = getattr(request, "_request", request)
+    started = getattr(request, "META", {}).get(REQUEST_STARTED_KEY)
+    if started is None:
+        started = getattr(request, "scope", {}).get(REQUEST_STARTED_KEY)
+    return started
+
+
+def record_request_started(sender, environ=None, scope=None, **kwargs):
+    """
+    Records the time a request started in its WSGI environ resp. ASGI scope,
+    which become the `META` resp. `scope` of the request.
+    """
+    if not _models:
+        return
+
+    for request_data in (environ, scope):
+        if isinstance(request_data, dict):
+            request_data[REQUEST_STARTED_KEY] = time.time()
+
+
+def get_resource_cache():
+    """
+    Returns the `ResourceCache` using the cache configured with
+    `JSON_API_RESOURCE_CACHE` or `None` when resource objects are not cached.
+    """
+    alias = json_api_settings.RESOURCE_CACHE
+    if not alias:
+        return None
+
+    return ResourceCache(caches[alias])
+
+
+def get_cached_related_fields(model):
+    """
+    Returns the foreign keys and one to one fields of given model which refer to
+    the primary key of a registered model.
+    """
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if (field.many_to_one or field.one_to_one)
+        and field.target_field.primary_key
+        and get_registered_models(field.related_model)
+    ]
+
+
+def record_related_pks(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Records the primary keys an instance about to be saved refers to in the
+    database, so the instances it no longer refers to after the save get
+    invalidated as well.
+    """
+    if not _models or raw or instance._state.adding or instance.pk is None:
+        return
+
+    if get_resource_cache() is None:
+        return
+
+    fields = get_cached_related_fields(sender)
+    if fields:
+        instance._json_api_related_pks = (
+            sender._base_manager.using(using)
+            .filter(pk=instance.pk)
+            .values(*[field.attname for field in fields])
+            .first()
+        )
+
+
+def invalidate_instance(sender, instance, **kwargs):
+    """
+    Invalidates the cached resource objects of a saved or deleted instance and of
+    the instances it refers to (or referred to before the save), which may render
+    it in a reverse relationship.
+    """
+    if not _models:
+        return
+
+    resource_cache = get_resource_cache()
+    if resource_cache is None:
+        return
+
+    old_related_pks = instance.__dict__.pop("_json_api_related_pks", None) or {}
+    version_keys = [
+        resource_cache.get_version_key(model, instance.pk)
+        for model in get_registered_models(sender)
+    ]
+    for field in get_cached_related_fields(sender):
+        related_pks = {
+            getattr(instance, field.attname),
+            old_related_pks.get(field.attname),
+        }
+        version_keys.extend(
+            resource_cache.get_version_key(model, related_pk)
+            for model in get_registered_models(field.related_model)
+            for related_pk in related_pks
+            if related_pk is not None
+        )
+
+    resource_cache.invalidate(version_keys)
+
+
+def invalidate_many_to_many(sender, instance, action, model, pk_set, **kwargs):
+    """
+    Invalidates the cached resource objects of both sides of a changed many to
+    many relation.
+
+    As the related instances are unknown after `clear()` all cached resource
+    objects of the related model are invalidated then.
+    """
+    if not _models or action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    resource_cache = get_resource_cache()
+    if resource_cache is None:
+        return
+
+    version_keys = [
+        resource_cache.get_version_key(registered_model, instance.pk)
+        for registered_model in get_registered_models(instance.__class__)
+    ]
+    for registered_model in get_registered_models(model):
+        if action == "post_clear":
+            version_keys.append(resource_cache.get_version_key(registered_model))
+        else:
+            version_keys.extend(
+                resource_cache.get_version_key(registered_model, pk) for pk in pk_set
+            )
+
+    resource_cache.invalidate(version_keys)
+
+
+request_started.connect(record_request_started)
+pre_save.connect(record_related_pks)
+post_save.connect(invalidate_instance)
+post_delete.connect(invalidate_instance)
+m2m_changed.connect(invalidate_many_to_many)
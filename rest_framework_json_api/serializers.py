@@ -1,12 +1,22 @@
+import copy
+import threading
 import warnings
+import weakref
 from collections.abc import Mapping
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
 from django.utils.module_loading import import_string as import_class_from_dotted_path
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ParseError
-from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.fields import SkipField, empty
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import (
+    HyperlinkedIdentityField,
+    ManyRelatedField,
+    PKOnlyObject,
+)
 
 # star import defined so `rest_framework_json_api.serializers` can be
 # a simple drop in for `rest_framework.serializers`
@@ -14,6 +24,7 @@ from rest_framework.serializers import *  # noqa: F401, F403
 from rest_framework.serializers import (
     BaseSerializer,
     HyperlinkedModelSerializer,
+    ListSerializer,
     ModelSerializer,
     Serializer,
     SerializerMetaclass,
@@ -21,15 +32,112 @@ from rest_framework.serializers import (
 from rest_framework.settings import api_settings
 
 from rest_framework_json_api.exceptions import Conflict
-from rest_framework_json_api.relations import ResourceRelatedField
+from rest_framework_json_api.query import get_query
+from rest_framework_json_api.relations import (
+    ManyRelatedFieldWithNoData,
+    ResourceRelatedField,
+    SkipDataMixin,
+)
+from rest_framework_json_api.resource_cache import (
+    CachedResources,
+    get_resource_cache,
+    is_cached,
+    register_model,
+)
 from rest_framework_json_api.utils import (
+    BoundedCache,
+    format_field_names,
     get_included_resources,
+    get_resource_name,
     get_resource_type_from_instance,
     get_resource_type_from_model,
     get_resource_type_from_serializer,
-    undo_format_field_name,
 )
 
+INCLUDE_PATH_CACHE_SIZE = 1024
+
+_serializer_classes = weakref.WeakSet()
+_field_templates = weakref.WeakKeyDictionary()
+_field_templates_lock = threading.Lock()
+_include_graphs = weakref.WeakKeyDictionary()
+_include_graphs_lock = threading.Lock()
+
+
+class IncludeGraph:
+    """
+    The serializer classes reachable from a serializer class through their
+    `included_serializers`, compiled once per serializer class.
+
+    `edges` maps the included field names of every reachable serializer class to
+    the index of the included serializer class in `edges`, or is `None` for a
+    serializer class without `included_serializers`. The given serializer class
+    has index 0. The graph holds no references to the serializer classes, so it
+    does not keep them alive. Validated include paths are memoized.
+    """
+
+    def __init__(self, serializer_class):
+        nodes = {serializer_class: 0}
+        edges = []
+        pending = [serializer_class]
+        while pending:
+            current = pending.pop(0)
+            included_serializers = getattr(current, "included_serializers", None)
+            if included_serializers is None:
+                edges.append(None)
+                continue
+            current_edges = {}
+            for field_name in included_serializers:
+                included_serializer = included_serializers[field_name]
+                if included_serializer not in nodes:
+                    nodes[included_serializer] = len(nodes)
+                    pending.append(included_serializer)
+                current_edges[field_name] = nodes[included_serializer]
+            edges.append(current_edges)
+
+        self.edges = tuple(edges)
+        self.paths = BoundedCache(INCLUDE_PATH_CACHE_SIZE)
+
+    def validate(self, path):
+        """
+        Raises a `ParseError` when given include path is not supported.
+        """
+        try:
+            error = self.paths[path]
+        except KeyError:
+            error = self.paths[path] = self.get_path_error(path)
+
+        if error is not None:
+            raise ParseError(error)
+
+    def get_path_error(self, path):
+        node = 0
+        for field_name in path.split("."):
+            included_nodes = self.edges[node]
+            if included_nodes is None:
+                return "This endpoint does not support the include parameter"
+            node = included_nodes.get(field_name)
+            if node is None:
+                return (
+                    "This endpoint does not support the include parameter for path "
+                    f"{path}"
+                )
+        return None
+
+
+def get_include_graph(serializer_class):
+    """
+    Returns the `IncludeGraph` of given serializer class, compiling it on first use.
+    """
+    try:
+        return _include_graphs[serializer_class]
+    except KeyError:
+        pass
+
+    include_graph = IncludeGraph(serializer_class)
+    with _include_graphs_lock:
+        _include_graphs[serializer_class] = include_graph
+    return include_graph
+
 
 class ResourceIdentifierObjectSerializer(BaseSerializer):
     default_error_messages = {
@@ -85,16 +193,8 @@ class SparseFieldsetsMixin:
         if request:
             try:
                 resource_type = get_resource_type_from_serializer(self)
-                sparse_fieldset_query_param = f"fields[{resource_type}]"
-
-                sparse_fieldset_value = request.query_params.get(
-                    sparse_fieldset_query_param
-                )
-                if sparse_fieldset_value is not None:
-                    sparse_fields = [
-                        undo_format_field_name(sparse_field)
-                        for sparse_field in sparse_fieldset_value.split(",")
-                    ]
+                sparse_fields = get_query(request).get_sparse_fieldset(resource_type)
+                if sparse_fields is not None:
                     return (
                         field
                         for field in readable_fields
@@ -129,39 +229,80 @@ class IncludedResourcesValidationMixin:
         request = context.get("request") if context else None
         view = context.get("view") if context else None
 
-        def validate_path(serializer_class, field_path, path):
-            serializers = getattr(serializer_class, "included_serializers", None)
-            if serializers is None:
-                raise ParseError("This endpoint does not support the include parameter")
-            this_field_name = field_path[0]
-            this_included_serializer = serializers.get(this_field_name)
-            if this_included_serializer is None:
-                raise ParseError(
-                    "This endpoint does not support the include parameter for path {}".format(
-                        path
-                    )
-                )
-            if len(field_path) > 1:
-                new_included_field_path = field_path[1:]
-                # We go down one level in the path
-                validate_path(this_included_serializer, new_included_field_path, path)
-
         if request and view:
             included_resources = get_included_resources(request)
-            for included_field_name in included_resources:
-                included_field_path = included_field_name.split(".")
+            if included_resources:
                 if "related_field" in view.kwargs:
-                    this_serializer_class = view.get_related_serializer_class()
+                    serializer_class = view.get_related_serializer_class()
                 else:
-                    this_serializer_class = view.get_serializer_class()
-                # lets validate the current path
-                validate_path(
-                    this_serializer_class, included_field_path, included_field_name
-                )
+                    serializer_class = view.get_serializer_class()
+                # paths are validated once per serializer class
+                include_graph = get_include_graph(serializer_class)
+                for included_field_name in included_resources:
+                    include_graph.validate(included_field_name)
 
         super().__init__(*args, **kwargs)
 
 
+class IncludedLinkageMixin:
+    """
+    A serializer mixin which renders the resource linkage of to-many relationships
+    only when the relationship is included, configured with
+    `linkage_requires_include` on `JSONAPIMeta` as `"__all__"` or a list of field
+    names.
+
+    Other to-many relationships only render `links` and `meta`, so the related
+    instances are not queried at all.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        meta = getattr(self, "JSONAPIMeta", None)
+        field_names = getattr(meta, "linkage_requires_include", None)
+        if not field_names:
+            return fields
+
+        included_field_names = self._get_included_field_names()
+        for field_name, field in fields.items():
+            if (
+                (field_names == "__all__" or field_name in field_names)
+                and field_name not in included_field_names
+                and isinstance(field, ManyRelatedField)
+                and not isinstance(field, SkipDataMixin)
+                and isinstance(field.child_relation, ResourceRelatedField)
+            ):
+                fields[field_name] = ManyRelatedFieldWithNoData(
+                    *field._args,
+                    **{
+                        **field._kwargs,
+                        "child_relation": copy.deepcopy(field.child_relation),
+                    },
+                )
+
+        return fields
+
+    def _get_included_field_names(self):
+        """
+        Returns the names of all fields on any included path, so linkage of
+        included resources is rendered in nested serializers as well.
+        """
+        request = self.context.get("request") if self.context else None
+        if request is None:
+            return set()
+
+        serializer = self
+        view = self.context.get("view")
+        if not get_query(request).include and view is not None:
+            serializer = view.get_serializer_class()
+
+        return {
+            field_name
+            for included_resource in get_included_resources(request, serializer)
+            for field_name in included_resource.split(".")
+        }
+
+
 class ReservedFieldNamesMixin:
     """Ensures that reserved field names are not used and an error raised instead."""
 
@@ -172,21 +313,243 @@ class ReservedFieldNamesMixin:
         api_settings.NON_FIELD_ERRORS_KEY,
     }
 
-    def get_fields(self):
-        fields = super().get_fields()
-
-        found_reserved_field_names = self._reserved_field_names.intersection(
-            fields.keys()
-        )
+    @classmethod
+    def check_reserved_field_names(cls, field_names):
+        found_reserved_field_names = cls._reserved_field_names.intersection(field_names)
         assert not found_reserved_field_names, (
-            f"Serializer class {self.__class__.__module__}.{self.__class__.__qualname__} "
+            f"Serializer class {cls.__module__}.{cls.__qualname__} "
             f"uses following reserved field name(s) which is not allowed: "
             f"{', '.join(sorted(found_reserved_field_names))}"
         )
 
+    def get_fields(self):
+        fields = super().get_fields()
+        self.check_reserved_field_names(fields.keys())
         return fields
 
 
+class FieldTemplateMixin:
+    """
+    A serializer mixin which builds the fields of a serializer class only once when
+    `field_template = True` is set on `Meta`, e.g. introspecting the model of a
+    `ModelSerializer`, and keeps them as template which every new instance gets a
+    deep copy of.
+
+    The template is built from the first instance, so it may only be enabled when
+    `get_field_names`, `build_field` and `get_extra_kwargs` do not depend on the
+    instance or its context. The template is never bound to a serializer instance,
+    so it may be copied by several threads at the same time.
+    """
+
+    def get_fields(self):
+        serializer_class = self.__class__
+        try:
+            template = _field_templates[serializer_class]
+        except KeyError:
+            meta = getattr(self, "Meta", None)
+            if not getattr(meta, "field_template", False):
+                return super().get_fields()
+
+            template = super().get_fields()
+            with _field_templates_lock:
+                template = _field_templates.setdefault(serializer_class, template)
+
+        return copy.deepcopy(template)
+
+
+class ResourceCacheMixin:
+    """
+    A serializer mixin which looks up the cached resource objects of the primary
+    data of a request (see `JSON_API_RESOURCE_CACHE`) before serializing it, so
+    instances whose resource object is cached are not serialized at all.
+
+    The resource objects of all instances of a list are looked up at once and
+    kept on the list serializer as `CachedResources`, which the renderer reuses.
+    Cached resource objects are only used when the `JSONRenderer` renders a
+    response without included resources.
+    """
+
+    def to_representation(self, instance):
+        owner = self.parent if isinstance(self.parent, ListSerializer) else self
+        try:
+            cached_resources = owner._cached_resources
+        except AttributeError:
+            cached_resources = owner._cached_resources = self._get_cached_resources(
+                owner
+            )
+
+        if cached_resources is not None:
+            resource_obj = cached_resources.get(instance)
+            if resource_obj is not None:
+                return resource_obj
+
+        return super().to_representation(instance)
+
+    def _get_cached_resources(self, owner):
+        # Avoid circular deps
+        from rest_framework_json_api.renderers import JSONRenderer
+
+        request = self.context.get("request")
+        if (
+            owner.parent is not None
+            or not is_cached(self.__class__)
+            or isinstance(self, PolymorphicModelSerializer)
+            or request is None
+            or request.method not in SAFE_METHODS
+            or not isinstance(getattr(request, "accepted_renderer", None), JSONRenderer)
+            or get_included_resources(request, self)
+        ):
+            return None
+
+        resource_cache = get_resource_cache()
+        if resource_cache is None:
+            return None
+
+        instances = owner.instance
+        if owner is self:
+            instances = [instances]
+        elif isinstance(instances, QuerySet):
+            # only use instances the list serializer has retrieved already
+            instances = instances._result_cache
+        if not isinstance(instances, (list, tuple)):
+            return None
+
+        resource_type = get_resource_name(self.context)
+        keys = resource_cache.get_keys(
+            [(self.__class__, resource_type, instance) for instance in instances],
+            request,
+        )
+        return CachedResources(
+            resource_type, instances, keys, resource_cache.get_many(keys)
+        )
+
+
+class ResourceObjectMixin:
+    """
+    A serializer mixin which represents an instance as JSON:API resource object
+    when `represent_as_resource_object = True` is set on `Meta`.
+
+    Fields are serialized in a single pass straight into the `attributes`,
+    `relationships`, `links` and `meta` members, so the renderer only needs to
+    assemble the document and related instances are only retrieved once.
+    """
+
+    def to_representation(self, instance):
+        meta = getattr(self, "Meta", None)
+        if not getattr(meta, "represent_as_resource_object", False):
+            return super().to_representation(instance)
+
+        # Avoid circular deps
+        from rest_framework_json_api.renderers import JSONRenderer
+
+        resource_type = None
+        if not getattr(self, "_poly_force_type_resolution", False):
+            resource_type = get_resource_type_from_serializer(self)
+        if not resource_type:
+            resource_type = get_resource_type_from_instance(instance)
+
+        fields, plan = self._get_resource_object_plan(resource_type)
+
+        def represent(field_name):
+            attribute = fields[field_name].get_attribute(instance)
+            check_for_none = (
+                attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            )
+            if check_for_none is None:
+                return attribute, None
+            return attribute, fields[field_name].to_representation(attribute)
+
+        if "id" in fields:
+            _, resource_id = represent("id")
+        else:
+            resource_id = getattr(instance, "pk", None)
+        resource_object = {
+            "type": resource_type,
+            "id": force_str(resource_id) if resource_id is not None else None,
+        }
+
+        attributes = {}
+        for field_name, key in plan.attributes.items():
+            try:
+                _, attributes[key] = represent(field_name)
+            except SkipField:
+                continue
+        if attributes:
+            resource_object["attributes"] = attributes
+
+        relationships = {}
+        for field_name, key, relation_type, kind, has_links in plan.relationships:
+            attribute, value = None, None
+            if kind != "links":
+                try:
+                    attribute, value = represent(field_name)
+                except SkipField:
+                    pass
+
+            relationship = JSONRenderer.build_relationship(
+                fields[field_name],
+                relation_type,
+                kind,
+                has_links,
+                value,
+                instance,
+                attribute if kind == "many" and attribute is not None else empty,
+            )
+            if relationship is not None:
+                relationships[key] = relationship
+        if relationships:
+            resource_object["relationships"] = relationships
+
+        if plan.self_link:
+            try:
+                _, self_link = represent(api_settings.URL_FIELD_NAME)
+            except SkipField:
+                pass
+            else:
+                resource_object["links"] = {"self": self_link}
+
+        meta_data = {}
+        for field_name in getattr(meta, "meta_fields", []):
+            if field_name in fields:
+                try:
+                    _, meta_data[field_name] = represent(field_name)
+                except SkipField:
+                    continue
+        if meta_data:
+            resource_object["meta"] = format_field_names(meta_data)
+
+        return resource_object
+
+    def _get_resource_object_plan(self, resource_type):
+        """
+        Returns the readable fields and their `RenderPlan` for given resource type.
+        Both are kept for the lifetime of the serializer, e.g. for all instances
+        serialized by a list serializer.
+        """
+        from rest_framework_json_api.renderers import JSONRenderer
+
+        plans = getattr(self, "_resource_object_plans", None)
+        if plans is None:
+            plans = self._resource_object_plans = {}
+
+        if resource_type not in plans:
+            fields = {field.field_name: field for field in self._readable_fields}
+            meta_fields = getattr(self.Meta, "meta_fields", [])
+            plans[resource_type] = (
+                fields,
+                JSONRenderer.get_render_plan(
+                    {
+                        field_name: field
+                        for field_name, field in fields.items()
+                        if field_name not in meta_fields
+                    },
+                    self,
+                    resource_type,
+                ),
+            )
+        return plans[resource_type]
+
+
 class LazySerializersDict(Mapping):
     """
     A dictionary of serializers which lazily import dotted class path and self.
@@ -231,6 +594,14 @@ class SerializerMetaclass(SerializerMetaclass):
                 serializer, attrs["related_serializers"]
             )
 
+        if is_cached(serializer):
+            register_model(serializer.Meta.model)
+
+        # fields of a model serializer are only known once it is instantiated
+        if issubclass(serializer, ReservedFieldNamesMixin):
+            serializer.check_reserved_field_names(serializer._declared_fields)
+
+        _serializer_classes.add(serializer)
         return serializer
 
 
@@ -239,6 +610,8 @@ class SerializerMetaclass(SerializerMetaclass):
 class Serializer(
     IncludedResourcesValidationMixin,
     SparseFieldsetsMixin,
+    IncludedLinkageMixin,
+    FieldTemplateMixin,
     ReservedFieldNamesMixin,
     Serializer,
     metaclass=SerializerMetaclass,
@@ -255,6 +628,8 @@ class Serializer(
 
     * A mixin class to enable sparse fieldsets is included
     * A mixin class to enable validation of included resources is included
+    * A mixin class to render to-many linkage only for included relationships
+      is included
     """
 
     pass
@@ -263,7 +638,11 @@ class Serializer(
 class HyperlinkedModelSerializer(
     IncludedResourcesValidationMixin,
     SparseFieldsetsMixin,
+    IncludedLinkageMixin,
+    FieldTemplateMixin,
     ReservedFieldNamesMixin,
+    ResourceCacheMixin,
+    ResourceObjectMixin,
     HyperlinkedModelSerializer,
     metaclass=SerializerMetaclass,
 ):
@@ -278,13 +657,21 @@ class HyperlinkedModelSerializer(
 
     * A mixin class to enable sparse fieldsets is included
     * A mixin class to enable validation of included resources is included
+    * A mixin class to represent instances as resource objects is included
+    * A mixin class to render to-many linkage only for included relationships
+      is included
+    * A mixin class to skip serializing cached resource objects is included
     """
 
 
 class ModelSerializer(
     IncludedResourcesValidationMixin,
     SparseFieldsetsMixin,
+    IncludedLinkageMixin,
+    FieldTemplateMixin,
     ReservedFieldNamesMixin,
+    ResourceCacheMixin,
+    ResourceObjectMixin,
     ModelSerializer,
     metaclass=SerializerMetaclass,
 ):
@@ -308,6 +695,10 @@ class ModelSerializer(
 
     * A mixin class to enable sparse fieldsets is included
     * A mixin class to enable validation of included resources is included
+    * A mixin class to represent instances as resource objects is included
+    * A mixin class to render to-many linkage only for included relationships
+      is included
+    * A mixin class to skip serializing cached resource objects is included
     """
 
     serializer_related_field = ResourceRelatedField
@@ -474,9 +865,11 @@ class PolymorphicModelSerializer(
         Retrieve the appropriate polymorphic serializer and use this to handle representation.
         """
         serializer_class = self.get_polymorphic_serializer_for_instance(instance)
-        return serializer_class(instance, context=self.context).to_representation(
-            instance
-        )
+        # one serializer per polymorphic serializer class is used for all instances
+        serializers = self.__dict__.setdefault("_poly_serializers", {})
+        if serializer_class not in serializers:
+            serializers[serializer_class] = serializer_class(context=self.context)
+        return serializers[serializer_class].to_representation(instance)
 
     def to_internal_value(self, data):
         """
@@ -15,6 +15,9 @@ DEFAULTS = {
     "FORMAT_RELATED_LINKS": False,
     "PLURALIZE_TYPES": False,
     "UNIFORM_EXCEPTIONS": False,
+    "JSON_BACKEND": None,
+    "RESOURCE_CACHE": None,
+    "WARM_UP": False,
 }
 
 
@@ -54,5 +57,15 @@ def reload_json_api_settings(*args, **kwargs):
         elif hasattr(json_api_settings, setting):
             delattr(json_api_settings, setting)
 
+        # resource types depend on the formatting settings
+        from rest_framework_json_api.utils import (
+            clear_formatted_values,
+            clear_resource_types,
+        )
+
+        clear_resource_types()
+        if setting.startswith("FORMAT_"):
+            clear_formatted_values()
+
 
 setting_changed.connect(reload_json_api_settings)
@@ -0,0 +1,140 @@
+"""
+URL templates which build the links of hyperlinked relationships without resolving
+the view name with `reverse()` for every link.
+
+A template is compiled once per URL conf, script prefix, language, view name and names
+of the URL keyword arguments from the patterns the URL resolver reverses with, and
+builds the same URLs as `reverse()` does. Whenever a template can not be used, e.g. for
+namespaced view names or with a versioning scheme, `reverse()` is used instead.
+"""
+
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.urls import get_resolver, get_script_prefix, get_urlconf
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+from django.utils.translation import get_language
+from rest_framework.reverse import preserve_builtin_query_params
+from rest_framework.reverse import reverse as drf_reverse
+
+from rest_framework_json_api.utils import BoundedCache
+
+URL_TEMPLATE_CACHE_SIZE = 1024
+
+_url_templates = BoundedCache(URL_TEMPLATE_CACHE_SIZE)
+
+
+def clear_url_templates(*args, **kwargs):
+    _url_templates.clear()
+
+
+setting_changed.connect(clear_url_templates)
+
+
+class URLTemplate:
+    """
+    The URL patterns of a view name which may be reversed with given keyword argument
+    names, in the order `reverse()` tries them.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+
+    @classmethod
+    def compile(cls, view_name, kwarg_names, urlconf, prefix):
+        """
+        Returns the template of given view name and keyword argument names or `None`
+        when whether a pattern matches depends on the values of the arguments.
+        """
+        resolver = get_resolver(urlconf)
+        candidates = []
+        for possibility, pattern, defaults, converters in resolver.reverse_dict.getlist(
+            view_name
+        ):
+            for result, params in possibility:
+                if set(kwarg_names).symmetric_difference(params).difference(defaults):
+                    continue
+                if any(name not in params for name in kwarg_names if name in defaults):
+                    return None
+                candidates.append(
+                    (
+                        prefix.replace("%", "%%") + result,
+                        re.compile(f"^{re.escape(prefix)}{pattern}"),
+                        converters,
+                    )
+                )
+        return cls(candidates)
+
+    def expand(self, kwargs):
+        """
+        Returns the path of given keyword arguments or `None` when no pattern matches.
+        """
+        for template, regex, converters in self.candidates:
+            text_kwargs = {}
+            try:
+                for name, value in kwargs.items():
+                    converter = converters.get(name)
+                    text_kwargs[name] = (
+                        converter.to_url(value) if converter else str(value)
+                    )
+            except ValueError:
+                continue
+
+            path = template % text_kwargs
+            if regex.search(path):
+                # safe characters from `pchar` definition of RFC 3986
+                return escape_leading_slashes(
+                    quote(path, safe=RFC3986_SUBDELIMS + "/~:@")
+                )
+        return None
+
+
+def get_url_template(view_name, kwarg_names):
+    urlconf = get_urlconf() or settings.ROOT_URLCONF
+    prefix = get_script_prefix()
+    key = (urlconf, prefix, get_language(), view_name, kwarg_names)
+    try:
+        return _url_templates[key]
+    except KeyError:
+        pass
+
+    template = _url_templates[key] = URLTemplate.compile(
+        view_name, kwarg_names, urlconf, prefix
+    )
+    return template
+
+
+def get_url_base(request):
+    """
+    Returns the scheme and host all absolute URLs of given request start with.
+    """
+    try:
+        return request._json_api_url_base
+    except AttributeError:
+        request._json_api_url_base = request.build_absolute_uri("/")[:-1]
+        return request._json_api_url_base
+
+
+def reverse(viewname, kwargs=None, request=None):
+    """
+    Same as `rest_framework.reverse.reverse` with keyword arguments only, which
+    builds the URL with a cached `URLTemplate` when possible.
+    """
+    if (
+        not isinstance(viewname, str)
+        or ":" in viewname
+        or getattr(request, "versioning_scheme", None) is not None
+    ):
+        return drf_reverse(viewname, kwargs=kwargs, request=request)
+
+    kwargs = kwargs or {}
+    template = get_url_template(viewname, tuple(sorted(kwargs)))
+    path = template.expand(kwargs) if template is not None else None
+    # relative segments are resolved by `build_absolute_uri`
+    if path is None or "/./" in path or "/../" in path:
+        return drf_reverse(viewname, kwargs=kwargs, request=request)
+
+    url = get_url_base(request) + path if request else path
+    return preserve_builtin_query_params(url, request)
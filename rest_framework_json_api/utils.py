@@ -1,5 +1,6 @@
 import inspect
 import operator
+import threading
 
 import inflection
 from django.conf import settings
@@ -11,7 +12,7 @@ from django.db.models.fields.related_descriptors import (
 from django.http import Http404
 from django.utils import encoding
 from django.utils.translation import gettext_lazy as _
-from rest_framework import exceptions, relations
+from rest_framework import exceptions, relations, serializers
 from rest_framework.exceptions import APIException
 from rest_framework.settings import api_settings
 
@@ -24,6 +25,70 @@ if "django.contrib.contenttypes" not in settings.INSTALLED_APPS:  # pragma: no c
 else:
     from django.contrib.contenttypes.fields import ReverseGenericManyToOneDescriptor
 
+FORMATTED_VALUE_CACHE_SIZE = 4096
+RESOURCE_TYPE_CACHE_SIZE = 4096
+
+
+class BoundedCache(dict):
+    """
+    A dict memoizing at most `maxsize` values, which evicts the oldest entry when
+    a new one is stored in a full cache.
+
+    Lookups are as fast as those of a dict, while storing with item assignment and
+    clearing is serialized with a lock, so a cache may be shared between threads.
+    `maxsize` may be changed at any time and applies to the next stored value.
+    """
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            if key not in self:
+                # dicts keep their insertion order, so the first key is the oldest
+                while self and len(self) >= self.maxsize:
+                    del self[next(iter(self))]
+            super().__setitem__(key, value)
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+
+
+_formatted_values = BoundedCache(FORMATTED_VALUE_CACHE_SIZE)
+_resource_types = BoundedCache(RESOURCE_TYPE_CACHE_SIZE)
+
+
+def clear_formatted_values():
+    _formatted_values.clear()
+
+
+def clear_resource_types():
+    """
+    Clears the registry of resource types resolved per model, serializer class
+    and relationship field, e.g. after changing a `JSONAPIMeta` at runtime.
+
+    Called whenever a JSON:API setting changes.
+    """
+    _resource_types.clear()
+
+
+def get_registered_resource_type(key, resolve):
+    """
+    Returns the resource type registered with given key, resolving and registering
+    it with `resolve()` on first use.
+    """
+    try:
+        return _resource_types[key]
+    except KeyError:
+        pass
+
+    resource_type = resolve()
+    _resource_types[key] = resource_type
+    return resource_type
+
 
 def get_resource_name(context, expand_polymorphic_types=False):
     """
@@ -166,6 +231,28 @@ def undo_format_link_segment(value):
 
 
 def format_value(value, format_type):
+    """
+    Returns given value formatted with `format_type`.
+
+    Formatted strings are memoized, as the same field names, types and link segments
+    are formatted over and over again.
+    """
+    if format_type not in ("dasherize", "camelize", "capitalize", "underscore"):
+        return value
+    if type(value) is not str:
+        return _format_value(value, format_type)
+
+    key = (value, format_type)
+    try:
+        return _formatted_values[key]
+    except KeyError:
+        pass
+
+    formatted = _formatted_values[key] = _format_value(value, format_type)
+    return formatted
+
+
+def _format_value(value, format_type):
     if format_type == "dasherize":
         # inflection can't dasherize camelCase
         value = inflection.underscore(value)
@@ -193,6 +280,34 @@ def format_resource_type(value, format_type=None, pluralize=None):
 
 
 def get_related_resource_type(relation):
+    """
+    Returns the resource type of the related instances of given relationship field.
+
+    The type is registered per serializer class and field name, except for fields
+    which are not bound to a serializer or are bound to a polymorphic one.
+    """
+    from rest_framework_json_api.serializers import PolymorphicModelSerializer
+
+    parent = getattr(relation, "parent", None)
+    field_name = getattr(relation, "field_name", None)
+    child = isinstance(parent, relations.ManyRelatedField)
+    if child:
+        field_name = parent.field_name
+        parent = parent.parent
+    if (
+        not isinstance(parent, serializers.Serializer)
+        or isinstance(parent, PolymorphicModelSerializer)
+        or field_name is None
+    ):
+        return _get_related_resource_type(relation)
+
+    return get_registered_resource_type(
+        ("relation", type(parent), field_name, type(relation), child),
+        lambda: _get_related_resource_type(relation),
+    )
+
+
+def _get_related_resource_type(relation):
     from rest_framework_json_api.serializers import PolymorphicModelSerializer
 
     try:
@@ -272,8 +387,13 @@ def get_related_resource_type(relation):
 
 
 def get_resource_type_from_model(model):
-    json_api_meta = getattr(model, "JSONAPIMeta", None)
-    return getattr(json_api_meta, "resource_name", format_resource_type(model.__name__))
+    def resolve():
+        json_api_meta = getattr(model, "JSONAPIMeta", None)
+        if hasattr(json_api_meta, "resource_name"):
+            return json_api_meta.resource_name
+        return format_resource_type(model.__name__)
+
+    return get_registered_resource_type(("model", model), resolve)
 
 
 def get_resource_type_from_queryset(qs):
@@ -282,7 +402,28 @@ def get_resource_type_from_queryset(qs):
 
 def get_resource_type_from_instance(instance):
     if hasattr(instance, "_meta"):
-        return get_resource_type_from_model(instance._meta.model)
+        return get_resource_type_from_model(get_polymorphic_model(instance))
+
+
+def get_polymorphic_model(instance):
+    """
+    Returns the model of given instance.
+
+    For instances of django-polymorphic models this is the model of its content type,
+    so the concrete model is known without retrieving the row of the child model,
+    e.g. for instances retrieved with `non_polymorphic()`.
+    """
+    model = instance._meta.model
+    if not getattr(model, "polymorphic_model_marker", False):
+        return model
+
+    ctype_id = getattr(instance, "polymorphic_ctype_id", None)
+    if ctype_id is None:
+        return model
+
+    from django.contrib.contenttypes.models import ContentType
+
+    return ContentType.objects.get_for_id(ctype_id).model_class() or model
 
 
 def get_resource_type_from_manager(manager):
@@ -290,18 +431,23 @@ def get_resource_type_from_manager(manager):
 
 
 def get_resource_type_from_serializer(serializer):
-    json_api_meta = getattr(serializer, "JSONAPIMeta", None)
-    meta = getattr(serializer, "Meta", None)
-    if hasattr(json_api_meta, "resource_name"):
-        return json_api_meta.resource_name
-    elif hasattr(meta, "resource_name"):
-        return meta.resource_name
-    elif hasattr(meta, "model"):
-        return get_resource_type_from_model(meta.model)
-    raise AttributeError(
-        f"can not detect 'resource_name' on serializer {serializer.__class__.__name__!r}"
-        f" in module {serializer.__class__.__module__!r}"
-    )
+    def resolve():
+        json_api_meta = getattr(serializer, "JSONAPIMeta", None)
+        meta = getattr(serializer, "Meta", None)
+        if hasattr(json_api_meta, "resource_name"):
+            return json_api_meta.resource_name
+        elif hasattr(meta, "resource_name"):
+            return meta.resource_name
+        elif hasattr(meta, "model"):
+            return get_resource_type_from_model(meta.model)
+        raise AttributeError(
+            f"can not detect 'resource_name' on serializer "
+            f"{serializer.__class__.__name__!r}"
+            f" in module {serializer.__class__.__module__!r}"
+        )
+
+    serializer_class = serializer if isinstance(serializer, type) else type(serializer)
+    return get_registered_resource_type(("serializer", serializer_class), resolve)
 
 
 def get_resource_id(resource_instance, resource):
@@ -322,16 +468,76 @@ def get_included_resources(request, serializer=None):
     This method ensures that returned includes are in Python internally used
     format.
     """
-    include_resources_param = request.query_params.get("include") if request else None
-    if include_resources_param:
-        return [
-            undo_format_field_name(include)
-            for include in include_resources_param.split(",")
-        ]
+    from rest_framework_json_api.query import get_query
+
+    query = get_query(request)
+    if query is not None and query.include:
+        return list(query.include)
     else:
         return get_default_included_resources_from_serializer(serializer)
 
 
+def get_sparse_fieldset_sources(request, serializer, included_resources=()):
+    """
+    Returns the first level sources of the fields of given serializer instance
+    which are needed to render the sparse fieldset requested for its resource type,
+    including sources needed for links and given included resources.
+
+    Returns `None` when no sparse fieldset is requested or a rendered field
+    has no source on the instance (e.g. a `SerializerMethodField`), so it is
+    unknown what is needed to render it.
+    """
+    from rest_framework_json_api.query import get_include_tree, get_query
+    from rest_framework_json_api.relations import SerializerMethodFieldBase
+    from rest_framework_json_api.serializers import PolymorphicModelSerializer
+
+    if request is None or isinstance(serializer, PolymorphicModelSerializer):
+        return None
+
+    try:
+        resource_type = get_resource_type_from_serializer(serializer)
+    except AttributeError:
+        return None
+
+    sparse_fields = get_query(request).get_sparse_fieldset(resource_type)
+    if sparse_fields is None:
+        return None
+
+    included_fields = get_include_tree(included_resources)
+    sources = set()
+
+    for field_name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if field_name in included_fields and field.source_attrs:
+            sources.add(field.source_attrs[0])
+
+        if field_name not in sparse_fields and field_name not in (
+            "id",
+            api_settings.URL_FIELD_NAME,
+        ):
+            continue
+
+        if field.source == "*" or isinstance(field, SerializerMethodFieldBase):
+            return None
+        sources.add(field.source_attrs[0])
+
+        for lookup_field in (
+            getattr(field, "lookup_field", None),
+            getattr(field, "related_link_lookup_field", None),
+            getattr(
+                getattr(field, "child_relation", None),
+                "related_link_lookup_field",
+                None,
+            ),
+        ):
+            if lookup_field:
+                sources.add(lookup_field.split("__")[0])
+
+    return sources
+
+
 def get_default_included_resources_from_serializer(serializer):
     meta = getattr(serializer, "JSONAPIMeta", None)
     if meta is None and getattr(serializer, "many", False):
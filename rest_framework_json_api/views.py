@@ -1,7 +1,15 @@
+import fnmatch
 from collections.abc import Iterable
-
-from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Model
+from itertools import chain, islice
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import (
+    ManyToManyField,
+    ManyToManyRel,
+    ManyToOneRel,
+    Model,
+    Prefetch,
+)
 from django.db.models.fields.related_descriptors import (
     ForwardManyToOneDescriptor,
     ManyToManyDescriptor,
@@ -10,24 +18,74 @@ from django.db.models.fields.related_descriptors import (
 )
 from django.db.models.manager import Manager
 from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
 from django.urls import NoReverseMatch
 from rest_framework import generics, viewsets
 from rest_framework.exceptions import MethodNotAllowed, NotFound
 from rest_framework.fields import get_attribute
-from rest_framework.relations import PKOnlyObject
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import (
+    ManyRelatedField,
+    PKOnlyObject,
+    PrimaryKeyRelatedField,
+    RelatedField,
+)
 from rest_framework.response import Response
-from rest_framework.reverse import reverse
 from rest_framework.serializers import Serializer, SkipField
 
 from rest_framework_json_api.exceptions import Conflict
-from rest_framework_json_api.serializers import ResourceIdentifierObjectSerializer
+from rest_framework_json_api.query import get_include_tree, get_query
+from rest_framework_json_api.relations import (
+    PolymorphicResourceRelatedField,
+    ResourceRelatedField,
+    SkipDataMixin,
+)
+from rest_framework_json_api.serializers import (
+    PolymorphicModelSerializer,
+    ResourceIdentifierObjectSerializer,
+)
+from rest_framework_json_api.url_templates import reverse
 from rest_framework_json_api.utils import (
+    BoundedCache,
     Hyperlink,
     get_included_resources,
     get_resource_type_from_instance,
+    get_resource_type_from_serializer,
+    get_sparse_fieldset_sources,
     undo_format_link_segment,
 )
 
+PREFETCH_PLAN_CACHE_SIZE = 1024
+INCLUDED_SOURCE_CACHE_SIZE = 1024
+
+_prefetch_plans = BoundedCache(PREFETCH_PLAN_CACHE_SIZE)
+_linkage_prefetch_plans = BoundedCache(PREFETCH_PLAN_CACHE_SIZE)
+_included_sources = BoundedCache(INCLUDED_SOURCE_CACHE_SIZE)
+
+
+def merge_prefetch_lookups(*lookup_lists):
+    """
+    Merges given lists of prefetch lookups into one list without duplicates, with
+    parent lookups before nested ones.
+
+    A `Prefetch` object replaces a plain lookup of the same relation, while the
+    first of several `Prefetch` objects of the same relation is kept.
+    """
+    merged = {}
+    for lookups in lookup_lists:
+        for lookup in lookups:
+            key = getattr(lookup, "prefetch_to", lookup)
+            if key not in merged or (
+                isinstance(lookup, Prefetch) and not isinstance(merged[key], Prefetch)
+            ):
+                merged[key] = lookup
+
+    # parent lookups need to be prefetched before nested ones
+    return sorted(
+        merged.values(),
+        key=lambda lookup: getattr(lookup, "prefetch_through", lookup).count("__"),
+    )
+
 
 class PreloadIncludesMixin:
     """
@@ -50,6 +108,32 @@ class PreloadIncludesMixin:
                 '__all__': [],
                 'author': ['author', 'author__authorbio'],
             }
+
+    Keys also apply to includes nested in them, e.g. `?include=category.section`
+    also uses the lookups of `category`, and may contain shell-style wildcards like
+    `category.*`. The lookups of all matching keys are merged, so every relation is
+    selected or prefetched only once.
+
+    Lookups of __all__ are skipped when a sparse fieldset is requested which excludes
+    the relation they start with.
+
+    Serializers may declare `select_for_includes` and `prefetch_for_includes` in
+    their `JSONAPIMeta` as well, keyed by their field names and `__all__` with
+    lookups relative to their model. Those are applied along the path of every
+    requested include, so they are also used when the serializer is included from
+    another resource.
+
+    .. code:: python
+
+        class CommentSerializer(serializers.ModelSerializer):
+            class JSONAPIMeta:
+                prefetch_for_includes = {
+                    'author': ['author__bio'],
+                }
+
+        # ?include=comments.author prefetches comments__author__bio
+        class EntryViewSet(viewsets.ModelViewSet):
+            queryset = Entry.objects.all()
     """
 
     def get_select_related(self, include):
@@ -64,64 +148,934 @@ class PreloadIncludesMixin:
         included_resources = get_included_resources(
             self.request, self.get_serializer_class()
         )
-        for included in included_resources + ["__all__"]:
+        select_all = False
+        select_lookups = []
+        prefetch_lookups = []
+        for included in self.get_preload_keys(included_resources) + ["__all__"]:
             select_related = self.get_select_related(included)
+            prefetch_related = self.get_prefetch_related(included)
+            if included == "__all__" and (select_related or prefetch_related):
+                select_related, prefetch_related = self.skip_sparse_lookups(
+                    included_resources, select_related, prefetch_related
+                )
+
             if select_related is not None:
-                qs = qs.select_related(*select_related)
+                # an empty list selects all relations
+                select_all = select_all or not select_related
+                select_lookups.extend(
+                    lookup for lookup in select_related if lookup not in select_lookups
+                )
 
-            prefetch_related = self.get_prefetch_related(included)
             if prefetch_related is not None:
-                qs = qs.prefetch_related(*prefetch_related)
+                prefetch_lookups.append(prefetch_related)
+
+        select_related, prefetch_related = self.get_serializer_preload_lookups(
+            qs.model, included_resources
+        )
+        select_lookups.extend(
+            lookup for lookup in select_related if lookup not in select_lookups
+        )
+        prefetch_lookups.append(prefetch_related)
+
+        if select_lookups:
+            qs = qs.select_related(*select_lookups)
+        if select_all:
+            qs = qs.select_related()
+
+        if prefetch_lookups:
+            qs = qs.prefetch_related(None).prefetch_related(
+                *merge_prefetch_lookups(qs._prefetch_related_lookups, *prefetch_lookups)
+            )
 
         return qs
 
+    def get_include_paths(self, included_resources):
+        """
+        Returns given includes and all their parents, parents first.
+        """
+        paths = []
+        for include in included_resources:
+            levels = include.split(".")
+            for depth in range(1, len(levels) + 1):
+                path = ".".join(levels[:depth])
+                if path not in paths:
+                    paths.append(path)
+
+        return paths
+
+    def get_preload_keys(self, included_resources):
+        """
+        Returns the keys of `select_for_includes` and `prefetch_for_includes` which
+        apply to given includes, being the includes and their parents as well as
+        keys with wildcards matching those.
+        """
+        paths = self.get_include_paths(included_resources)
+        keys = list(paths)
+        for key in {
+            **getattr(self, "select_for_includes", {}),
+            **getattr(self, "prefetch_for_includes", {}),
+        }:
+            if key not in keys and any(char in key for char in "*?["):
+                if any(fnmatch.fnmatchcase(path, key) for path in paths):
+                    keys.append(key)
+
+        return keys
+
+    def get_serializer_preload_lookups(self, model, included_resources):
+        """
+        Returns the `select_related` and `prefetch_related` lookups declared in the
+        `JSONAPIMeta` of the serializer and of the serializers along given includes,
+        prefixed with the lookup of their model from given model.
+
+        Lookups to select related instances of a model which is prefetched itself
+        are prefetched as well.
+        """
+        select_related = []
+        prefetch_related = []
+
+        def add_lookups(serializer_class, key, prefix, to_one, path=""):
+            meta = getattr(serializer_class, "JSONAPIMeta", None)
+            select = getattr(meta, "select_for_includes", {}).get(key)
+            prefetch = getattr(meta, "prefetch_for_includes", {}).get(key)
+            if key == "__all__" and (select or prefetch):
+                select, prefetch = self.skip_sparse_lookups(
+                    get_child_includes(path),
+                    select,
+                    prefetch,
+                    serializer_class if path else None,
+                )
+
+            for lookup in select or []:
+                if not to_one:
+                    prefetch_related.append(f"{prefix}{lookup}")
+                elif f"{prefix}{lookup}" not in select_related:
+                    select_related.append(f"{prefix}{lookup}")
+
+            for lookup in prefetch or []:
+                if isinstance(lookup, Prefetch) and prefix:
+                    lookup = Prefetch(
+                        f"{prefix}{lookup.prefetch_through}",
+                        queryset=lookup.queryset,
+                        to_attr=lookup.to_attr,
+                    )
+                elif prefix:
+                    lookup = f"{prefix}{lookup}"
+                prefetch_related.append(lookup)
+
+        def get_child_includes(path):
+            if not path:
+                return included_resources
+            return [
+                include[len(path) + 1 :]
+                for include in included_resources
+                if include.startswith(f"{path}.")
+            ]
+
+        serializer_class = self.get_serializer_class()
+        add_lookups(serializer_class, "__all__", "", True)
+
+        # serializer class, lookup prefix, model and whether the model is joined
+        # of every include path
+        nodes = {"": (serializer_class, "", model, True)}
+        for path in self.get_include_paths(included_resources):
+            parent_path, _, field_name = path.rpartition(".")
+            if parent_path not in nodes:
+                continue
+
+            parent_class, prefix, parent_model, to_one = nodes[parent_path]
+            if not self.is_sparse_field(parent_class, field_name):
+                # a relationship missing in the sparse fieldset of its resource
+                # type is not rendered, so nothing gets included through it
+                continue
+            add_lookups(parent_class, field_name, prefix, to_one)
+
+            included_serializers = getattr(parent_class, "included_serializers", {})
+            if field_name not in included_serializers:
+                continue
+            source = self.get_included_source(parent_class, field_name)
+            if source is None:
+                continue
+            try:
+                model_field = parent_model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.related_model is None:
+                continue
+
+            nodes[path] = (
+                included_serializers[field_name],
+                f"{prefix}{source}__",
+                model_field.related_model,
+                to_one and not (model_field.many_to_many or model_field.one_to_many),
+            )
+            included_class, included_prefix, _, included_to_one = nodes[path]
+            add_lookups(
+                included_class, "__all__", included_prefix, included_to_one, path
+            )
+
+        return select_related, prefetch_related
+
+    def get_included_source(self, serializer_class, field_name):
+        """
+        Returns the model attribute the included field of given serializer class
+        refers to or `None` when it has none, e.g. a `SerializerMethodField`.
+        """
+        key = (serializer_class, field_name)
+        if key not in _included_sources:
+            serializer = serializer_class(context=self.get_serializer_context())
+            field = serializer.fields.get(field_name)
+            source_attrs = getattr(field, "source_attrs", None)
+            _included_sources[key] = (
+                source_attrs[0] if source_attrs and len(source_attrs) == 1 else None
+            )
+
+        return _included_sources[key]
+
+    def is_sparse_field(self, serializer_class, field_name):
+        """
+        Returns whether given field of given serializer class is rendered in the
+        sparse fieldset requested for its resource type, if any.
+        """
+        try:
+            resource_type = get_resource_type_from_serializer(serializer_class)
+        except AttributeError:
+            return True
+
+        sparse_fields = get_query(self.request).get_sparse_fieldset(resource_type)
+        return sparse_fields is None or field_name in sparse_fields
+
+    def skip_sparse_lookups(
+        self,
+        included_resources,
+        select_related,
+        prefetch_related,
+        serializer_class=None,
+    ):
+        """
+        Removes lookups starting with a relation which is neither rendered in the
+        requested sparse fieldset nor included, of given serializer class or of the
+        serializer of the view when none is given.
+        """
+        if not get_query(self.request).fields:
+            return select_related, prefetch_related
+
+        if serializer_class is None:
+            serializer = self.get_serializer()
+        else:
+            serializer = serializer_class(context=self.get_serializer_context())
+        sources = get_sparse_fieldset_sources(
+            self.request, serializer, included_resources
+        )
+        if sources is None:
+            return select_related, prefetch_related
+
+        def is_needed(lookup):
+            return getattr(lookup, "prefetch_through", lookup).split("__")[0] in sources
+
+        # an empty `select_related()` would select all relations, so None is
+        # returned when every lookup is skipped
+        if select_related:
+            select_related = [
+                lookup for lookup in select_related if is_needed(lookup)
+            ] or None
+        if prefetch_related:
+            prefetch_related = [
+                lookup for lookup in prefetch_related if is_needed(lookup)
+            ] or None
+        return select_related, prefetch_related
+
 
 class AutoPrefetchMixin:
+    """
+    This mixin adds automatic preloading of included relations.
+
+    Relations to a single instance (forward foreign keys and one to one relations)
+    are joined with `select_related`, others are prefetched with
+    `prefetch_related`. Relations to a single instance which are included through
+    a prefetched relation are joined in the query prefetching it, e.g.
+    `include=comments.author` prefetches comments joined with their author.
+
+    The preloading plan of an include is computed once per viewset class and
+    model and then reused.
+
+    To-many relationships which are rendered but not included are prefetched on
+    safe requests. With `prefetch_linkage_pks_only` those load only the primary
+    keys of the related instances, as only their resource identifiers are
+    rendered. Only enable it when no other code (e.g. a `SerializerMethodField`)
+    reads other fields of those instances, as each would be queried per instance.
+    """
+
+    prefetch_linkage_pks_only = False
+
     def get_queryset(self, *args, **kwargs):
-        """This mixin adds automatic prefetching for OneToOne and ManyToMany fields."""
         qs = super().get_queryset(*args, **kwargs)
 
         included_resources = get_included_resources(
             self.request, self.get_serializer_class()
         )
+        if included_resources:
+            qs = self.preload_included_resources(qs, included_resources)
+
+        return self.add_prefetch_lookups(
+            qs, self.get_linkage_prefetch_lookups(qs, included_resources)
+        )
 
-        for included in included_resources + ["__all__"]:
-            # If include was not defined, trying to resolve it automatically
-            included_model = None
-            levels = included.split(".")
-            level_model = qs.model
-            for level in levels:
-                if not hasattr(level_model, level):
-                    break
-                field = getattr(level_model, level)
-                field_class = field.__class__
-
-                is_forward_relation = issubclass(
-                    field_class, (ForwardManyToOneDescriptor, ManyToManyDescriptor)
+    def preload_included_resources(self, qs, included_resources):
+        # joining specific relations would disable selecting all of them
+        use_joins = not (isinstance(qs, QuerySet) and qs.query.select_related is True)
+        select_related, prefetch_related = self.get_prefetch_plan(
+            qs.model, tuple(included_resources), use_joins
+        )
+
+        # relations which are prefetched with a custom queryset already are not
+        # joined, as joined instances would not be prefetched again
+        prefetched = {
+            lookup.prefetch_to
+            for lookup in qs._prefetch_related_lookups
+            if isinstance(lookup, Prefetch)
+        }
+
+        def is_prefetched(lookup):
+            return any(
+                lookup == other or lookup.startswith(f"{other}__")
+                for other in prefetched
+            )
+
+        lookups = [lookup for lookup in select_related if is_prefetched(lookup)]
+        select_related = [
+            lookup for lookup in select_related if not is_prefetched(lookup)
+        ]
+        if select_related:
+            qs = qs.select_related(*select_related)
+
+        for lookup, manager, model, joins in prefetch_related:
+            if not joins:
+                lookups.append(lookup)
+            elif lookup in prefetched:
+                lookups.append(lookup)
+                lookups.extend(f"{lookup}__{join}" for join in joins)
+            else:
+                queryset = getattr(model, manager).select_related(*joins)
+                lookups.append(Prefetch(lookup, queryset=queryset))
+
+        return self.add_prefetch_lookups(qs, lookups)
+
+    def get_linkage_prefetch_lookups(self, qs, included_resources):
+        """
+        Returns prefetch lookups of the related instances of rendered to-many
+        relationships which are neither included nor prefetched yet.
+
+        Only relationships whose resource identifiers are built from the primary
+        key and the model of the related instances are considered. With
+        `prefetch_linkage_pks_only` those are `Prefetch` lookups loading only the
+        primary keys, unless another rendered field has the same source. Instances
+        of django-polymorphic models are not downcast then, as their model is
+        known from their content type, which also applies to polymorphic to-one
+        relationships.
+
+        Which relationships those are is computed once per viewset class,
+        serializer class, model, includes and sparse fieldset and then reused.
+        """
+        if self.request.method not in SAFE_METHODS or not isinstance(qs, QuerySet):
+            return []
+
+        serializer_class = self.get_serializer_class()
+        try:
+            resource_type = get_resource_type_from_serializer(serializer_class)
+        except AttributeError:
+            resource_type = None
+        sparse_fields = get_query(self.request).get_sparse_fieldset(resource_type)
+
+        key = (
+            self.__class__,
+            serializer_class,
+            qs.model,
+            tuple(included_resources),
+            sparse_fields,
+        )
+        plan = _linkage_prefetch_plans.get(key)
+        if plan is None:
+            plan = _linkage_prefetch_plans[key] = self._build_linkage_prefetch_plan(
+                serializer_class, qs.model, included_resources
+            )
+
+        prefetched = {
+            getattr(lookup, "prefetch_to", lookup).split("__")[0]
+            for lookup in qs._prefetch_related_lookups
+        }
+
+        lookups = []
+        for source, related_model, only, pks_only in plan:
+            if source in prefetched:
+                continue
+
+            prefetched.add(source)
+            polymorphic = getattr(related_model, "polymorphic_model_marker", False)
+            if not pks_only:
+                lookups.append(source)
+            elif polymorphic:
+                queryset = related_model._default_manager.non_polymorphic().only(
+                    *only, "polymorphic_ctype"
                 )
-                is_reverse_relation = issubclass(
-                    field_class, (ReverseManyToOneDescriptor, ReverseOneToOneDescriptor)
+                lookups.append(Prefetch(source, queryset=queryset))
+            # other base managers need more fields
+            elif type(related_model._base_manager) is Manager:
+                queryset = related_model._default_manager.only(*only)
+                lookups.append(Prefetch(source, queryset=queryset))
+            else:
+                lookups.append(source)
+
+        return lookups
+
+    def _build_linkage_prefetch_plan(self, serializer_class, model, included_resources):
+        serializer = serializer_class(context=self.get_serializer_context())
+        serializer_model = getattr(getattr(serializer, "Meta", None), "model", None)
+        if (
+            isinstance(serializer, PolymorphicModelSerializer)
+            or serializer_model is not model
+        ):
+            return ()
+
+        included_fields = get_include_tree(included_resources)
+
+        plan = []
+        # readable fields are limited to the sparse fieldset
+        readable_fields = list(serializer._readable_fields)
+        sources = [field.source_attrs[:1] for field in readable_fields]
+        for field in readable_fields:
+            if (
+                field.field_name in included_fields
+                or isinstance(field, SkipDataMixin)
+                or len(field.source_attrs) != 1
+            ):
+                continue
+
+            # other fields of the same source need the complete instances
+            pks_only = (
+                self.prefetch_linkage_pks_only and sources.count([field.source]) == 1
+            )
+            if isinstance(field, ManyRelatedField):
+                if not self.is_pk_only_relation(field.child_relation):
+                    continue
+            elif (
+                not pks_only
+                or not isinstance(field, PolymorphicResourceRelatedField)
+                or not self.is_pk_only_relation(field)
+                or type(field).get_attribute is not RelatedField.get_attribute
+            ):
+                continue
+
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+
+            related_model = model_field.related_model
+            polymorphic = getattr(related_model, "polymorphic_model_marker", False)
+            if isinstance(model_field, (ManyToManyField, ManyToManyRel)):
+                only = ("pk",)
+            elif isinstance(model_field, ManyToOneRel):
+                # the foreign key matches the related instances to the instances
+                only = ("pk", model_field.field.name)
+            elif polymorphic and model_field.concrete:
+                # forward to-one relation
+                only = ("pk",)
+            else:
+                continue
+
+            plan.append((field.source, related_model, only, pks_only))
+
+        return tuple(plan)
+
+    def is_pk_only_relation(self, relation):
+        """
+        Tells whether given related field represents a related instance by its
+        primary key and model only.
+        """
+        if not isinstance(relation, PrimaryKeyRelatedField) or relation.pk_field:
+            return False
+
+        if isinstance(relation, ResourceRelatedField):
+            return (
+                type(relation).to_representation
+                is ResourceRelatedField.to_representation
+                and type(relation).get_resource_id
+                is ResourceRelatedField.get_resource_id
+            )
+
+        return (
+            type(relation).to_representation is PrimaryKeyRelatedField.to_representation
+        )
+
+    def get_prefetch_plan(self, model, included_resources, use_joins=True):
+        """
+        Returns the lookups to preload given includes of given model with as
+        tuple of `select_related` lookups and `(lookup, manager, model, joins)`
+        tuples of `prefetch_related` lookups with the manager and model to query
+        the prefetched instances with and the lookups to join in that query.
+        """
+        key = (self.__class__, model, included_resources, use_joins)
+        plan = _prefetch_plans.get(key)
+        if plan is None:
+            plan = _prefetch_plans[key] = self._build_prefetch_plan(
+                model, included_resources, use_joins
+            )
+
+        return plan
+
+    def _build_prefetch_plan(self, model, included_resources, use_joins):
+        select_related = []
+        prefetch_related = {}
+
+        for included in included_resources:
+            levels = self._resolve_include_levels(model, included.split("."))
+            if levels is None:
+                continue
+
+            # lookup of the latest prefetched relation and its model
+            prefetched = None
+            for index, (to_one, manager, level_model) in enumerate(levels):
+                lookup = "__".join(included.split(".")[: index + 1])
+                if prefetched is None:
+                    if use_joins and to_one:
+                        if lookup not in select_related:
+                            select_related.append(lookup)
+                        continue
+                elif to_one:
+                    prefetch_lookup = prefetched[0]
+                    joins = prefetch_related[prefetch_lookup][2]
+                    join = lookup[len(prefetch_lookup) + 2 :]
+                    if join not in joins:
+                        joins.append(join)
+                    continue
+
+                prefetched = (lookup, level_model)
+                prefetch_related.setdefault(lookup, (manager, level_model, []))
+
+        return (
+            tuple(select_related),
+            tuple(
+                (lookup, manager, prefetch_model, tuple(joins))
+                for lookup, (manager, prefetch_model, joins) in prefetch_related.items()
+            ),
+        )
+
+    def _resolve_include_levels(self, model, levels):
+        """
+        Returns a `(to_one, manager, model)` tuple per level of an include telling
+        whether the relation can be joined, which manager Django prefetches it with
+        and which model it refers to, or `None` when the include is not a path of
+        model relations.
+        """
+        resolved = []
+        for level in levels:
+            field = getattr(model, level, None)
+            if isinstance(field, ManyToManyDescriptor):
+                model = field.field.model if field.reverse else field.rel.model
+                to_one = False
+            elif isinstance(field, ReverseManyToOneDescriptor):
+                model = field.field.model
+                to_one = False
+            elif isinstance(field, ForwardManyToOneDescriptor):
+                model = field.field.related_model
+                to_one = True
+            elif isinstance(field, ReverseOneToOneDescriptor):
+                model = field.related.related_model
+                to_one = True
+            else:
+                return None
+
+            manager = "_base_manager" if to_one else "_default_manager"
+            # joined instances are not loaded through the base manager, so
+            # relations to models with a custom one (e.g. polymorphic) are prefetched
+            if to_one and type(model._base_manager) is not Manager:
+                to_one = False
+            resolved.append((to_one, manager, model))
+
+        return resolved
+
+    def add_prefetch_lookups(self, qs, lookups):
+        """
+        Adds given prefetch lookups to the queryset. `Prefetch` objects replace
+        plain lookups of the same relation, but not other `Prefetch` objects.
+        """
+        if not lookups:
+            return qs
+
+        return qs.prefetch_related(None).prefetch_related(
+            *merge_prefetch_lookups(qs._prefetch_related_lookups, lookups)
+        )
+
+
+class DeferSparseFieldsMixin:
+    """
+    This mixin defers loading the model fields which are not needed to render the
+    sparse fieldsets requested with `fields[type]` on safe requests.
+
+    Model fields are only deferred for the primary resource and for included
+    resources which get prefetched, e.g. by `AutoPrefetchMixin`. Fields used as
+    source of a rendered serializer field, to build links, for includes or by
+    `select_related` and `prefetch_related` are always loaded. When a rendered
+    serializer field has a source which is not a model field (e.g. a property or
+    a `SerializerMethodField`) nothing is deferred, as it can not be told which
+    model fields it needs.
+    """
+
+    def get_queryset(self, *args, **kwargs):
+        qs = super().get_queryset(*args, **kwargs)
+
+        if (
+            self.request.method not in SAFE_METHODS
+            or not isinstance(qs, QuerySet)
+            or qs.query.select_related is True
+            or not get_query(self.request).fields
+        ):
+            return qs
+
+        serializer_class = self.get_serializer_class()
+        included_resources = get_included_resources(self.request, serializer_class)
+
+        required = set(qs.query.select_related or {})
+        for lookup in qs._prefetch_related_lookups:
+            required.add(getattr(lookup, "prefetch_through", lookup).split("__")[0])
+
+        deferred_fields = self.get_deferred_fields(
+            self.get_serializer(),
+            qs.model,
+            included_resources,
+            required,
+        )
+        if deferred_fields:
+            qs = qs.defer(*deferred_fields)
+
+        return self.defer_included_fields(qs, serializer_class, included_resources)
+
+    def get_deferred_fields(
+        self, serializer, model, included_resources=(), required=()
+    ):
+        """
+        Returns the names of the concrete fields of given model which are not needed
+        to render the sparse fieldset of given serializer, if any was requested.
+        """
+        sources = get_sparse_fieldset_sources(
+            self.request, serializer, included_resources
+        )
+        if sources is None:
+            return []
+        required = sources | set(required)
+
+        model_field_names = set()
+        for model_field in model._meta.get_fields():
+            model_field_names.add(model_field.name)
+            if hasattr(model_field, "attname"):
+                model_field_names.add(model_field.attname)
+
+        if not required <= model_field_names | {"pk"}:
+            # source is not a model field, so its dependencies are unknown
+            return []
+
+        return [
+            model_field.name
+            for model_field in model._meta.concrete_fields
+            if not model_field.primary_key
+            and model_field.name not in required
+            and model_field.attname not in required
+        ]
+
+    def defer_included_fields(self, qs, serializer_class, included_resources):
+        """
+        Defers the model fields of included resources not needed for the sparse
+        fieldsets of those.
+
+        Included resources joined with `select_related` get their fields deferred
+        in the query joining them. Prefetch lookups of included resources, including
+        lookups prefetched implicitly by nested ones, are replaced with `Prefetch`
+        objects deferring fields in the prefetch query.
+        """
+        lookups = list(qs._prefetch_related_lookups)
+        through = [getattr(lookup, "prefetch_through", lookup) for lookup in lookups]
+        changed = False
+
+        includes = []
+        for include in included_resources:
+            path = include.split(".")
+            for depth in range(1, len(path) + 1):
+                if ".".join(path[:depth]) not in includes:
+                    includes.append(".".join(path[:depth]))
+
+        deferred_fields = self.get_joined_deferred_fields(
+            qs, qs.model, serializer_class, includes, included_resources, through
+        )
+        if deferred_fields:
+            qs = qs.defer(*deferred_fields)
+
+        for include in includes:
+            lookup = include.replace(".", "__")
+            if lookup in through:
+                index = through.index(lookup)
+                queryset = getattr(lookups[index], "queryset", None)
+                if getattr(lookups[index], "to_attr", None):
+                    continue
+            elif not self.is_joined(qs, lookup) and any(
+                other.startswith(f"{lookup}__") for other in through
+            ):
+                index = None
+                queryset = None
+            else:
+                continue
+
+            prefetch_queryset = self.get_included_queryset(
+                qs.model,
+                serializer_class,
+                include,
+                included_resources,
+                queryset,
+                includes,
+                through,
+            )
+            if prefetch_queryset is None:
+                continue
+
+            prefetch = Prefetch(lookup, queryset=prefetch_queryset)
+            if index is None:
+                lookups.append(prefetch)
+            else:
+                lookups[index] = prefetch
+            changed = True
+
+        if not changed:
+            return qs
+
+        # parent lookups need to be prefetched before nested ones
+        lookups.sort(
+            key=lambda lookup: getattr(lookup, "prefetch_through", lookup).count("__")
+        )
+        return qs.prefetch_related(None).prefetch_related(*lookups)
+
+    def is_joined(self, qs, lookup):
+        joins = qs.query.select_related
+        for field_name in lookup.split("__"):
+            if not isinstance(joins, dict) or field_name not in joins:
+                return False
+            joins = joins[field_name]
+        return True
+
+    def get_joined_deferred_fields(
+        self,
+        qs,
+        model,
+        serializer_class,
+        includes,
+        included_resources,
+        through,
+        prefix="",
+    ):
+        """
+        Returns the lookups of the model fields of included resources joined into
+        given queryset with `select_related` which can be deferred.
+
+        `model` and `serializer_class` are the ones of the primary resource,
+        `through` are the prefetch lookups of the primary queryset and `prefix` is
+        the include path of the resources given queryset prefetches, if any.
+        """
+        if not isinstance(qs.query.select_related, dict):
+            return []
+
+        deferred_fields = []
+        joins = [(qs.query.select_related, "")]
+        while joins:
+            joined, lookup_prefix = joins.pop()
+            for field_name, nested_joins in joined.items():
+                lookup = f"{lookup_prefix}{field_name}"
+                joins.append((nested_joins, f"{lookup}__"))
+
+                include = lookup.replace("__", ".")
+                if prefix:
+                    include = f"{prefix}.{include}"
+                if include not in includes:
+                    continue
+
+                full_lookup = include.replace(".", "__")
+                required = set(nested_joins)
+                required.update(
+                    other[len(full_lookup) + 2 :].split("__")[0]
+                    for other in through
+                    if other.startswith(f"{full_lookup}__")
+                )
+                deferred_fields.extend(
+                    f"{lookup}__{deferred_field}"
+                    for deferred_field in self.get_included_deferred_fields(
+                        model, serializer_class, include, included_resources, required
+                    )
                 )
-                if not (is_forward_relation or is_reverse_relation):
-                    break
 
-                if level == levels[-1]:
-                    included_model = field
-                else:
-                    if issubclass(field_class, ReverseOneToOneDescriptor):
-                        model_field = field.related.field
-                    else:
-                        model_field = field.field
+        return deferred_fields
 
-                    if is_forward_relation:
-                        level_model = model_field.related_model
-                    else:
-                        level_model = model_field.model
+    def get_included_deferred_fields(
+        self, model, serializer_class, include, included_resources, required=()
+    ):
+        """
+        Returns the names of the model fields of the resources of given include
+        path which can be deferred.
+        """
+        model_field = None
+        for field_name in include.split("."):
+            included_serializers = getattr(serializer_class, "included_serializers", {})
+            if field_name not in included_serializers:
+                return []
+            serializer_class = included_serializers[field_name]
+            try:
+                model_field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                return []
+            if model_field.related_model is None:
+                return []
+            model = model_field.related_model
+
+        required = set(required)
+        if model_field.auto_created and not model_field.many_to_many:
+            # reverse relations are matched by the foreign key of the related model
+            required.add(model_field.field.name)
+
+        prefix = f"{include}."
+        return self.get_deferred_fields(
+            serializer_class(context=self.get_serializer_context()),
+            model,
+            [
+                included[len(prefix) :]
+                for included in included_resources
+                if included.startswith(prefix)
+            ],
+            required,
+        )
 
-            if included_model is not None:
-                qs = qs.prefetch_related(included.replace(".", "__"))
+    def get_included_queryset(
+        self,
+        model,
+        serializer_class,
+        include,
+        included_resources,
+        queryset=None,
+        includes=(),
+        through=(),
+    ):
+        """
+        Returns the queryset to prefetch the resources of given include path with
+        or `None` when no model fields can be deferred.
 
-        return qs
+        Fields are deferred on given queryset, if any, otherwise on the manager
+        Django prefetches the relation with.
+        """
+        model_field = None
+        included_model = model
+        for field_name in include.split("."):
+            try:
+                model_field = included_model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                return None
+            if model_field.related_model is None:
+                return None
+            included_model = model_field.related_model
+
+        if queryset is None:
+            if model_field.auto_created or model_field.many_to_many:
+                queryset = included_model._default_manager.all()
+            else:
+                queryset = included_model._base_manager.all()
+        elif queryset.query.select_related is True:
+            return None
+
+        lookup = include.replace(".", "__")
+        required = set(queryset.query.select_related or {})
+        required.update(
+            other[len(lookup) + 2 :].split("__")[0]
+            for other in through
+            if other.startswith(f"{lookup}__")
+        )
+        deferred_fields = self.get_included_deferred_fields(
+            model, serializer_class, include, included_resources, required
+        )
+        deferred_fields += self.get_joined_deferred_fields(
+            queryset,
+            model,
+            serializer_class,
+            includes,
+            included_resources,
+            through,
+            include,
+        )
+        if not deferred_fields:
+            return None
+
+        return queryset.defer(*deferred_fields)
+
+
+class StreamingListMixin:
+    """
+    This mixin renders the list action as a streamed JSON:API document when
+    `stream_chunk_size` is set.
+
+    Instances are serialized and rendered in chunks of `stream_chunk_size`, so the
+    memory needed is bound by the chunk size instead of the size of the list.
+    Related resources to include and the top level meta are rendered at the end.
+
+    The first chunk is rendered before the response is returned, so its errors
+    are still reported with an error response. Errors of later chunks abort the
+    already started response.
+
+    .. code:: python
+
+        class MyViewSet(viewsets.ModelViewSet):
+            queryset = Book.objects.all()
+            stream_chunk_size = 500
+    """
+
+    stream_chunk_size = None
+
+    def list(self, request, *args, **kwargs):
+        renderer = getattr(request, "accepted_renderer", None)
+        if not self.stream_chunk_size or not hasattr(renderer, "render_stream"):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # make sure the request is valid (e.g. include parameter)
+        # before the response is started
+        self.get_serializer(many=True)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            instances = page
+            data = self.get_paginated_response([]).data
+        else:
+            if isinstance(queryset, QuerySet):
+                instances = queryset.iterator(chunk_size=self.stream_chunk_size)
+            else:
+                instances = queryset
+            data = None
+
+        chunks = (
+            self.get_serializer(chunk, many=True).data
+            for chunk in self.get_stream_chunks(instances)
+        )
+        parts = renderer.render_stream(
+            chunks, data, request.accepted_media_type, self.get_renderer_context()
+        )
+        # render the first chunk while an error response can still be returned
+        first_part = next(parts)
+        return StreamingHttpResponse(
+            chain((first_part,), parts),
+            content_type=renderer.get_content_type(request.accepted_media_type),
+        )
+
+    def get_stream_chunks(self, instances):
+        instances = iter(instances)
+        chunk = list(islice(instances, self.stream_chunk_size))
+        # always serialize at least one chunk, even when the list is empty
+        yield chunk
+        while chunk:
+            chunk = list(islice(instances, self.stream_chunk_size))
+            if chunk:
+                yield chunk
 
 
 class RelatedMixin:
@@ -214,13 +1168,23 @@ class RelatedMixin:
 
 
 class ModelViewSet(
-    AutoPrefetchMixin, PreloadIncludesMixin, RelatedMixin, viewsets.ModelViewSet
+    DeferSparseFieldsMixin,
+    AutoPrefetchMixin,
+    PreloadIncludesMixin,
+    RelatedMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet,
 ):
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
 
 
 class ReadOnlyModelViewSet(
-    AutoPrefetchMixin, PreloadIncludesMixin, RelatedMixin, viewsets.ReadOnlyModelViewSet
+    DeferSparseFieldsMixin,
+    AutoPrefetchMixin,
+    PreloadIncludesMixin,
+    RelatedMixin,
+    StreamingListMixin,
+    viewsets.ReadOnlyModelViewSet,
 ):
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
 
@@ -112,6 +112,7 @@ setup(
     extras_require={
         "django-polymorphic": ["django-polymorphic>=4.0.0"],
         "django-filter": ["django-filter>=2.4"],
+        "orjson": ["orjson>=3.9"],
     },
     setup_requires=wheel,
     python_requires=">=3.10",
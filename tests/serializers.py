@@ -44,6 +44,17 @@ class ForeignKeySourceSerializer(serializers.ModelSerializer):
         )
 
 
+class ForeignKeySourceReadOnlySerializer(serializers.ModelSerializer):
+    target = serializers.ResourceRelatedField(read_only=True)
+
+    class Meta:
+        model = ForeignKeySource
+        fields = (
+            "name",
+            "target",
+        )
+
+
 class ForeignKeySourcetHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = ForeignKeySource
@@ -142,3 +142,40 @@ class TestJSONParser:
         assert "The resource identifier object must contain an 'id' member" == str(
             excinfo.value
         )
+
+    @pytest.mark.parametrize(
+        "json_backend", [None, "rest_framework_json_api.json_backends.ORJSONBackend"]
+    )
+    def test_parse_with_json_backend(
+        self, settings, json_backend, parse, parser_context
+    ):
+        pytest.importorskip("orjson")
+        settings.JSON_API_JSON_BACKEND = json_backend
+        data = {
+            "data": {
+                "id": "123",
+                "type": "BasicModel",
+                "attributes": {"text": "Ünïcode \u2028"},
+            },
+            "meta": {"count": 12345678901234567890},
+        }
+
+        result = parse(data, parser_context)
+
+        assert result == {
+            "id": "123",
+            "type": "BasicModel",
+            "text": "Ünïcode \u2028",
+            "_meta": {"count": 12345678901234567890},
+        }
+
+    def test_parse_invalid_json_with_json_backend(self, settings, parser):
+        pytest.importorskip("orjson")
+        settings.JSON_API_JSON_BACKEND = (
+            "rest_framework_json_api.json_backends.ORJSONBackend"
+        )
+
+        with pytest.raises(ParseError) as excinfo:
+            parser.parse(BytesIO(b'{"data": '), None, {})
+
+        assert str(excinfo.value).startswith("JSON parse error - Expecting value")
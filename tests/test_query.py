@@ -0,0 +1,64 @@
+import pytest
+from rest_framework.request import Request
+
+from rest_framework_json_api.query import JSONAPIQuery, get_include_tree, get_query
+
+
+class TestJSONAPIQuery:
+    def get_query(self, rf, params):
+        return get_query(Request(rf.get("/", params)))
+
+    def test_parses_query_params(self, rf, settings):
+        settings.JSON_API_FORMAT_FIELD_NAMES = "dasherize"
+
+        query = self.get_query(
+            rf,
+            {
+                "include": "blog,comments.author-bio",
+                "fields[entries]": "headline,blog-name",
+                "sort": "-headline, blog.name",
+                "filter[blog.blog-name]": "foo",
+                "filter": "bar",
+                "page[size]": "2",
+            },
+        )
+
+        assert query.include == ("blog", "comments.author_bio")
+        assert query.fields == {"entries": ("headline", "blog_name")}
+        assert query.sort == ("-headline", "blog.name")
+        assert query.filters == {"filter[blog.blog-name]": "blog__blog_name"}
+
+    def test_empty(self, rf):
+        query = self.get_query(rf, {"include": ""})
+
+        assert query.include is None
+        assert query.get_sparse_fieldset("entries") is None
+        assert query.sort == ()
+
+    def test_parsed_once_per_request(self, rf):
+        request = Request(rf.get("/", {"include": "blog"}))
+
+        assert get_query(request) is get_query(request)
+
+    def test_immutable(self, rf):
+        query = self.get_query(rf, {"fields[entries]": "headline"})
+
+        with pytest.raises(AttributeError):
+            query.include = ("blog",)
+        with pytest.raises(TypeError):
+            query.fields["entries"] = ()
+
+    def test_no_request(self):
+        assert get_query(None) is None
+
+    def test_from_query_dict(self, rf):
+        query = JSONAPIQuery(rf.get("/", {"include": "blog"}).GET)
+
+        assert query.include == ("blog",)
+
+
+def test_get_include_tree():
+    tree = get_include_tree(["comments.author.bio", "comments.author", "blog"])
+
+    assert tree == {"comments": ("author.bio", "author"), "blog": ()}
+    assert get_include_tree(("comments.author.bio", "comments.author", "blog")) is tree
@@ -15,6 +15,7 @@ from rest_framework_json_api.utils import format_link_segment
 from rest_framework_json_api.views import RelationshipView
 from tests.models import BasicModel, ForeignKeySource, ForeignKeyTarget
 from tests.serializers import (
+    ForeignKeySourceReadOnlySerializer,
     ForeignKeySourceSerializer,
     ManyToManySourceReadOnlySerializer,
     ManyToManySourceSerializer,
@@ -71,6 +72,58 @@ class TestResourceRelatedField:
 
         assert serializer.data["target"] == expected
 
+    @pytest.mark.parametrize(
+        "serializer_class",
+        [ForeignKeySourceSerializer, ForeignKeySourceReadOnlySerializer],
+    )
+    def test_serialize_without_retrieving_related_instance(
+        self, serializer_class, foreign_key_source, django_assert_num_queries
+    ):
+        instance = ForeignKeySource.objects.get(pk=foreign_key_source.pk)
+
+        with django_assert_num_queries(0):
+            data = serializer_class(instance=instance).data
+
+        assert data["target"] == {
+            "type": "ForeignKeyTarget",
+            "id": str(foreign_key_source.target_id),
+        }
+
+    def test_serialize_with_overwritten_get_resource_id(self, foreign_key_source):
+        class NameRelatedField(ResourceRelatedField):
+            def get_resource_id(self, value):
+                return value.name
+
+        class SourceSerializer(ForeignKeySourceReadOnlySerializer):
+            target = NameRelatedField(read_only=True)
+
+        instance = ForeignKeySource.objects.get(pk=foreign_key_source.pk)
+        serializer = SourceSerializer(instance=instance)
+
+        assert serializer.data["target"] == {
+            "type": "ForeignKeyTarget",
+            "id": foreign_key_source.target.name,
+        }
+
+    def test_serialize_type_of_included_serializer(self, foreign_key_source):
+        class TargetSerializer(ModelSerializer):
+            class Meta:
+                model = ForeignKeyTarget
+                fields = ("name",)
+
+            class JSONAPIMeta:
+                resource_name = "targets"
+
+        class SourceSerializer(ForeignKeySourceReadOnlySerializer):
+            included_serializers = {"target": TargetSerializer}
+
+        serializer = SourceSerializer(instance=foreign_key_source)
+
+        assert serializer.data["target"] == {
+            "type": "targets",
+            "id": str(foreign_key_source.target_id),
+        }
+
     @pytest.mark.parametrize(
         "format_type,pluralize_type,resource_type",
         [
@@ -0,0 +1,780 @@
+import datetime
+import decimal
+import json
+import sys
+import time
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.translation import gettext_lazy
+from rest_framework import relations, renderers
+from rest_framework.request import Request
+
+from rest_framework_json_api import json_backends, serializers
+from rest_framework_json_api.relations import HyperlinkedRelatedField
+from rest_framework_json_api.renderers import (
+    IncludedCache,
+    JSONRenderer,
+    LinkTemplates,
+    RenderPlan,
+)
+from rest_framework_json_api.resource_cache import (
+    REQUEST_STARTED_KEY,
+    get_resource_cache,
+)
+from rest_framework_json_api.serializers import ResourceObjectMixin
+from rest_framework_json_api.utils import (
+    Hyperlink,
+    get_resource_type_from_serializer,
+    get_serializer_fields,
+)
+from rest_framework_json_api.views import ReadOnlyModelViewSet
+from tests.models import (
+    ForeignKeySource,
+    ForeignKeyTarget,
+    ManyToManySource,
+    ManyToManyTarget,
+)
+from tests.serializers import ForeignKeySourceSerializer, ManyToManyTargetSerializer
+
+
+class TestRenderPlan:
+    def test_classifies_fields(self):
+        fields = get_serializer_fields(ForeignKeySourceSerializer())
+
+        plan = RenderPlan(fields)
+
+        assert plan.field_names == ("name", "target")
+        assert plan.attributes == {"name": "name"}
+        assert plan.relationships == [
+            ("target", "target", "ForeignKeyTarget", "resource", True)
+        ]
+        assert not plan.self_link
+
+    def test_formats_field_names(self, settings):
+        settings.JSON_API_FORMAT_FIELD_NAMES = "capitalize"
+        fields = get_serializer_fields(ForeignKeySourceSerializer())
+
+        plan = RenderPlan(fields)
+
+        assert plan.attributes == {"name": "Name"}
+        assert plan.relationships[0][1] == "Target"
+
+    def test_bind_restricts_fields(self):
+        fields = get_serializer_fields(ForeignKeySourceSerializer())
+        plan = RenderPlan({"name": fields["name"]})
+
+        bound_fields = plan.bind(fields)
+
+        assert list(bound_fields) == ["name"]
+        assert "target" not in bound_fields
+        assert bound_fields.render_plan is plan
+
+
+class TestGetRenderPlan:
+    def get_plan(self, rf, url="/"):
+        request = Request(rf.get(url))
+        serializer = ForeignKeySourceSerializer(context={"request": request})
+        fields = get_serializer_fields(serializer)
+        return JSONRenderer.get_render_plan(fields, serializer, "ForeignKeySource")
+
+    def test_plan_is_cached(self, rf):
+        assert self.get_plan(rf) is self.get_plan(rf)
+
+    def test_plan_per_sparse_fieldset(self, rf):
+        plan = self.get_plan(rf, "/?fields[ForeignKeySource]=name")
+
+        assert plan is not self.get_plan(rf)
+        assert plan.field_names == ("name",)
+        assert plan.relationships == []
+
+    @pytest.mark.parametrize(
+        "setting",
+        [
+            "JSON_API_FORMAT_FIELD_NAMES",
+            "JSON_API_FORMAT_TYPES",
+            "JSON_API_PLURALIZE_TYPES",
+        ],
+    )
+    def test_plan_cleared_on_setting_change(self, rf, settings, setting):
+        plan = self.get_plan(rf)
+
+        setattr(settings, setting, "dasherize")
+
+        assert plan is not self.get_plan(rf)
+
+    def test_plan_looked_up_once_per_serializer(self, rf, many_to_many_targets):
+        serializer = ManyToManyTargetSerializer(
+            many_to_many_targets, many=True, context={"request": Request(rf.get("/"))}
+        )
+
+        with mock.patch.object(
+            JSONRenderer, "get_render_plan", wraps=JSONRenderer.get_render_plan
+        ) as get_render_plan:
+            JSONRenderer.build_json_resource_objs(
+                serializer, serializer.data, "ManyToManyTarget", [], IncludedCache()
+            )
+
+        # once for the linkage and once for the resource objects of all rows
+        assert get_render_plan.call_count == 2
+
+
+class TestIncludedCache:
+    def test_add_queues_instance_once(self, many_to_many_targets):
+        included_cache = IncludedCache()
+
+        included_cache.add(ManyToManyTargetSerializer, {}, many_to_many_targets, [])
+        included_cache.add(
+            ManyToManyTargetSerializer, {}, many_to_many_targets[:1], ["sources"]
+        )
+
+        _, items = included_cache.pending[ManyToManyTargetSerializer]
+        assert [item.instance for item in items] == many_to_many_targets
+        assert items[0].included_resources == ["sources"]
+        assert items[1].included_resources == []
+
+    def test_add_resolves_new_includes_of_serialized_instance(
+        self, many_to_many_targets
+    ):
+        included_cache = IncludedCache()
+        included_cache.add(ManyToManyTargetSerializer, {}, many_to_many_targets, [])
+        JSONRenderer.serialize_included(included_cache)
+
+        included_cache.add(
+            ManyToManyTargetSerializer, {}, many_to_many_targets, ["sources"]
+        )
+
+        assert not included_cache.pending
+        assert [
+            (included.instance, included_resources)
+            for included, included_resources in included_cache.nested
+        ] == [(target, ["sources"]) for target in many_to_many_targets]
+        assert sorted(included_cache["ManyToManyTarget"]) == [
+            str(target.pk) for target in many_to_many_targets
+        ]
+
+
+class CountedManyToManySourceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ManyToManySource
+        fields = ("targets",)
+        relationship_counts = {"targets": "targets_count"}
+
+
+class TestRelationshipCounts:
+    def test_count_from_annotation(self, many_to_many_source):
+        instance = ManyToManySource.objects.annotate(
+            targets_count=Count("targets")
+        ).get()
+        instance.targets_count = 5
+        serializer = CountedManyToManySourceSerializer(instance)
+
+        relationships = JSONRenderer.extract_relationships(
+            get_serializer_fields(serializer), serializer.data, instance
+        )
+
+        assert relationships["targets"]["meta"] == {"count": 5}
+        assert len(relationships["targets"]["data"]) == 2
+
+    def test_count_without_annotation(self, many_to_many_source):
+        instance = ManyToManySource.objects.get()
+        serializer = CountedManyToManySourceSerializer(instance)
+
+        relationships = JSONRenderer.extract_relationships(
+            get_serializer_fields(serializer), serializer.data, instance
+        )
+
+        assert relationships["targets"]["meta"] == {"count": 2}
+        assert len(relationships["targets"]["data"]) == 2
+
+    def test_count_without_data(self, many_to_many_source):
+        class LinksOnlySerializer(CountedManyToManySourceSerializer):
+            targets = HyperlinkedRelatedField(
+                many=True,
+                read_only=True,
+                related_link_view_name="many-to-many-source-targets",
+            )
+
+        instance = ManyToManySource.objects.annotate(
+            targets_count=Count("targets")
+        ).get()
+        serializer = LinksOnlySerializer(instance)
+
+        with mock.patch.object(HyperlinkedRelatedField, "get_links", return_value={}):
+            relationships = JSONRenderer.extract_relationships(
+                get_serializer_fields(serializer), serializer.data, instance
+            )
+
+        assert relationships["targets"] == {"meta": {"count": 2}}
+
+    def test_identity_count_skips_linkage(
+        self, many_to_many_source, django_assert_num_queries
+    ):
+        field = relations.HyperlinkedIdentityField(view_name="targets")
+        field.bind("targets", CountedManyToManySourceSerializer())
+        many_to_many_source.targets_count = 2
+
+        with django_assert_num_queries(0):
+            relationship = JSONRenderer.build_relationship(
+                field,
+                "ManyToManyTarget",
+                "identity",
+                False,
+                "http://testserver/targets",
+                many_to_many_source,
+            )
+
+        assert relationship == {
+            "links": {"related": "http://testserver/targets"},
+            "meta": {"count": 2},
+        }
+
+
+class PlainManyToManySourceSerializer(serializers.ModelSerializer):
+    targets = relations.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = ManyToManySource
+        fields = ("targets",)
+
+
+class PlainManyToManyTargetSerializer(serializers.ModelSerializer):
+    sources = relations.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = ManyToManyTarget
+        fields = ("sources",)
+
+
+class RelatedHyperlinkedIdentityField(relations.HyperlinkedIdentityField):
+    def __init__(self, view_name=None, **kwargs):
+        super().__init__(view_name, **kwargs)
+        # source defaults to the field name instead of the whole instance
+        self.source = None
+
+
+class IdentityForeignKeyTargetSerializer(serializers.ModelSerializer):
+    sources = RelatedHyperlinkedIdentityField(view_name="foreign-key-target-detail")
+
+    class Meta:
+        model = ForeignKeyTarget
+        fields = ("sources",)
+
+    class JSONAPIMeta:
+        resource_name = "ForeignKeyTarget"
+
+
+class TestLinkage:
+    def get_relationships(self, serializer_class, instances, resource_type, rf):
+        serializer = serializer_class(
+            instances, many=True, context={"request": Request(rf.get("/"))}
+        )
+        fields = get_serializer_fields(serializer.child)
+        linkage = JSONRenderer.get_linkage(
+            fields,
+            instances,
+            JSONRenderer.get_render_plan(fields, serializer, resource_type),
+        )
+        return [
+            JSONRenderer.extract_relationships(fields, {}, instance, linkage=linkage)
+            for instance in instances
+        ]
+
+    @pytest.mark.parametrize(
+        "serializer_class,resource_type,model",
+        [
+            (PlainManyToManySourceSerializer, "ManyToManySource", ManyToManySource),
+            (PlainManyToManyTargetSerializer, "ManyToManyTarget", ManyToManyTarget),
+        ],
+    )
+    def test_many_to_many(
+        self,
+        rf,
+        many_to_many_sources,
+        serializer_class,
+        resource_type,
+        model,
+        django_assert_num_queries,
+    ):
+        instances = list(model.objects.order_by("pk"))
+
+        with django_assert_num_queries(1):
+            batched = self.get_relationships(
+                serializer_class, instances, resource_type, rf
+            )
+
+        fields = get_serializer_fields(serializer_class())
+        assert batched == [
+            JSONRenderer.extract_relationships(fields, {}, instance)
+            for instance in instances
+        ]
+        assert all(len(next(iter(r.values()))["data"]) for r in batched)
+
+    def test_identity_reverse_foreign_key(self, rf, db, django_assert_num_queries):
+        targets = [ForeignKeyTarget.objects.create(name=str(i)) for i in range(3)]
+        sources = [
+            ForeignKeySource.objects.create(name=str(i), target=targets[i % 2])
+            for i in range(3)
+        ]
+
+        with django_assert_num_queries(1):
+            relationships = self.get_relationships(
+                IdentityForeignKeyTargetSerializer,
+                targets,
+                "ForeignKeyTarget",
+                rf,
+            )
+
+        assert [
+            sorted(item["id"] for item in relationship["sources"]["data"])
+            for relationship in relationships
+        ] == [
+            [str(sources[0].pk), str(sources[2].pk)],
+            [str(sources[1].pk)],
+            [],
+        ]
+
+    def test_prefetched_relation_is_not_queried(
+        self, rf, many_to_many_sources, django_assert_num_queries
+    ):
+        instances = list(ManyToManySource.objects.prefetch_related("targets"))
+        serializer = PlainManyToManySourceSerializer(instances, many=True)
+        fields = get_serializer_fields(serializer.child)
+
+        with django_assert_num_queries(0):
+            linkage = JSONRenderer.get_linkage(
+                fields,
+                instances,
+                JSONRenderer.get_render_plan(fields, serializer, "ManyToManySource"),
+            )
+
+        assert linkage.relations == {}
+
+
+class TestLinkTemplates:
+    def resource_obj(self, resource_id, related):
+        return {
+            "type": "sources",
+            "id": resource_id,
+            "relationships": {
+                "targets": {"links": {"related": related}, "meta": {"count": 1}}
+            },
+        }
+
+    def test_links_replaced_by_template(self):
+        link_templates = LinkTemplates()
+
+        resource_objs = [
+            link_templates.apply(self.resource_obj(resource_id, related))
+            for resource_id, related in [
+                ("1", "http://testserver/sources/1/targets"),
+                ("a b", "http://testserver/sources/a%20b/targets"),
+            ]
+        ]
+
+        assert [obj["relationships"]["targets"] for obj in resource_objs] == [
+            {"meta": {"count": 1}}
+        ] * 2
+        assert link_templates.get_meta() == {
+            "sources": {
+                "targets": {"related": "http://testserver/sources/{id}/targets"}
+            }
+        }
+
+    def test_links_not_matching_template_kept(self):
+        link_templates = LinkTemplates()
+        link_templates.apply(self.resource_obj("1", "/sources/1/targets"))
+        resource_obj = self.resource_obj("2", "/other/2/targets")
+
+        assert link_templates.apply(resource_obj) == resource_obj
+
+    def test_ambiguous_id_kept(self):
+        link_templates = LinkTemplates()
+        resource_obj = self.resource_obj("1", "/sources/1/targets/1")
+
+        assert link_templates.apply(resource_obj) == resource_obj
+        assert link_templates.get_meta() == {}
+
+
+class TestJSONBackend:
+    @pytest.fixture(autouse=True)
+    def json_backend(self, settings):
+        pytest.importorskip("orjson")
+        settings.JSON_API_JSON_BACKEND = (
+            "rest_framework_json_api.json_backends.ORJSONBackend"
+        )
+
+    @pytest.fixture
+    def data(self):
+        return {
+            "link": Hyperlink("http://testserver/1", "self"),
+            "lazy": gettext_lazy("Not found."),
+            "decimal": decimal.Decimal("1E+16"),
+            "datetime": datetime.datetime(
+                2020, 1, 2, 3, 4, 5, 678, datetime.timezone.utc
+            ),
+            "naive_datetime": datetime.datetime(2020, 1, 2, 3, 4, 5),
+            "date": datetime.date(2020, 1, 2),
+            "time": datetime.time(3, 4, 5),
+            "uuid": uuid.UUID("b9cd4bd1-0a14-4c31-9e0b-6d2e1a6ff0c6"),
+            "unicode": "Ünïcode \u2028 \u2029",
+            1: [None, True, 1.5, ("a", "b")],
+        }
+
+    def render_default(self, data, accepted_media_type=None):
+        return renderers.JSONRenderer().render(data, accepted_media_type)
+
+    @pytest.mark.parametrize(
+        "accepted_media_type",
+        [None, "application/vnd.api+json; indent=2"],
+    )
+    def test_render_json(self, data, accepted_media_type):
+        rendered = JSONRenderer().render_json(data, accepted_media_type)
+
+        assert rendered == self.render_default(data, accepted_media_type)
+
+    def test_render_json_unsupported_indent(self, data):
+        accepted_media_type = "application/vnd.api+json; indent=4"
+
+        rendered = JSONRenderer().render_json(data, accepted_media_type)
+
+        assert rendered == self.render_default(data, accepted_media_type)
+
+    def test_backend_renders_data(self, data):
+        backend = json_backends.get_json_backend()
+
+        rendered = backend.dumps(data, default=JSONRenderer.encoder_class().default)
+
+        assert rendered == self.render_default(data).replace(
+            b"\\u2028", "\u2028".encode()
+        ).replace(b"\\u2029", "\u2029".encode())
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            1e16,
+            -1.5e300,
+            1e-7,
+            1e-5,
+            0.0001,
+            9999999999999998.0,
+            5e-324,
+            {1e16: "key"},
+            decimal.Decimal("1E-7"),
+            "1e16 0.00001",
+        ],
+    )
+    def test_render_json_floats(self, value):
+        data = {"value": [value]}
+
+        assert JSONRenderer().render_json(data) == self.render_default(data)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            float("nan"),
+            float("inf"),
+            {float("-inf"): "key"},
+            decimal.Decimal("NaN"),
+            ("x", float("nan")),
+        ],
+    )
+    def test_render_json_non_finite_floats(self, value):
+        with pytest.raises(ValueError):
+            JSONRenderer().render_json({"value": [value, None]})
+
+    def test_render_json_non_finite_floats_returned_by_default(self):
+        class Point:
+            pass
+
+        class Encoder(JSONRenderer.encoder_class):
+            def default(self, obj):
+                if isinstance(obj, Point):
+                    return {"x": float("nan")}
+                return super().default(obj)
+
+        class PointRenderer(JSONRenderer):
+            encoder_class = Encoder
+
+        with pytest.raises(ValueError):
+            PointRenderer().render_json({"point": Point()})
+
+    def test_render_json_unsupported_data(self):
+        with pytest.raises(TypeError):
+            JSONRenderer().render_json({"object": object()})
+
+    def test_render_json_without_library(self, data, monkeypatch):
+        monkeypatch.setattr(json_backends, "_json_backends", {})
+        monkeypatch.setitem(sys.modules, "orjson", None)
+
+        assert json_backends.get_json_backend() is None
+        assert JSONRenderer().render_json(data) == self.render_default(data)
+
+
+class CachedManyToManyTargetSerializer(serializers.ModelSerializer):
+    included_serializers = {"sources": "tests.serializers.ManyToManySourceSerializer"}
+
+    class Meta:
+        model = ManyToManyTarget
+        fields = ("name", "sources")
+        resource_cache = True
+
+
+class CachedManyToManySourceSerializer(serializers.ModelSerializer):
+    included_serializers = {"targets": CachedManyToManyTargetSerializer}
+
+    class Meta:
+        model = ManyToManySource
+        fields = ("name", "targets")
+        resource_cache = True
+
+
+class TestResourceCache:
+    @pytest.fixture(autouse=True)
+    def resource_cache(self, settings):
+        settings.JSON_API_RESOURCE_CACHE = "default"
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def build_json_resource_obj(self):
+        with mock.patch.object(
+            JSONRenderer,
+            "build_json_resource_obj",
+            wraps=JSONRenderer.build_json_resource_obj,
+        ) as build_json_resource_obj:
+            yield build_json_resource_obj
+
+    def render(self, rf, serializer_class, instances, url="/"):
+        request = Request(rf.get(url))
+        serializer = serializer_class(
+            instances, many=True, context={"request": request}
+        )
+        return JSONRenderer.build_json_resource_objs(
+            serializer,
+            serializer.data,
+            get_resource_type_from_serializer(serializer_class),
+            [],
+            IncludedCache(),
+        )
+
+    def render_view(self, rf, pk=None):
+        class ViewSet(ReadOnlyModelViewSet):
+            serializer_class = CachedManyToManyTargetSerializer
+            queryset = ManyToManyTarget.objects.order_by("pk")
+            resource_name = "ManyToManyTarget"
+
+        if pk is None:
+            view = ViewSet.as_view({"get": "list"})
+            response = view(rf.get("/", {"page[size]": 10}))
+        else:
+            view = ViewSet.as_view({"get": "retrieve"})
+            response = view(rf.get("/"), pk=pk)
+        return json.loads(response.render().content)
+
+    @pytest.mark.parametrize("single", [False, True])
+    def test_primary_data_not_serialized_when_cached(
+        self, rf, many_to_many_targets, single
+    ):
+        pk = many_to_many_targets[0].pk if single else None
+        rendered = self.render_view(rf, pk)
+
+        with mock.patch.object(
+            ResourceObjectMixin,
+            "to_representation",
+            side_effect=AssertionError("serialized"),
+        ):
+            assert self.render_view(rf, pk) == rendered
+
+    def test_not_cached_with_token_created_after_request_started(
+        self, rf, many_to_many_targets
+    ):
+        request = Request(rf.get("/"))
+        resources = [
+            (CachedManyToManyTargetSerializer, "ManyToManyTarget", target)
+            for target in many_to_many_targets
+        ]
+        resource_cache = get_resource_cache()
+        resource_cache.get_keys(resources[:1], request)
+
+        # e.g. a save reset the token of the second target after it was read
+        request._request.META[REQUEST_STARTED_KEY] = time.time()
+        keys = resource_cache.get_keys(resources, request)
+
+        assert keys[0] is not None
+        assert keys[1] is None
+
+    def test_resource_objs_cached(
+        self, rf, many_to_many_targets, build_json_resource_obj
+    ):
+        rendered = self.render(
+            rf, CachedManyToManyTargetSerializer, many_to_many_targets
+        )
+        assert build_json_resource_obj.call_count == 2
+
+        assert (
+            self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+            == rendered
+        )
+        assert build_json_resource_obj.call_count == 2
+
+    def test_resource_objs_not_cached_without_setting(
+        self, rf, settings, many_to_many_targets, build_json_resource_obj
+    ):
+        settings.JSON_API_RESOURCE_CACHE = None
+
+        self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+        self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+
+        assert build_json_resource_obj.call_count == 4
+
+    def test_resource_objs_not_cached_without_opt_in(
+        self, rf, many_to_many_targets, build_json_resource_obj
+    ):
+        self.render(rf, ManyToManyTargetSerializer, many_to_many_targets)
+        self.render(rf, ManyToManyTargetSerializer, many_to_many_targets)
+
+        assert build_json_resource_obj.call_count == 4
+
+    def test_resource_objs_cached_per_sparse_fieldset(
+        self, rf, many_to_many_targets, build_json_resource_obj
+    ):
+        self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+
+        rendered = self.render(
+            rf,
+            CachedManyToManyTargetSerializer,
+            many_to_many_targets,
+            "/?fields[ManyToManyTarget]=name",
+        )
+
+        assert build_json_resource_obj.call_count == 4
+        assert "relationships" not in rendered[0]
+
+    def test_resource_obj_invalidated_on_save(self, rf, many_to_many_targets):
+        self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+
+        many_to_many_targets[0].name = "Changed"
+        many_to_many_targets[0].save()
+
+        rendered = self.render(
+            rf, CachedManyToManyTargetSerializer, many_to_many_targets
+        )
+        assert [obj["attributes"]["name"] for obj in rendered] == [
+            "Changed",
+            "Target2",
+        ]
+
+    def test_resource_obj_invalidated_on_many_to_many_change(
+        self, rf, many_to_many_source, many_to_many_targets
+    ):
+        self.render(rf, CachedManyToManySourceSerializer, [many_to_many_source])
+        self.render(rf, CachedManyToManyTargetSerializer, many_to_many_targets)
+
+        many_to_many_source.targets.remove(many_to_many_targets[0])
+
+        (source,) = self.render(
+            rf, CachedManyToManySourceSerializer, [many_to_many_source]
+        )
+        assert source["relationships"]["targets"]["data"] == [
+            {"type": "ManyToManyTarget", "id": str(many_to_many_targets[1].pk)}
+        ]
+        rendered = self.render(
+            rf, CachedManyToManyTargetSerializer, many_to_many_targets
+        )
+        assert [
+            obj["relationships"]["sources"]["meta"]["count"] for obj in rendered
+        ] == [0, 1]
+
+    def test_resource_objs_invalidated_on_clear(
+        self, rf, many_to_many_sources, many_to_many_targets
+    ):
+        self.render(rf, CachedManyToManySourceSerializer, many_to_many_sources)
+
+        many_to_many_targets[0].sources.clear()
+
+        rendered = self.render(
+            rf, CachedManyToManySourceSerializer, many_to_many_sources
+        )
+        assert [
+            obj["relationships"]["targets"]["meta"]["count"] for obj in rendered
+        ] == [1, 1]
+
+    def test_included_resource_objs_cached(
+        self, rf, many_to_many_source, many_to_many_targets
+    ):
+        context = {"request": Request(rf.get("/"))}
+        included_cache = IncludedCache()
+        included_cache.add(
+            CachedManyToManyTargetSerializer, context, many_to_many_targets, []
+        )
+        JSONRenderer.serialize_included(included_cache)
+
+        with mock.patch.object(
+            CachedManyToManyTargetSerializer, "to_representation"
+        ) as to_representation:
+            cached_included_cache = IncludedCache()
+            cached_included_cache.add(
+                CachedManyToManyTargetSerializer, context, many_to_many_targets, []
+            )
+            JSONRenderer.serialize_included(cached_included_cache)
+
+        assert not to_representation.called
+        assert cached_included_cache == included_cache
+
+    def test_included_resource_obj_from_cache_resolves_includes(
+        self, rf, many_to_many_source, many_to_many_targets
+    ):
+        context = {"request": Request(rf.get("/"))}
+        included_cache = IncludedCache()
+        included_cache.add(
+            CachedManyToManyTargetSerializer, context, many_to_many_targets, []
+        )
+        JSONRenderer.serialize_included(included_cache)
+
+        included_cache = IncludedCache()
+        included_cache.add(
+            CachedManyToManyTargetSerializer, context, many_to_many_targets, []
+        )
+        JSONRenderer.serialize_included(included_cache)
+        included_cache.add(
+            CachedManyToManyTargetSerializer, context, many_to_many_targets, ["sources"]
+        )
+        JSONRenderer.serialize_included(included_cache)
+
+        assert list(included_cache["ManyToManySource"]) == [str(many_to_many_source.pk)]
+
+    def test_reverse_relationship_invalidated_on_save(self, rf, foreign_key_source):
+        class CachedForeignKeyTargetSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = foreign_key_source.target.__class__
+                fields = ("name", "sources")
+                resource_cache = True
+
+        target = foreign_key_source.target
+        self.render(rf, CachedForeignKeyTargetSerializer, [target])
+
+        ForeignKeySource.objects.create(name="Source2", target=target)
+
+        (rendered,) = self.render(rf, CachedForeignKeyTargetSerializer, [target])
+        assert rendered["relationships"]["sources"]["meta"]["count"] == 2
+
+    def test_old_foreign_key_target_invalidated_on_save(self, rf, foreign_key_source):
+        class CachedForeignKeyTargetSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = foreign_key_source.target.__class__
+                fields = ("name", "sources")
+                resource_cache = True
+
+        target = foreign_key_source.target
+        self.render(rf, CachedForeignKeyTargetSerializer, [target])
+
+        foreign_key_source.target = ForeignKeyTarget.objects.create(name="Target2")
+        foreign_key_source.save()
+
+        (rendered,) = self.render(rf, CachedForeignKeyTargetSerializer, [target])
+        assert rendered["relationships"]["sources"]["meta"]["count"] == 0
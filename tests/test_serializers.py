@@ -1,9 +1,14 @@
+import gc
+import weakref
+
 import pytest
 from django.db import models
+from rest_framework.exceptions import ParseError
 from rest_framework.request import Request
 from rest_framework.utils import model_meta
 
 from rest_framework_json_api import serializers
+from rest_framework_json_api.apps import warm_up
 from tests.models import DJAModel, ManyToManyTarget
 from tests.serializers import ManyToManyTargetSerializer
 
@@ -104,3 +109,118 @@ def test_readable_fields_with_sparse_fields(client, rf, settings):
         "value",
         "multi_part_name",
     ]
+
+
+class IncludeGraphTargetSerializer(serializers.Serializer):
+    included_serializers = {"source": "tests.test_serializers.IncludeGraphSerializer"}
+
+
+class IncludeGraphSerializer(serializers.Serializer):
+    included_serializers = {
+        "target": ManyToManyTargetSerializer,
+        "cyclic": IncludeGraphTargetSerializer,
+    }
+
+
+class TestIncludeGraph:
+    def test_edges(self):
+        include_graph = serializers.IncludeGraph(IncludeGraphSerializer)
+
+        assert include_graph.edges == (
+            {"target": 1, "cyclic": 2},
+            None,
+            {"source": 0},
+        )
+
+    @pytest.mark.parametrize(
+        "path,error",
+        [
+            ("target", None),
+            ("cyclic.source.cyclic.source.target", None),
+            (
+                "unknown",
+                "This endpoint does not support the include parameter for path unknown",
+            ),
+            (
+                "target.sources",
+                "This endpoint does not support the include parameter",
+            ),
+        ],
+    )
+    def test_validate(self, path, error):
+        include_graph = serializers.IncludeGraph(IncludeGraphSerializer)
+
+        if error is None:
+            include_graph.validate(path)
+        else:
+            with pytest.raises(ParseError, match=error):
+                include_graph.validate(path)
+        assert include_graph.paths == {path: error}
+
+    def test_compiled_once(self):
+        assert serializers.get_include_graph(
+            IncludeGraphSerializer
+        ) is serializers.get_include_graph(IncludeGraphSerializer)
+
+    def test_does_not_keep_serializer_class_alive(self):
+        class CyclicSerializer(serializers.Serializer):
+            included_serializers = {
+                "cyclic": "tests.test_serializers.IncludeGraphSerializer"
+            }
+
+        serializers.get_include_graph(CyclicSerializer)
+        serializer_class = weakref.ref(CyclicSerializer)
+        del CyclicSerializer
+        gc.collect()
+
+        assert serializer_class() is None
+
+
+def test_warm_up():
+    class WarmUpSerializer(serializers.Serializer):
+        included_serializers = {
+            "target": "tests.serializers.ManyToManyTargetSerializer"
+        }
+
+    warm_up()
+
+    assert WarmUpSerializer.included_serializers.serializers == {
+        "target": ManyToManyTargetSerializer
+    }
+    assert WarmUpSerializer in serializers._include_graphs
+
+
+def test_reserved_field_names_checked_at_class_creation():
+    with pytest.raises(AssertionError, match="reserved field name"):
+
+        class ReservedFieldNamesSerializer(serializers.Serializer):
+            type = serializers.CharField()
+
+
+class TestFieldTemplate:
+    def test_fields_built_once(self, monkeypatch):
+        class FieldTemplateSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = ManyToManyTarget
+                fields = ("name",)
+                field_template = True
+
+        first = FieldTemplateSerializer().fields["name"]
+        monkeypatch.setattr(serializers.ModelSerializer, "build_field", None)
+        second = FieldTemplateSerializer().fields["name"]
+
+        assert first is not second
+        assert second.parent is not first.parent
+
+    def test_field_template_disabled_by_default(self):
+        class NoFieldTemplateSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = ManyToManyTarget
+                fields = ("name",)
+
+            def get_extra_kwargs(self):
+                return {"name": {"read_only": self.instance is not None}}
+
+        assert NoFieldTemplateSerializer(ManyToManyTarget()).fields["name"].read_only
+        assert not NoFieldTemplateSerializer(data={}).fields["name"].read_only
+        assert NoFieldTemplateSerializer not in serializers._field_templates
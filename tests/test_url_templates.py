@@ -0,0 +1,90 @@
+import pytest
+from django.urls import NoReverseMatch, include, path, re_path, set_script_prefix
+from rest_framework.request import Request
+from rest_framework.reverse import reverse as drf_reverse
+
+from rest_framework_json_api import url_templates
+from rest_framework_json_api.url_templates import reverse
+
+
+def view(request, *args, **kwargs):
+    pass  # pragma: no cover
+
+
+urlpatterns = [
+    path("numbers/<int:pk>/", view, name="number-detail"),
+    re_path(
+        r"^items/(?P<pk>[^/.]+)/(?P<related_field>[-\w]+)/$", view, name="item-related"
+    ),
+    path("texts/<str:pk>/", view, name="text-detail"),
+    path("defaults/<int:pk>/", view, {"format": "json"}, name="default-detail"),
+    path("namespaced/", include(([path("<int:pk>/", view, name="detail")], "ns"))),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_url_templates():
+    url_templates.clear_url_templates()
+    yield
+    url_templates.clear_url_templates()
+
+
+@pytest.mark.urls(__name__)
+class TestReverse:
+    @pytest.mark.parametrize(
+        "view_name,kwargs",
+        [
+            ("number-detail", {"pk": 1}),
+            ("item-related", {"pk": "a b", "related_field": "sub-items"}),
+            ("text-detail", {"pk": "ä?&#"}),
+            ("default-detail", {"pk": 1}),
+            ("ns:detail", {"pk": 1}),
+        ],
+    )
+    def test_same_as_drf_reverse(self, rf, view_name, kwargs):
+        request = Request(rf.get("/"))
+
+        assert reverse(view_name, kwargs=kwargs) == drf_reverse(
+            view_name, kwargs=kwargs
+        )
+        assert reverse(view_name, kwargs=kwargs, request=request) == drf_reverse(
+            view_name, kwargs=kwargs, request=request
+        )
+
+    def test_compiles_template_once(self):
+        reverse("number-detail", kwargs={"pk": 1})
+        reverse("number-detail", kwargs={"pk": 2})
+
+        assert list(url_templates._url_templates) == [
+            (__name__, "/", "en-us", "number-detail", ("pk",))
+        ]
+
+    def test_script_prefix(self):
+        set_script_prefix("/api/")
+        try:
+            url = reverse("number-detail", kwargs={"pk": 1})
+        finally:
+            set_script_prefix("/")
+
+        assert url == "/api/numbers/1/"
+
+    def test_preserves_format_query_param(self, rf):
+        request = Request(rf.get("/", {"format": "json"}))
+
+        url = reverse("number-detail", kwargs={"pk": 1}, request=request)
+
+        assert url == "http://testserver/numbers/1/?format=json"
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"pk": "not-a-number"}, {"pk": 1, "other": 2}, {}]
+    )
+    def test_no_match(self, kwargs):
+        with pytest.raises(NoReverseMatch):
+            reverse("number-detail", kwargs=kwargs)
+
+    def test_value_dependent_default(self):
+        assert reverse("default-detail", kwargs={"pk": 1, "format": "json"}) == (
+            "/defaults/1/"
+        )
+        with pytest.raises(NoReverseMatch):
+            reverse("default-detail", kwargs={"pk": 1, "format": "xml"})
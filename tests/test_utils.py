@@ -6,7 +6,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from rest_framework_json_api import serializers
+from rest_framework_json_api import serializers, utils
 from rest_framework_json_api.utils import (
     format_error_object,
     format_field_name,
@@ -18,6 +18,7 @@ from rest_framework_json_api.utils import (
     get_related_resource_type,
     get_resource_id,
     get_resource_name,
+    get_resource_type_from_model,
     get_resource_type_from_serializer,
     undo_format_field_name,
     undo_format_field_names,
@@ -286,6 +287,59 @@ def test_format_value(settings, format_type, output):
     assert format_value("first_name", format_type) == output
 
 
+class TestBoundedCache:
+    def test_evicts_oldest(self):
+        cache = utils.BoundedCache(2)
+
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 3
+        cache["c"] = 4
+
+        assert cache == {"b": 2, "c": 4}
+
+    def test_maxsize_changed(self):
+        cache = utils.BoundedCache(3)
+        cache.update(a=1, b=2, c=3)
+
+        cache.maxsize = 1
+        cache["d"] = 4
+
+        assert cache == {"d": 4}
+
+
+class TestFormattedValues:
+    @pytest.fixture(autouse=True)
+    def formatted_values(self):
+        utils.clear_formatted_values()
+        yield
+        utils.clear_formatted_values()
+
+    def test_memoized(self, monkeypatch):
+        format_value("first_name", "camelize")
+        monkeypatch.setattr(utils, "_format_value", None)
+
+        assert format_value("first_name", "camelize") == "firstName"
+
+    def test_bounded(self, monkeypatch):
+        monkeypatch.setattr(utils._formatted_values, "maxsize", 2)
+
+        for value in ("first_name", "last_name", "full_name"):
+            format_value(value, "camelize")
+
+        assert list(utils._formatted_values) == [
+            ("last_name", "camelize"),
+            ("full_name", "camelize"),
+        ]
+
+    def test_cleared_on_format_setting_change(self, settings):
+        format_value("first_name", "camelize")
+
+        settings.JSON_API_FORMAT_FIELD_NAMES = "camelize"
+
+        assert utils._formatted_values == {}
+
+
 @pytest.mark.parametrize(
     "resource_type,pluralize,output",
     [
@@ -395,6 +449,61 @@ def test_get_resource_type_from_serializer_without_resource_name_raises_error():
     )
 
 
+class TestResourceTypeRegistry:
+    def test_model_type_registered(self, monkeypatch):
+        get_resource_type_from_model(BasicModel)
+        monkeypatch.setattr(utils, "format_resource_type", None)
+
+        assert get_resource_type_from_model(BasicModel) == "BasicModel"
+
+    def test_cleared_on_setting_change(self, settings):
+        get_resource_type_from_model(BasicModel)
+
+        settings.JSON_API_FORMAT_TYPES = "dasherize"
+
+        assert get_resource_type_from_model(BasicModel) == "basic-model"
+
+    def test_related_type_registered_per_serializer_field(self):
+        class RelatedResourceTypeSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = ForeignKeySource
+                fields = ("target",)
+
+        get_related_resource_type(RelatedResourceTypeSerializer().fields["target"])
+
+        assert (
+            "relation",
+            RelatedResourceTypeSerializer,
+            "target",
+            serializers.ResourceRelatedField,
+            False,
+        ) in utils._resource_types
+
+    def test_registry_bounded(self, monkeypatch):
+        monkeypatch.setattr(utils._resource_types, "maxsize", 1)
+
+        serializer_classes = []
+        for _ in range(2):
+
+            class BoundedResourceTypeSerializer(serializers.ModelSerializer):
+                class Meta:
+                    model = BasicModel
+                    fields = ("text",)
+
+            get_resource_type_from_serializer(BoundedResourceTypeSerializer)
+            serializer_classes.append(BoundedResourceTypeSerializer)
+
+        assert list(utils._resource_types) == [("serializer", serializer_classes[1])]
+
+    def test_serializer_without_resource_name_not_registered(self):
+        class SerializerWithoutResourceName(serializers.Serializer):
+            something = Field()
+
+        for _ in range(2):
+            with pytest.raises(AttributeError):
+                get_resource_type_from_serializer(SerializerWithoutResourceName)
+
+
 @pytest.mark.parametrize(
     "resource_instance, resource, expected",
     [
@@ -1,19 +1,39 @@
+import json
+from unittest import mock
+
 import pytest
+from django.db.models import Count, Prefetch
 from django.urls import path, reverse
-from rest_framework import status
+from rest_framework import exceptions, status
 from rest_framework.decorators import action
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.routers import SimpleRouter
 from rest_framework.views import APIView
 
 from rest_framework_json_api import serializers
 from rest_framework_json_api.parsers import JSONParser
-from rest_framework_json_api.relations import ResourceRelatedField
+from rest_framework_json_api.relations import ResourceRelatedField, SkipDataMixin
 from rest_framework_json_api.renderers import JSONRenderer
 from rest_framework_json_api.utils import format_link_segment
 from rest_framework_json_api.views import ModelViewSet, ReadOnlyModelViewSet
-from tests.models import BasicModel, ForeignKeySource
-from tests.serializers import BasicModelSerializer, ForeignKeyTargetSerializer
+from tests.models import (
+    BasicModel,
+    ForeignKeySource,
+    ForeignKeyTarget,
+    ManyToManySource,
+    ManyToManyTarget,
+    NestedRelatedSource,
+)
+from tests.serializers import (
+    BasicModelSerializer,
+    ForeignKeySourceSerializer,
+    ForeignKeySourcetHyperlinkedSerializer,
+    ForeignKeyTargetSerializer,
+    ManyToManySourceSerializer,
+    ManyToManyTargetSerializer,
+    NestedRelatedSourceSerializer,
+)
 from tests.views import (
     BasicModelViewSet,
     ForeignKeySourcetHyperlinkedViewSet,
@@ -121,6 +141,30 @@ class TestModelViewSet:
             for target in many_to_many_targets
         ] == result["included"]
 
+    @pytest.mark.urls(__name__)
+    def test_list_with_include_serializes_included_resources_at_once(
+        self, client, many_to_many_sources, many_to_many_targets
+    ):
+        url = reverse("many-to-many-source-list")
+        with mock.patch.object(
+            ManyToManyTargetSerializer,
+            "__init__",
+            autospec=True,
+            side_effect=ManyToManyTargetSerializer.__init__,
+        ) as serializer_init:
+            response = client.get(url, data={"include": "targets"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert serializer_init.call_count == 1
+        assert [
+            {
+                "type": "ManyToManyTarget",
+                "id": str(target.pk),
+                "attributes": {"name": target.name},
+            }
+            for target in many_to_many_targets
+        ] == response.json()["included"]
+
     @pytest.mark.urls(__name__)
     def test_list_with_include_nested_related_field(
         self, client, nested_related_source, many_to_many_sources, many_to_many_targets
@@ -157,6 +201,35 @@ class TestModelViewSet:
             "included"
         ]
 
+    @pytest.mark.urls(__name__)
+    def test_list_with_include_serializes_included_resource_once(
+        self, client, nested_related_source, many_to_many_targets
+    ):
+        url = reverse("nested-related-source-list")
+        with mock.patch.object(
+            ManyToManyTargetSerializer,
+            "__init__",
+            autospec=True,
+            side_effect=ManyToManyTargetSerializer.__init__,
+        ) as serializer_init:
+            response = client.get(
+                url, data={"include": "m2m_targets,m2m_sources.targets"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert serializer_init.call_count == 1
+        included = response.json()["included"]
+        assert [
+            {
+                "type": "ManyToManyTarget",
+                "id": str(target.pk),
+                "attributes": {"name": target.name},
+            }
+            for target in many_to_many_targets
+        ] == [
+            resource for resource in included if resource["type"] == "ManyToManyTarget"
+        ]
+
     @pytest.mark.urls(__name__)
     def test_list_with_invalid_include(self, client, foreign_key_source):
         url = reverse("foreignkeysource-list")
@@ -378,6 +451,720 @@ class TestReadonlyModelViewSet:
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
 
+class TestStreamingListMixin:
+    @pytest.fixture
+    def foreign_key_sources(self, foreign_key_source, foreign_key_target):
+        return [
+            foreign_key_source,
+            ForeignKeySource.objects.create(name="Other", target=foreign_key_target),
+        ]
+
+    @pytest.mark.urls(__name__)
+    @pytest.mark.parametrize(
+        "basename",
+        [
+            "streaming-foreign-key-source",
+            "streaming-non-paginated-foreign-key-source",
+        ],
+    )
+    def test_list(self, client, foreign_key_sources, basename):
+        query = {"include": "target", "sort": "name", "page[size]": 10}
+        expected = client.get(reverse("foreignkeysource-list"), data=query).json()
+        expected_links = expected.pop("links")
+        if basename == "streaming-non-paginated-foreign-key-source":
+            expected_links = None
+            del expected["meta"]
+
+        response = client.get(reverse(f"{basename}-list"), data=query)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/vnd.api+json"
+        result = json.loads(b"".join(response.streaming_content))
+        links = result.pop("links", None)
+        assert result == expected
+        assert (links and links.keys()) == (expected_links and expected_links.keys())
+        assert len(expected["data"]) == 2
+        assert len(expected["included"]) == 1
+
+    @pytest.mark.urls(__name__)
+    def test_list_empty(self, client, db):
+        url = reverse("streaming-non-paginated-foreign-key-source-list")
+
+        response = client.get(url, data={"include": "target"})
+
+        assert json.loads(b"".join(response.streaming_content)) == {
+            "data": [],
+            "included": [],
+        }
+
+    @pytest.mark.urls(__name__)
+    def test_list_with_invalid_include(self, client, foreign_key_source):
+        url = reverse("streaming-foreign-key-source-list")
+
+        response = client.get(url, data={"include": "invalid"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not response.streaming
+
+    @pytest.mark.urls(__name__)
+    def test_list_with_error_in_first_chunk(self, client, foreign_key_source):
+        url = reverse("streaming-failing-foreign-key-source-list")
+
+        response = client.get(url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not response.streaming
+        assert response.json()["errors"][0]["code"] == "permission_denied"
+
+    @pytest.mark.urls(__name__)
+    @pytest.mark.parametrize(
+        "accept,content_type",
+        [
+            ("application/vnd.api+json; indent=2", "application/vnd.api+json"),
+            (
+                f'application/vnd.api+json; profile="{JSONRenderer.link_templates_profile}"',
+                f'application/vnd.api+json; profile="{JSONRenderer.link_templates_profile}"',
+            ),
+        ],
+    )
+    def test_list_content_type(self, client, foreign_key_source, accept, content_type):
+        url = reverse("streaming-foreign-key-source-list")
+        expected = client.get(reverse("foreignkeysource-list"), HTTP_ACCEPT=accept)
+
+        response = client.get(url, HTTP_ACCEPT=accept)
+
+        assert response.streaming
+        assert response["Content-Type"] == expected["Content-Type"] == content_type
+
+    @pytest.mark.urls(__name__)
+    def test_list_with_other_renderer(self, client, foreign_key_source):
+        url = reverse("streaming-foreign-key-source-list")
+
+        response = client.get(url, HTTP_ACCEPT="text/html")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.streaming
+
+
+def get_list_queryset(rf, viewset_class, query, method="get"):
+    view = viewset_class(action="list", format_kwarg=None, kwargs={})
+    view.request = Request(getattr(rf, method)("/", query))
+    return view.get_queryset()
+
+
+class ForeignKeyTargetSourcesSerializer(serializers.ModelSerializer):
+    included_serializers = {"sources": ForeignKeySourceSerializer}
+
+    sources = ResourceRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = ForeignKeyTarget
+        fields = ("name", "sources")
+
+
+class ForeignKeyTargetSourcesViewSet(ForeignKeyTargetViewSet):
+    serializer_class = ForeignKeyTargetSourcesSerializer
+
+
+class TestAutoPrefetchMixin:
+    def test_joins_to_one_include(self, rf):
+        qs = get_list_queryset(rf, ForeignKeySourceViewSet, {"include": "target"})
+
+        assert qs.query.select_related == {"target": {}}
+        assert qs._prefetch_related_lookups == ()
+
+    def test_prefetches_to_many_include(self, rf):
+        qs = get_list_queryset(rf, ManyToManySourceViewSet, {"include": "targets"})
+
+        assert qs.query.select_related is False
+        assert qs._prefetch_related_lookups == ("targets",)
+
+    def test_joins_to_one_include_in_prefetch(self, rf):
+        qs = get_list_queryset(
+            rf, ForeignKeyTargetSourcesViewSet, {"include": "sources.target"}
+        )
+
+        (prefetch,) = qs._prefetch_related_lookups
+        assert prefetch.prefetch_to == "sources"
+        assert prefetch.queryset.model is ForeignKeySource
+        assert prefetch.queryset.query.select_related == {"target": {}}
+
+    def test_prefetches_to_many_include_through_join(self, rf):
+        class TargetSourcesSerializer(NestedRelatedSourceSerializer):
+            included_serializers = {"fk_target": ForeignKeyTargetSourcesSerializer}
+
+            class Meta(NestedRelatedSourceSerializer.Meta):
+                fields = ("fk_target",)
+
+        class TargetSourcesViewSet(NestedRelatedSourceViewSet):
+            serializer_class = TargetSourcesSerializer
+
+        qs = get_list_queryset(
+            rf, TargetSourcesViewSet, {"include": "fk_target.sources"}
+        )
+
+        assert qs.query.select_related == {"fk_target": {}}
+        assert qs._prefetch_related_lookups == ("fk_target__sources",)
+
+    def test_keeps_prefetch_with_custom_queryset(self, rf):
+        class PrefetchViewSet(ForeignKeySourceViewSet):
+            prefetch_for_includes = {
+                "target": [Prefetch("target", queryset=ForeignKeyTarget.objects.all())]
+            }
+
+        qs = get_list_queryset(rf, PrefetchViewSet, {"include": "target"})
+
+        assert qs.query.select_related is False
+        (prefetch,) = qs._prefetch_related_lookups
+        assert prefetch.prefetch_to == "target"
+        assert prefetch.queryset is not None
+
+    def test_caches_plan(self):
+        view = NestedRelatedSourceViewSet()
+        includes = ("fk_source.target", "m2m_sources")
+
+        plan = view.get_prefetch_plan(NestedRelatedSource, includes)
+
+        assert plan == (
+            ("fk_source", "fk_source__target"),
+            (("m2m_sources", "_default_manager", ManyToManySource, ()),),
+        )
+        assert view.get_prefetch_plan(NestedRelatedSource, includes) is plan
+
+    @pytest.mark.urls(__name__)
+    def test_list(self, client, foreign_key_source):
+        response = client.get(
+            reverse("foreign-key-target-sources-list"),
+            data={"include": "sources.target"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["included"][0]["relationships"]["target"]["data"] == {
+            "type": "ForeignKeyTarget",
+            "id": str(foreign_key_source.target.pk),
+        }
+
+
+class PKsOnlyManyToManySourceViewSet(ManyToManySourceViewSet):
+    prefetch_linkage_pks_only = True
+
+
+class PKsOnlyForeignKeyTargetSourcesViewSet(ForeignKeyTargetSourcesViewSet):
+    prefetch_linkage_pks_only = True
+
+
+class TestLinkagePrefetch:
+    def test_prefetches_many_to_many(self, rf):
+        qs = get_list_queryset(rf, ManyToManySourceViewSet, {})
+
+        assert qs._prefetch_related_lookups == ("targets",)
+
+    def test_prefetches_primary_keys_of_many_to_many(self, rf):
+        qs = get_list_queryset(rf, PKsOnlyManyToManySourceViewSet, {})
+
+        (prefetch,) = qs._prefetch_related_lookups
+        assert prefetch.prefetch_to == "targets"
+        assert prefetch.queryset.query.deferred_loading == ({"id"}, False)
+
+    def test_prefetches_primary_keys_of_reverse_foreign_key(self, rf):
+        qs = get_list_queryset(rf, PKsOnlyForeignKeyTargetSourcesViewSet, {})
+
+        (prefetch,) = qs._prefetch_related_lookups
+        assert prefetch.prefetch_to == "sources"
+        assert prefetch.queryset.query.deferred_loading == ({"id", "target"}, False)
+
+    def test_prefetches_complete_instances_of_same_source(self, rf):
+        class Serializer(ManyToManySourceSerializer):
+            target_ids = serializers.PrimaryKeyRelatedField(
+                source="targets", many=True, read_only=True
+            )
+
+            class Meta(ManyToManySourceSerializer.Meta):
+                fields = ("targets", "target_ids")
+
+        class ViewSet(PKsOnlyManyToManySourceViewSet):
+            serializer_class = Serializer
+
+        qs = get_list_queryset(rf, ViewSet, {})
+
+        assert qs._prefetch_related_lookups == ("targets",)
+
+    def test_skips_excluded_by_sparse_fieldset(self, rf):
+        qs = get_list_queryset(
+            rf, ManyToManySourceViewSet, {"fields[ManyToManySource]": "name"}
+        )
+
+        assert qs._prefetch_related_lookups == ()
+
+    def test_reuses_plan(self, rf):
+        contexts = []
+
+        class ViewSet(ManyToManySourceViewSet):
+            def get_serializer_context(self):
+                contexts.append(super().get_serializer_context())
+                return contexts[-1]
+
+        for _ in range(2):
+            qs = get_list_queryset(rf, ViewSet, {})
+            assert qs._prefetch_related_lookups == ("targets",)
+        assert len(contexts) == 1
+
+        qs = get_list_queryset(rf, ViewSet, {"fields[ManyToManySource]": "name"})
+        assert qs._prefetch_related_lookups == ()
+
+    def test_skips_unsafe_method(self, rf):
+        qs = get_list_queryset(rf, ManyToManySourceViewSet, {}, method="patch")
+
+        assert qs._prefetch_related_lookups == ()
+
+    @pytest.mark.urls(__name__)
+    def test_list(self, client, many_to_many_source, django_assert_num_queries):
+        ManyToManySource.objects.create(name="Other").targets.add(
+            *many_to_many_source.targets.all()
+        )
+
+        with django_assert_num_queries(3):
+            response = client.get(
+                reverse("many-to-many-source-list"), data={"page[size]": 2}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert [
+            resource["relationships"]["targets"] for resource in result["data"]
+        ] == [
+            {
+                "data": [
+                    {"type": "ManyToManyTarget", "id": str(target.pk)}
+                    for target in many_to_many_source.targets.all()
+                ],
+                "meta": {"count": 2},
+            }
+        ] * 2
+
+
+class IncludedLinkageSourceSerializer(ManyToManySourceSerializer):
+    class Meta(ManyToManySourceSerializer.Meta):
+        relationship_counts = {"targets": "targets_count"}
+
+    class JSONAPIMeta:
+        linkage_requires_include = "__all__"
+
+
+class IncludedLinkageSourceViewSet(ManyToManySourceViewSet):
+    serializer_class = IncludedLinkageSourceSerializer
+    queryset = ManyToManySource.objects.annotate(targets_count=Count("targets"))
+
+
+class TestIncludedLinkage:
+    @pytest.mark.urls(__name__)
+    def test_list_without_include(
+        self, client, many_to_many_source, django_assert_num_queries
+    ):
+        ManyToManySource.objects.create(name="Other")
+
+        # count and page, related instances are not queried
+        with django_assert_num_queries(2):
+            response = client.get(
+                reverse("included-linkage-source-list"), data={"page[size]": 2}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            resource["relationships"]["targets"] for resource in response.json()["data"]
+        ] == [{"meta": {"count": 0}}, {"meta": {"count": 2}}]
+
+    @pytest.mark.urls(__name__)
+    def test_list_with_include(self, client, many_to_many_source):
+        response = client.get(
+            reverse("included-linkage-source-list"), data={"include": "targets"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["data"][0]["relationships"]["targets"] == {
+            "data": [
+                {"type": "ManyToManyTarget", "id": str(target.pk)}
+                for target in many_to_many_source.targets.all()
+            ],
+            "meta": {"count": 2},
+        }
+        assert len(result["included"]) == 2
+
+    def test_linkage_of_listed_fields_only(self, rf):
+        class Serializer(IncludedLinkageSourceSerializer):
+            class JSONAPIMeta:
+                linkage_requires_include = ("other",)
+
+        request = Request(rf.get("/"))
+        fields = Serializer(context={"request": request}).fields
+
+        assert not isinstance(fields["targets"], SkipDataMixin)
+
+
+class TestDeferSparseFieldsMixin:
+    def test_defers_fields_not_in_sparse_fieldset(self, rf):
+        qs = get_list_queryset(
+            rf, ForeignKeySourceViewSet, {"fields[ForeignKeySource]": "target"}
+        )
+
+        assert qs.query.deferred_loading == ({"name"}, True)
+
+    def test_keeps_fields_of_includes(self, rf):
+        qs = get_list_queryset(
+            rf,
+            ForeignKeySourceViewSet,
+            {"fields[ForeignKeySource]": "name", "include": "target"},
+        )
+
+        assert qs.query.deferred_loading == (frozenset(), True)
+
+    def test_keeps_fields_on_unsafe_method(self, rf):
+        qs = get_list_queryset(
+            rf,
+            ForeignKeySourceViewSet,
+            {"fields[ForeignKeySource]": "target"},
+            method="patch",
+        )
+
+        assert qs.query.deferred_loading == (frozenset(), True)
+
+    def test_keeps_fields_with_unknown_source(self, rf):
+        class MethodFieldSerializer(ForeignKeySourceSerializer):
+            target_name = serializers.SerializerMethodField()
+
+            def get_target_name(self, obj):
+                return obj.target.name
+
+            class Meta(ForeignKeySourceSerializer.Meta):
+                fields = ("name", "target", "target_name")
+
+        class MethodFieldViewSet(ForeignKeySourceViewSet):
+            serializer_class = MethodFieldSerializer
+
+        qs = get_list_queryset(
+            rf,
+            MethodFieldViewSet,
+            {"fields[ForeignKeySource]": "target_name"},
+        )
+
+        assert qs.query.deferred_loading == (frozenset(), True)
+
+    def test_defers_fields_of_included_resources(self, rf):
+        qs = get_list_queryset(
+            rf,
+            NestedRelatedSourceViewSet,
+            {
+                "include": "fk_source.target,m2m_sources",
+                "fields[ForeignKeySource]": "target",
+                "fields[ForeignKeyTarget]": "name",
+            },
+        )
+
+        assert qs.query.select_related == {"fk_source": {"target": {}}}
+        assert qs.query.deferred_loading == ({"fk_source__name"}, True)
+        assert [
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in qs._prefetch_related_lookups
+        ] == ["m2m_sources", "m2m_targets"]
+
+    def test_defers_fields_of_prefetched_resources(self, rf):
+        qs = get_list_queryset(
+            rf,
+            ForeignKeyTargetSourcesViewSet,
+            {
+                "include": "sources.target",
+                "fields[ForeignKeySource]": "target",
+                "fields[ForeignKeyTarget]": "sources",
+            },
+        )
+
+        (prefetch,) = qs._prefetch_related_lookups
+        assert prefetch.prefetch_to == "sources"
+        assert prefetch.queryset.query.select_related == {"target": {}}
+        assert prefetch.queryset.query.deferred_loading == (
+            {"name", "target__name"},
+            True,
+        )
+
+    @pytest.mark.urls(__name__)
+    def test_list(self, client, nested_related_source):
+        query = {
+            "include": "fk_source.target,m2m_sources",
+            "fields[ForeignKeySource]": "target",
+            "fields[ManyToManySource]": "targets",
+            "fields[NestedRelatedSource]": "fk_source,m2m_sources",
+        }
+        response = client.get(reverse("nested-related-source-list"), data=query)
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["data"][0]["relationships"]["fk_source"]["data"] == {
+            "type": "ForeignKeySource",
+            "id": str(nested_related_source.fk_source.pk),
+        }
+        assert [
+            (included["type"], included.get("attributes"))
+            for included in result["included"]
+        ] == [
+            ("ForeignKeySource", None),
+            ("ForeignKeyTarget", {"name": "Target"}),
+            ("ManyToManySource", None),
+            ("ManyToManySource", None),
+        ]
+
+
+class TestPreloadIncludesMixin:
+    def test_applies_parent_keys_to_nested_include(self, rf):
+        class PreloadViewSet(NestedRelatedSourceViewSet):
+            select_for_includes = {"fk_source": ["fk_source__target"]}
+
+        qs = get_list_queryset(rf, PreloadViewSet, {"include": "fk_source.target"})
+
+        assert qs.query.select_related == {"fk_source": {"target": {}}}
+
+    def test_applies_wildcard_keys(self, rf):
+        class PreloadViewSet(NestedRelatedSourceViewSet):
+            prefetch_for_includes = {"m2m_*": ["m2m_targets__sources"]}
+
+        qs = get_list_queryset(rf, PreloadViewSet, {"include": "m2m_sources"})
+
+        assert qs._prefetch_related_lookups == (
+            "m2m_sources",
+            "m2m_targets__sources",
+        )
+
+    def test_merges_lookups(self, rf):
+        targets = Prefetch("m2m_targets", queryset=ManyToManyTarget.objects.all())
+
+        class PreloadViewSet(NestedRelatedSourceViewSet):
+            prefetch_for_includes = {
+                "__all__": ["m2m_targets__sources", "m2m_targets"],
+                "m2m_targets": [targets, "m2m_targets__sources"],
+            }
+
+        qs = get_list_queryset(rf, PreloadViewSet, {"include": "m2m_targets"})
+
+        lookups = qs._prefetch_related_lookups
+        assert lookups[0] is targets
+        assert [getattr(lookup, "prefetch_to", lookup) for lookup in lookups] == [
+            "m2m_targets",
+            "m2m_sources",
+            "m2m_targets__sources",
+        ]
+
+
+class PreloadingForeignKeySourceSerializer(ForeignKeySourceSerializer):
+    class JSONAPIMeta:
+        select_for_includes = {"target": ["target"]}
+        prefetch_for_includes = {
+            "__all__": [Prefetch("target__sources", to_attr="target_sources")]
+        }
+
+
+class PreloadingNestedRelatedSourceSerializer(NestedRelatedSourceSerializer):
+    included_serializers = {
+        **NestedRelatedSourceSerializer.included_serializers,
+        "fk_source": PreloadingForeignKeySourceSerializer,
+    }
+
+    class JSONAPIMeta:
+        prefetch_for_includes = {"m2m_sources": ["m2m_sources__targets"]}
+
+
+class PreloadingForeignKeyTargetSerializer(ForeignKeyTargetSourcesSerializer):
+    included_serializers = {"sources": PreloadingForeignKeySourceSerializer}
+
+
+class PreloadingNestedRelatedSourceViewSet(NestedRelatedSourceViewSet):
+    serializer_class = PreloadingNestedRelatedSourceSerializer
+
+
+class PreloadingForeignKeyTargetViewSet(ForeignKeyTargetViewSet):
+    serializer_class = PreloadingForeignKeyTargetSerializer
+
+
+class TestSerializerPreloadLookups:
+    def test_applies_lookups_of_included_serializers(self, rf):
+        qs = get_list_queryset(
+            rf,
+            PreloadingNestedRelatedSourceViewSet,
+            {"include": "fk_source.target,m2m_sources"},
+        )
+
+        assert qs.query.select_related == {"fk_source": {"target": {}}}
+        lookups = [
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in qs._prefetch_related_lookups
+        ]
+        assert lookups == [
+            "m2m_sources",
+            "m2m_targets",
+            "m2m_sources__targets",
+            "fk_source__target__target_sources",
+        ]
+
+    def test_prefetches_lookups_to_select_of_prefetched_serializers(self, rf):
+        qs = get_list_queryset(
+            rf,
+            PreloadingForeignKeyTargetViewSet,
+            {"include": "sources.target"},
+        )
+
+        assert qs.query.select_related is False
+        lookups = [
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in qs._prefetch_related_lookups
+        ]
+        assert lookups == [
+            "sources",
+            "sources__target",
+            "sources__target__target_sources",
+        ]
+
+    def test_skips_lookups_of_relations_missing_in_sparse_fieldset(self, rf):
+        qs = get_list_queryset(
+            rf,
+            PreloadingNestedRelatedSourceViewSet,
+            {
+                "include": "fk_source.target,m2m_sources",
+                "fields[NestedRelatedSource]": "fk_source",
+            },
+        )
+
+        lookups = [
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in qs._prefetch_related_lookups
+        ]
+        assert "m2m_sources__targets" not in lookups
+        assert "fk_source__target__target_sources" in lookups
+
+    def test_skips_lookups_missing_in_sparse_fieldset_of_included_type(self, rf):
+        qs = get_list_queryset(
+            rf,
+            PreloadingNestedRelatedSourceViewSet,
+            {"include": "fk_source", "fields[ForeignKeySource]": "name"},
+        )
+
+        lookups = [
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in qs._prefetch_related_lookups
+        ]
+        assert "fk_source__target__target_sources" not in lookups
+
+
+class TestPreloadIncludesSparseFieldsets:
+    class PreloadViewSet(NestedRelatedSourceViewSet):
+        select_for_includes = {"__all__": ["fk_source", "fk_target"]}
+        prefetch_for_includes = {"__all__": ["m2m_sources", "m2m_targets__sources"]}
+
+    def test_preloads_all_without_sparse_fieldset(self, rf):
+        qs = get_list_queryset(rf, self.PreloadViewSet, {})
+
+        assert qs.query.select_related == {"fk_source": {}, "fk_target": {}}
+        assert qs._prefetch_related_lookups == ("m2m_sources", "m2m_targets__sources")
+
+    def test_skips_relations_excluded_by_sparse_fieldset(self, rf):
+        qs = get_list_queryset(
+            rf, self.PreloadViewSet, {"fields[NestedRelatedSource]": "fk_target"}
+        )
+
+        assert qs.query.select_related == {"fk_target": {}}
+        assert qs._prefetch_related_lookups == ()
+
+    def test_keeps_included_relations(self, rf):
+        qs = get_list_queryset(
+            rf,
+            self.PreloadViewSet,
+            {
+                "fields[NestedRelatedSource]": "fk_target",
+                "include": "m2m_targets",
+            },
+        )
+
+        assert qs.query.select_related == {"fk_target": {}}
+        assert qs._prefetch_related_lookups == ("m2m_targets", "m2m_targets__sources")
+
+
+class TestResourceObjectRepresentation:
+    @pytest.fixture
+    def represent_as_resource_object(self, monkeypatch):
+        def represent_as_resource_object():
+            for serializer_class in (
+                ForeignKeySourceSerializer,
+                ForeignKeySourcetHyperlinkedSerializer,
+                ForeignKeyTargetSerializer,
+                ManyToManySourceSerializer,
+                ManyToManyTargetSerializer,
+                NestedRelatedSourceSerializer,
+            ):
+                monkeypatch.setattr(
+                    serializer_class.Meta,
+                    "represent_as_resource_object",
+                    True,
+                    raising=False,
+                )
+
+        return represent_as_resource_object
+
+    @pytest.mark.urls(__name__)
+    @pytest.mark.parametrize(
+        "url,query",
+        [
+            ("foreignkeysource-list", {"include": "target"}),
+            ("foreignkeysource-list", {"fields[ForeignKeySource]": "name"}),
+            ("foreignkeysourcehyperlinked-list", {}),
+            ("many-to-many-source-list", {"include": "targets"}),
+            (
+                "nested-related-source-list",
+                {"include": "fk_source.target,m2m_sources.targets,m2m_targets"},
+            ),
+        ],
+    )
+    def test_list(
+        self, client, nested_related_source, represent_as_resource_object, url, query
+    ):
+        expected = client.get(reverse(url), data=query)
+
+        represent_as_resource_object()
+        response = client.get(reverse(url), data=query)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    @pytest.mark.urls(__name__)
+    def test_retrieve(self, client, foreign_key_source, represent_as_resource_object):
+        url = reverse("foreignkeysource-detail", kwargs={"pk": foreign_key_source.pk})
+        expected = client.get(url, data={"include": "target"})
+
+        represent_as_resource_object()
+        response = client.get(url, data={"include": "target"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    def test_to_representation(self, foreign_key_source, represent_as_resource_object):
+        represent_as_resource_object()
+
+        data = ForeignKeySourceSerializer(foreign_key_source).data
+
+        assert data == {
+            "type": "ForeignKeySource",
+            "id": str(foreign_key_source.pk),
+            "attributes": {"name": foreign_key_source.name},
+            "relationships": {
+                "target": {
+                    "data": {
+                        "type": "ForeignKeyTarget",
+                        "id": str(foreign_key_source.target.pk),
+                    }
+                }
+            },
+        }
+
+
 class TestAPIView:
     @pytest.mark.urls(__name__)
     def test_patch(self, client):
@@ -488,6 +1275,23 @@ class DefaultIncludedResourcesViewSet(ModelViewSet):
     ordering = ["id"]
 
 
+class StreamingForeignKeySourceViewSet(ForeignKeySourceViewSet):
+    stream_chunk_size = 1
+
+
+class StreamingNonPaginatedForeignKeySourceViewSet(StreamingForeignKeySourceViewSet):
+    pagination_class = None
+
+
+class FailingForeignKeySourceSerializer(ForeignKeySourceSerializer):
+    def to_representation(self, instance):
+        raise exceptions.PermissionDenied()
+
+
+class StreamingFailingForeignKeySourceViewSet(StreamingForeignKeySourceViewSet):
+    serializer_class = FailingForeignKeySourceSerializer
+
+
 class CustomModel:
     def __init__(self, response_dict):
         for k, v in response_dict.items():
@@ -548,6 +1352,11 @@ router.register(r"basic_models", BasicModelViewSet, basename="basic-model")
 router.register(r"url_models", URLModelViewSet)
 router.register(r"foreign_key_sources", ForeignKeySourceViewSet)
 router.register(r"foreign_key_targets", ForeignKeyTargetViewSet)
+router.register(
+    r"foreign_key_target_sources",
+    ForeignKeyTargetSourcesViewSet,
+    basename="foreign-key-target-sources",
+)
 router.register(
     r"foreign_key_sources_hyperlinked",
     ForeignKeySourcetHyperlinkedViewSet,
@@ -556,11 +1365,31 @@ router.register(
 router.register(
     r"many_to_many_sources", ManyToManySourceViewSet, basename="many-to-many-source"
 )
+router.register(
+    r"included_linkage_sources",
+    IncludedLinkageSourceViewSet,
+    basename="included-linkage-source",
+)
 router.register(
     r"nested_related_sources",
     NestedRelatedSourceViewSet,
     basename="nested-related-source",
 )
+router.register(
+    r"streaming_foreign_key_sources",
+    StreamingForeignKeySourceViewSet,
+    basename="streaming-foreign-key-source",
+)
+router.register(
+    r"streaming_non_paginated_foreign_key_sources",
+    StreamingNonPaginatedForeignKeySourceViewSet,
+    basename="streaming-non-paginated-foreign-key-source",
+)
+router.register(
+    r"streaming_failing_foreign_key_sources",
+    StreamingFailingForeignKeySourceViewSet,
+    basename="streaming-failing-foreign-key-source",
+)
 router.register(
     r"default_included_resources",
     DefaultIncludedResourcesViewSet,